@@ -766,14 +766,15 @@ class JsonObj(MutableMapping[str, _VT], Generic[_VT]):
 
     def to_str(self, *, minify: bool = False, width: int | None = None) -> str:
         """Return a string representation of the JsonObj object"""
+        data = _unjsonify(self, strict=False)
         if minify:
-            return type(self).__name__ + "(**" + str(self.to_dict()) + ")"
+            return type(self).__name__ + "(**" + str(data) + ")"
         if not bool(self._data):
             return f"{type(self).__name__}(**{{}})"
         return "".join([
             type(self).__name__,
             "(**{\n    ",
-            pformat(self.eject(), width=79)[1:-1].replace("\n", "\n   "),
+            pformat(data, width=79)[1:-1].replace("\n", "\n   "),
             "\n})",
         ]).replace("JsonObj(**{}),", "{},")
 
@@ -870,13 +871,12 @@ class JsonObj(MutableMapping[str, _VT], Generic[_VT]):
             >>> type(plain_ol_dict)
             <class 'dict'>
 
+        Raises:
+            ValueError: If a cycle/circular-reference is detected; the error
+                message contains the dot-path to the circular reference
+
         """
-        try:
-            return {k: unjsonify(v) for k, v in self._data.items()}
-        except RecursionError as re:
-            raise ValueError(
-                "JSON.stringify recursion err; cycle/circular-refs detected"
-            ) from re
+        return cast("dict[_KT, _VT]", _unjsonify(self, strict=True))
 
     def to_dict(self) -> dict[_KT, Any]:
         """Return the JsonObj object (and children) as a python dictionary"""
@@ -1117,15 +1117,120 @@ def jsonify(value: Any) -> Any:
     return value
 
 
-def unjsonify(value: Any) -> Any:
-    """Recursively eject a JsonDit object"""
+def _unjsonify_container(
+    value: Any,
+) -> dict[Any, Any] | list[Any] | tuple[Any, ...] | None:
+    """Return the underlying container for a value or None if it is not one"""
     if isinstance(value, JsonObj):
         return value._data
-    if isinstance(value, list):
-        return [unjsonify(el) for el in value]
-    if isinstance(value, tuple):
-        return tuple(unjsonify(el) for el in value)
-    return value
+    if isinstance(value, dict | list | tuple):
+        return value
+    return None
+
+
+def _unjsonify_path(keys: Iterable[Any]) -> str:
+    """Return a dot-path string (eg 'a.b[0].c') for a sequence of keys/indices"""
+    return "".join(
+        f"[{k}]" if isinstance(k, int) else f".{k}" if i else str(k)
+        for i, k in enumerate(keys)
+    )
+
+
+def _unjsonify(value: Any, *, strict: bool = True) -> Any:
+    """Eject a JsonObj (and children) to python builtins w/o recursing
+
+    Containers on the current path are tracked by id; a container that is
+    its own ancestor is a cycle. If `strict`, a ValueError w/ the path to
+    the cycle is raised; otherwise the ejected ancestor is re-used so the
+    result mirrors the circular structure (which pprint/repr can handle).
+    Shared (non-circular) references are ejected once per reference.
+    """
+    root = _unjsonify_container(value)
+    if root is None:
+        return value
+    # frame: (id, key-in-parent, items-iterator, output-container, is-tuple)
+    root_out: dict[Any, Any] | list[Any] = {} if isinstance(root, dict) else []
+    stack: list[tuple[int, Any, Iterator[tuple[Any, Any]], Any, bool]] = [
+        (
+            id(root),
+            None,
+            iter(root.items() if isinstance(root, dict) else enumerate(root)),
+            root_out,
+            isinstance(root, tuple),
+        )
+    ]
+    ancestors: dict[int, Any] = {id(root): root_out}
+    ejected: Any = root_out
+    while stack:
+        _id, key, items, out, _is_tuple = stack[-1]
+        for k, v in items:
+            container = _unjsonify_container(v)
+            if container is None:
+                if isinstance(out, dict):
+                    out[k] = v
+                else:
+                    out.append(v)
+                continue
+            if id(container) in ancestors:
+                if strict:
+                    keys = [frame[1] for frame in stack[1:]]
+                    _emsg = (
+                        "JSON.stringify cycle/circular-refs detected at: "
+                        f"{_unjsonify_path([*keys, k])!r}"
+                    )
+                    raise ValueError(_emsg)
+                if isinstance(out, dict):
+                    out[k] = ancestors[id(container)]
+                else:
+                    out.append(ancestors[id(container)])
+                continue
+            child_out: dict[Any, Any] | list[Any] = (
+                {} if isinstance(container, dict) else []
+            )
+            ancestors[id(container)] = child_out
+            stack.append((
+                id(container),
+                k,
+                iter(
+                    container.items()
+                    if isinstance(container, dict)
+                    else enumerate(container)
+                ),
+                child_out,
+                isinstance(container, tuple),
+            ))
+            break
+        else:
+            stack.pop()
+            del ancestors[_id]
+            ejected = tuple(out) if _is_tuple else out
+            if stack:
+                parent_out = stack[-1][3]
+                if isinstance(parent_out, dict):
+                    parent_out[key] = ejected
+                else:
+                    parent_out.append(ejected)
+    return ejected
+
+
+def unjsonify(value: Any) -> Any:
+    """Recursively eject a JsonObj object (and children) to python builtins
+
+    Raises:
+        ValueError: If a cycle/circular-reference is detected
+
+    Examples:
+        >>> unjsonify(JsonObj({"a": {"b": [{"c": 1}, ({"d": 2},)]}}))
+        {'a': {'b': [{'c': 1}, ({'d': 2},)]}}
+        >>> a = JsonObj(a=1)
+        >>> a.sub = {"items": [a]}
+        >>> unjsonify(a)
+        Traceback (most recent call last):
+        ...
+        ValueError: JSON.stringify cycle/circular-refs detected at: 'sub.items[0]'
+
+    """
+    return _unjsonify(value, strict=True)
 
 
 class JSONMeta(type):
@@ -551,3 +551,36 @@ def test_dataclass_stringify() -> None:
     data = DataThing(n=1, s="stringy")
     data_string = json.dumps(data.__dict__)
     assert data_string == '{"n": 1, "s": "stringy"}'
+
+
+def test_cycle_eject_reports_path() -> None:
+    a = JsonObj(**{"a": "c", "herm": 123})
+    b = JsonObj(**{"c": "c", "d": [0, a]})
+    a.circle = b
+    with pytest.raises(ValueError, match=r"circle\.d\[1\]"):
+        a.eject()
+    with pytest.raises(ValueError, match=r"circle\.d\[1\]"):
+        a.to_json()
+
+
+def test_eject_shared_refs_not_cycles() -> None:
+    shared = JsonObj(**{"x": 1})
+    d = JsonObj(**{"a": shared, "b": [shared, (shared,)]})
+    assert d.eject() == {"a": {"x": 1}, "b": [{"x": 1}, ({"x": 1},)]}
+
+
+def test_eject_deep_acyclic_bounded_stack() -> None:
+    depth = 50_000
+    root = JsonObj()
+    node = root
+    for _ in range(depth):
+        child = JsonObj()
+        node["n"] = [child]
+        node = child
+    ejected = root.eject()
+    n = 0
+    while ejected:
+        assert isinstance(ejected, dict)
+        ejected = ejected["n"][0]
+        n += 1
+    assert n == depth
@@ -24,18 +24,28 @@ from shellfish._types import (
     SymlinkType as SymlinkType,
 )
 from shellfish.done import (
+    DoManyResult as DoManyResult,
     Done as Done,
     DoneDict as DoneDict,
     DoneError as DoneError,
+    DoneOutput as DoneOutput,
     HrTime as HrTime,
 )
 from shellfish.echo import echo as echo
 from shellfish.fs import (
+    CopyTreeStats as CopyTreeStats,
+    DirCmp as DirCmp,
+    FileHashCache as FileHashCache,
+    FsSnapshot as FsSnapshot,
+    FsSnapshotEntry as FsSnapshotEntry,
+    RmTreeStats as RmTreeStats,
     chmod as chmod,
     copy_file as copy_file,
+    copy_tree as copy_tree,
     cp as cp,
     dir_exists as dir_exists,
     dir_exists_async as dir_exists_async,
+    dircmp as dircmp,
     dirpath_gen as dirpath_gen,
     dirs_gen as dirs_gen,
     exists as exists,
@@ -102,6 +112,7 @@ from shellfish.fs import (
     rjson as rjson,
     rjson_async as rjson_async,
     rm_gen as rm_gen,
+    rm_tree as rm_tree,
     rmdir as rmdir,
     rmfile as rmfile,
     rstr as rstr,
@@ -135,6 +146,7 @@ from shellfish.fs import (
     symlink as symlink,
     touch as touch,
     walk_gen as walk_gen,
+    walk_parallel_gen as walk_parallel_gen,
     wbin as wbin,
     wbin_async as wbin_async,
     wbin_gen as wbin_gen,
@@ -162,19 +174,44 @@ from shellfish.process import env as env
 from shellfish.sh import (
     LIN as LIN,
     WIN as WIN,
+    DuplicateGroup as DuplicateGroup,
+    DuResult as DuResult,
+    DuStats as DuStats,
+    EnvOverlay as EnvOverlay,
     Flag as Flag,
     FlagMeta as FlagMeta,
+    FsChanges as FsChanges,
+    FsWatcher as FsWatcher,
+    HookEvent as HookEvent,
+    HookHistogram as HookHistogram,
+    HookStats as HookStats,
+    JsonlHookExporter as JsonlHookExporter,
+    Rusage as Rusage,
+    RusageDict as RusageDict,
     TimeoutExpired as TimeoutExpired,
+    WhichCache as WhichCache,
+    add_hook as add_hook,
+    atomic_open as atomic_open,
+    atomic_open_async as atomic_open_async,
     basename as basename,
     cd as cd,
+    clear_hooks as clear_hooks,
     decode_stdio_bytes as decode_stdio_bytes,
     dirname as dirname,
     do as do,
     do_ as do_,
     do_async as do_async,
+    do_many as do_many,
+    do_many_async as do_many_async,
+    do_many_gen as do_many_gen,
+    do_many_gen_async as do_many_gen_async,
     doa as doa,
+    du as du,
     export as export,
+    find_duplicates as find_duplicates,
     flatten_args as flatten_args,
+    get_hooks as get_hooks,
+    invalidate_env_cache as invalidate_env_cache,
     link_dir as link_dir,
     link_dirs as link_dirs,
     link_file as link_file,
@@ -185,9 +222,12 @@ from shellfish.sh import (
     ls_files_dirs as ls_files_dirs,
     mkenv as mkenv,
     mv as mv,
+    pipe as pipe,
+    pipe_gen as pipe_gen,
     pwd as pwd,
     q as q,
     quote as quote,
+    remove_hook as remove_hook,
     rm as rm,
     run as run,
     setenv as setenv,
@@ -197,11 +237,14 @@ from shellfish.sh import (
     source as source,
     sync as sync,
     tree as tree,
+    tree_gen as tree_gen,
     unlink_dir as unlink_dir,
     unlink_dirs as unlink_dirs,
     unlink_file as unlink_file,
     unlink_files as unlink_files,
     utf8_string as utf8_string,
+    watch as watch,
+    watch_async as watch_async,
     where as where,
     which as which,
     which_lru as which_lru,
@@ -216,13 +259,30 @@ ps = process  # noqa: RUF067
 __all__ = (
     "LIN",
     "WIN",
+    "CopyTreeStats",
+    "DirCmp",
+    "DoManyResult",
     "Done",
     "DoneDict",
     "DoneError",
+    "DoneOutput",
+    "DuResult",
+    "DuStats",
+    "DuplicateGroup",
+    "EnvOverlay",
+    "FileHashCache",
     "Flag",
     "FlagMeta",
+    "FsChanges",
     "FsPath",
+    "FsSnapshot",
+    "FsSnapshotEntry",
+    "FsWatcher",
+    "HookEvent",
+    "HookHistogram",
+    "HookStats",
     "HrTime",
+    "JsonlHookExporter",
     "PathLikeBytes",
     "PathLikeStr",
     "PathLikeStrBytes",
@@ -230,27 +290,42 @@ __all__ = (
     "PopenArgs",
     "PopenArgv",
     "PopenEnv",
+    "RmTreeStats",
+    "Rusage",
+    "RusageDict",
     "Stdio",
     "SymlinkType",
     "TimeoutExpired",
+    "WhichCache",
     "__version__",
+    "add_hook",
     "aiorun",
+    "atomic_open",
+    "atomic_open_async",
     "basename",
     "cd",
     "chmod",
+    "clear_hooks",
     "copy_file",
+    "copy_tree",
     "cp",
     "decode_stdio_bytes",
     "dir_exists",
     "dir_exists_async",
+    "dircmp",
     "dirname",
     "dirpath_gen",
     "dirs_gen",
     "do",
     "do_",
     "do_async",
+    "do_many",
+    "do_many_async",
+    "do_many_gen",
+    "do_many_gen_async",
     "doa",
     "dotenv",
+    "du",
     "echo",
     "env",
     "exists",
@@ -267,9 +342,12 @@ __all__ = (
     "files_gen",
     "filesize",
     "filesize_async",
+    "find_duplicates",
     "flatten_args",
     "fs",
     "fspath",
+    "get_hooks",
+    "invalidate_env_cache",
     "is_dir",
     "is_dir_async",
     "is_file",
@@ -311,6 +389,8 @@ __all__ = (
     "mv",
     "path",
     "path_gen",
+    "pipe",
+    "pipe_gen",
     "process",
     "ps",
     "pwd",
@@ -332,11 +412,13 @@ __all__ = (
     "read_json_async",
     "read_str",
     "read_str_async",
+    "remove_hook",
     "rename",
     "rjson",
     "rjson_async",
     "rm",
     "rm_gen",
+    "rm_tree",
     "rmdir",
     "rmfile",
     "rstr",
@@ -378,12 +460,16 @@ __all__ = (
     "sync",
     "touch",
     "tree",
+    "tree_gen",
     "unlink_dir",
     "unlink_dirs",
     "unlink_file",
     "unlink_files",
     "utf8_string",
     "walk_gen",
+    "walk_parallel_gen",
+    "watch",
+    "watch_async",
     "wbin",
     "wbin_async",
     "wbin_gen",
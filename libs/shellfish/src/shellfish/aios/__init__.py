@@ -4,15 +4,17 @@
 
 from __future__ import annotations
 
+import asyncio
 import os
 
+from functools import partial
 from typing import TYPE_CHECKING, AnyStr, Generic
 
 from asyncify import asyncify
 from shellfish.aios import _path
 
 if TYPE_CHECKING:
-    from collections.abc import AsyncIterator
+    from collections.abc import AsyncIterator, Iterator
 
 __all__ = (
     "DirEntryAsync",
@@ -30,6 +32,8 @@ __all__ = (
     "replace",
     "rmdir",
     "scandir",
+    "scandir_batches",
+    "scandir_recursive",
     "stat",
     "truncate",
 )
@@ -76,13 +80,26 @@ class DirEntryAsync(Generic[AnyStr]):
                 def __class_getitem__(cls, item: Any) -> GenericAlias: ...
         ```
 
+    Entries yielded by `scandir`/`scandir_batches`/`scandir_recursive` are
+    prefetched: their type info (and stat info w/ `stat=True`) was fetched
+    in the worker thread that read them, so the corresponding methods return
+    the (os.DirEntry cached) values w/o another hop to the executor.
+
     """
 
-    __slots__ = ("_dir_entry",)
+    __slots__ = ("_dir_entry", "_stat_cached", "_types_cached")
     _dir_entry: os.DirEntry[AnyStr]
 
-    def __init__(self, dir_entry: os.DirEntry[AnyStr]) -> None:
+    def __init__(
+        self,
+        dir_entry: os.DirEntry[AnyStr],
+        *,
+        types_cached: bool = False,
+        stat_cached: bool = False,
+    ) -> None:
         self._dir_entry = dir_entry
+        self._types_cached = types_cached or stat_cached
+        self._stat_cached = stat_cached
 
     @property
     def name(self) -> AnyStr:
@@ -93,32 +110,251 @@ class DirEntryAsync(Generic[AnyStr]):
         return self._dir_entry.path
 
     async def inode(self) -> int:
+        if self._types_cached:
+            return self._dir_entry.inode()
         return await asyncify(self._dir_entry.inode)()
 
     async def is_dir(self, *, follow_symlinks: bool = True) -> bool:
+        if self._types_cached:
+            return self._dir_entry.is_dir(follow_symlinks=follow_symlinks)
         return await asyncify(self._dir_entry.is_dir)(follow_symlinks=follow_symlinks)
 
     async def is_file(self, *, follow_symlinks: bool = True) -> bool:
+        if self._types_cached:
+            return self._dir_entry.is_file(follow_symlinks=follow_symlinks)
         return await asyncify(self._dir_entry.is_file)(follow_symlinks=follow_symlinks)
 
     async def is_symlink(self) -> bool:
+        if self._types_cached:
+            return self._dir_entry.is_symlink()
         return await asyncify(self._dir_entry.is_symlink)()
 
     async def stat(self, *, follow_symlinks: bool = True) -> os.stat_result:
+        if self._stat_cached:
+            return self._dir_entry.stat(follow_symlinks=follow_symlinks)
         return await asyncify(self._dir_entry.stat)(follow_symlinks=follow_symlinks)
 
     def __fspath__(self) -> AnyStr:
         return self._dir_entry.__fspath__()
 
 
-async def scandir(path: AnyStr) -> AsyncIterator[DirEntryAsync[AnyStr]]:  # noqa: RUF029
+def _prefetch(dir_entry: os.DirEntry[AnyStr], *, stat: bool) -> DirEntryAsync[AnyStr]:
+    """Fetch (and cache) the type & stat info of a DirEntry (worker fn)
+
+    os.DirEntry caches the results of its methods: types come from the
+    d_type read by scandir (no syscall, except for symlinks, whose target is
+    stat-ed, and on file-systems w/o d_type) and the stat calls are cached,
+    so the prefetched entry answers w/o any further IO.
+    """
+    try:
+        dir_entry.is_symlink()
+        dir_entry.is_dir()
+        dir_entry.is_file()
+        dir_entry.inode()
+    except OSError:
+        return DirEntryAsync(dir_entry)
+    if not stat:
+        return DirEntryAsync(dir_entry, types_cached=True)
+    try:
+        dir_entry.stat(follow_symlinks=False)
+        dir_entry.stat()  # the cached lstat unless a symlink
+    except OSError:  # broken symlink (or gone); stat is retried on demand
+        return DirEntryAsync(dir_entry, types_cached=True)
+    return DirEntryAsync(dir_entry, stat_cached=True)
+
+
+def _scandir_batch(
+    it: Iterator[os.DirEntry[AnyStr]], batchsize: int, *, stat: bool
+) -> list[DirEntryAsync[AnyStr]]:
+    """Read (& prefetch) up to batchsize entries from a scandir iterator"""
+    batch = []
+    for dir_entry in it:
+        batch.append(_prefetch(dir_entry, stat=stat))
+        if len(batch) >= batchsize:
+            break
+    return batch
+
+
+def _close_after_read(
+    it: Iterator[os.DirEntry[AnyStr]],
+    read: asyncio.Future[list[DirEntryAsync[AnyStr]]],
+) -> None:
+    """Close a scandir iterator once an (abandoned) batch read is done"""
+    it.close()  # type: ignore[attr-defined]
+    if not read.cancelled():
+        read.exception()  # retrieved so it is not logged as never retrieved
+
+
+async def scandir_batches(
+    path: AnyStr, *, batchsize: int = 256, stat: bool = False
+) -> AsyncIterator[list[DirEntryAsync[AnyStr]]]:
+    """Scan a directory in a worker thread yielding batches of entries
+
+    The directory is opened and read `batchsize` entries per executor hop;
+    the entries' type info (and stat info w/ `stat=True`) is fetched in the
+    same hop, so the event loop is never blocked on the file-system and the
+    executor is not flooded w/ a task per `is_dir`/`stat` call.
+
+    Args:
+        path: Directory to scan
+        batchsize: Max number of entries per batch (per executor hop)
+        stat: Also prefetch the entries' stat info
+
+    Yields:
+        list[DirEntryAsync]: non-empty batches of (prefetched) entries
+
+    Raises:
+        ValueError: If batchsize is less than 1
+
+    """
+    if batchsize < 1:
+        _emsg = f"batchsize must be >= 1; got {batchsize}"
+        raise ValueError(_emsg)
+    loop = asyncio.get_running_loop()
+    it = await asyncio.to_thread(os.scandir, path)
+    read: asyncio.Future[list[DirEntryAsync[AnyStr]]] | None = None
+    try:
+        while True:
+            read = loop.run_in_executor(
+                None, partial(_scandir_batch, it, batchsize, stat=stat)
+            )
+            # shielded so that, if cancelled, the read still completes (in
+            # its thread) before the iterator gets closed
+            batch = await asyncio.shield(read)
+            if not batch:
+                break
+            yield batch
+    finally:
+        if read is None or read.done():
+            it.close()
+        else:
+            read.add_done_callback(partial(_close_after_read, it))
+
+
+async def scandir(
+    path: AnyStr, *, batchsize: int = 256, stat: bool = False
+) -> AsyncIterator[DirEntryAsync[AnyStr]]:
     """Async version of os.scandir
 
+    Entries are read (and prefetched) in batches in a worker thread (see
+    `scandir_batches`), so iterating does not block the event loop.
+
     Signature of os.scandir:
         ```python
         def scandir(path: AnyStr) -> Iterator[DirEntry[AnyStr]]: ...
         ```
     """
-    # for dir_entry in map(_dir_entry_async, os.scandir(path)):
-    for dir_entry in (DirEntryAsync(el) for el in os.scandir(path)):
-        yield dir_entry
+    async for batch in scandir_batches(path, batchsize=batchsize, stat=stat):
+        for dir_entry in batch:
+            yield dir_entry
+
+
+async def scandir_recursive(
+    path: AnyStr,
+    *,
+    concurrency: int = 8,
+    batchsize: int = 256,
+    stat: bool = False,
+    follow_symlinks: bool = False,
+) -> AsyncIterator[DirEntryAsync[AnyStr]]:
+    """Scan a directory tree yielding the entries of all its directories
+
+    Directories are scanned (w/ `scandir_batches`) by up to `concurrency`
+    tasks at a time; the entries are yielded (in no particular order) as
+    their batches come in. Directories that cannot be scanned are skipped
+    (like os.walk). W/ `follow_symlinks`, symlinks to directories are
+    descended into (each directory, by device & inode, at most once).
+
+    Args:
+        path: Root directory to scan (its own entry is not yielded)
+        concurrency: Max number of directories scanned at once
+        batchsize: Max number of entries per batch (per executor hop)
+        stat: Also prefetch the entries' stat info
+        follow_symlinks: Descend into symlinks to directories
+
+    Yields:
+        DirEntryAsync: (prefetched) entries beneath path
+
+    Raises:
+        ValueError: If concurrency or batchsize is less than 1
+
+    Examples:
+        >>> from shellfish import fs
+        >>> fs.mkdirp("scandir-recursive.doctest/sub")
+        >>> _ = fs.write_str("scandir-recursive.doctest/sub/a.txt", "a")
+        >>> async def names():
+        ...     return sorted(
+        ...         [e.name async for e in scandir_recursive("scandir-recursive.doctest")]
+        ...     )
+        >>> asyncio.run(names())
+        ['a.txt', 'sub']
+        >>> fs.rm("scandir-recursive.doctest", recursive=True)
+
+    """
+    if concurrency < 1:
+        _emsg = f"concurrency must be >= 1; got {concurrency}"
+        raise ValueError(_emsg)
+    if batchsize < 1:
+        _emsg = f"batchsize must be >= 1; got {batchsize}"
+        raise ValueError(_emsg)
+    dirs: asyncio.Queue[AnyStr] = asyncio.Queue()
+    # batches (or a worker's exception) w/ None once all dirs are scanned
+    out: asyncio.Queue[list[DirEntryAsync[AnyStr]] | Exception | None] = asyncio.Queue(
+        maxsize=concurrency * 2
+    )
+    seen: set[tuple[int, int]] = set()
+    pending = 1
+
+    def _descend(entry: DirEntryAsync[AnyStr]) -> bool:
+        dir_entry = entry._dir_entry
+        try:
+            if not dir_entry.is_dir(follow_symlinks=follow_symlinks):
+                return False
+            if not follow_symlinks:
+                return True
+            # cached if the stat info was prefetched (always for symlinks)
+            st = dir_entry.stat()
+        except OSError:
+            return False
+        key = (st.st_dev, st.st_ino)
+        if key in seen:
+            return False
+        seen.add(key)
+        return True
+
+    async def _worker() -> None:
+        nonlocal pending
+        while True:
+            dirpath = await dirs.get()
+            try:
+                async for batch in scandir_batches(
+                    dirpath, batchsize=batchsize, stat=stat or follow_symlinks
+                ):
+                    for entry in batch:
+                        if _descend(entry):
+                            pending += 1
+                            dirs.put_nowait(entry.path)
+                    await out.put(batch)
+            except OSError:
+                ...
+            except Exception as e:
+                await out.put(e)
+            pending -= 1
+            if not pending:
+                await out.put(None)
+
+    if follow_symlinks:
+        root_stat = await asyncio.to_thread(os.stat, path)
+        seen.add((root_stat.st_dev, root_stat.st_ino))
+    dirs.put_nowait(path)
+    tasks = [asyncio.create_task(_worker()) for _ in range(concurrency)]
+    try:
+        while (batch := await out.get()) is not None:
+            if isinstance(batch, Exception):
+                raise batch
+            for entry in batch:
+                yield entry
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -1,95 +1,223 @@
 # -*- coding: utf-8 -*-
+"""Event driven multiplexing of a subprocess' stdout/stderr pipes"""
+
 from __future__ import annotations
 
-from concurrent.futures.thread import ThreadPoolExecutor
-from queue import Empty, Queue
+import os
+
+from codecs import getincrementaldecoder
+from io import IncrementalNewlineDecoder, TextIOBase
+from queue import Empty, SimpleQueue
 from subprocess import PIPE, Popen, TimeoutExpired
-from time import time
-from typing import TYPE_CHECKING
+from threading import Thread
+from time import monotonic
+from typing import TYPE_CHECKING, TypeVar
 
 from shellfish.fs import Stdio
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable
+    from collections.abc import Iterable, Iterator
     from typing import IO, Any, AnyStr
 
+_K = TypeVar("_K")
+
 __all__ = ("popen_gen", "popen_pipes_gen")
 
+_READ_SIZE = 2**16
 
-def _enqueue_output(
-    fileio: IO[AnyStr],
-    queue: Queue[AnyStr],
-    *,
-    block: bool = True,
-) -> None:
-    while True:
-        line = fileio.readline()
-        if line:
-            queue.put(line, block=block)
-        else:
-            break
+try:
+    from selectors import EVENT_READ, DefaultSelector
+
+    # selectors do not support pipes on windows
+    _HAS_SELECT_PIPES = os.name != "nt"
+except ImportError:  # pragma: no cover
+    _HAS_SELECT_PIPES = False
+
+
+class _PipeDecoder:
+    """Decode (if text) and split (if lines) the raw chunks read from a pipe"""
+
+    __slots__ = ("_buf", "_decoder", "_lines", "_nl")
+
+    def __init__(
+        self, *, lines: bool, encoding: str | None = None, errors: str = "strict"
+    ) -> None:
+        self._lines = lines
+        self._decoder: IncrementalNewlineDecoder | None = None
+        self._nl: str | bytes = b"\n"
+        self._buf: Any = b""
+        if encoding is not None:
+            # same decoding/newline translation as the Popen text wrapper
+            self._decoder = IncrementalNewlineDecoder(
+                getincrementaldecoder(encoding)(errors), translate=True
+            )
+            self._buf = ""
+            self._nl = "\n"
+
+    @classmethod
+    def from_fileio(cls, fileio: IO[Any], *, lines: bool) -> _PipeDecoder:
+        if isinstance(fileio, TextIOBase):
+            return cls(
+                lines=lines, encoding=fileio.encoding, errors=fileio.errors or "strict"
+            )
+        return cls(lines=lines)
+
+    def feed(self, data: bytes, *, final: bool = False) -> list[Any]:
+        chunk: Any = (
+            data if self._decoder is None else self._decoder.decode(data, final=final)
+        )
+        if not self._lines:
+            return [chunk] if chunk else []
+        buf = self._buf + chunk
+        parts = buf.split(self._nl)
+        self._buf = parts.pop()
+        _lines = [part + self._nl for part in parts]
+        if final and self._buf:
+            _lines.append(self._buf)
+            self._buf = self._buf[:0]
+        return _lines
+
+
+def _pipes(proc: Popen[Any]) -> dict[int, tuple[Stdio, IO[Any]]]:
+    pipes = {}
+    for stdio, fileio in ((Stdio.stdout, proc.stdout), (Stdio.stderr, proc.stderr)):
+        if fileio is not None:
+            pipes[fileio.fileno()] = (stdio, fileio)
+    return pipes
+
+
+def _remaining(deadline: float | None) -> float | None:
+    return None if deadline is None else max(deadline - monotonic(), 0.0)
 
 
-def _enqueue_output_iter_readline(
-    fileio: IO[AnyStr], queue: Queue[AnyStr], *, block: bool = True
-) -> None:
-    for line in iter(fileio.readline, ""):
-        queue.put(line, block=block)
-    fileio.close()
+def _select_chunks(
+    pipes: dict[int, _K], deadline: float | None
+) -> Iterator[tuple[_K, bytes]]:
+    """Yield (key, raw chunk) as pipe fds are readable; b"" marks a pipe's EOF
+
+    Raises:
+        TimeoutError: If the deadline passes before all pipes hit EOF
+
+    """
+    with DefaultSelector() as selector:
+        for fd, key in pipes.items():
+            selector.register(fd, EVENT_READ, key)
+        while selector.get_map():
+            events = selector.select(timeout=_remaining(deadline))
+            if not events:
+                raise TimeoutError
+            for skey, _ in events:
+                data = os.read(skey.fd, _READ_SIZE)
+                if not data:
+                    selector.unregister(skey.fd)
+                yield skey.data, data
+
+
+def _read_pipe(fd: int, key: _K, queue: SimpleQueue[tuple[_K, bytes]]) -> None:
+    while data := os.read(fd, _READ_SIZE):
+        queue.put((key, data))
+    queue.put((key, b""))
+
+
+def _thread_chunks(
+    pipes: dict[int, _K], deadline: float | None
+) -> Iterator[tuple[_K, bytes]]:
+    """Fallback for platforms that cannot select on pipes (windows)
+
+    One (blocking) reader thread per pipe; the consumer blocks on a queue.
+    """
+    queue: SimpleQueue[tuple[_K, bytes]] = SimpleQueue()
+    for fd, key in pipes.items():
+        Thread(target=_read_pipe, args=(fd, key, queue), daemon=True).start()
+    nopen = len(pipes)
+    while nopen:
+        try:
+            key, data = queue.get(timeout=_remaining(deadline))
+        except Empty:
+            raise TimeoutError from None
+        if not data:
+            nopen -= 1
+        yield key, data
+
+
+def _read_chunks(
+    pipes: dict[int, _K], deadline: float | None = None
+) -> Iterator[tuple[_K, bytes]]:
+    """Multiplex pipe fds yielding (key, raw chunk) until all hit EOF
+
+    b"" is yielded once for each pipe when it hits EOF.
+
+    Args:
+        pipes: {fd: key} for the (readable) pipe file descriptors
+        deadline: `time.monotonic()` deadline
+
+    Raises:
+        TimeoutError: If the deadline passes before all pipes hit EOF
+
+    """
+    if _HAS_SELECT_PIPES:
+        return _select_chunks(pipes, deadline)
+    return _thread_chunks(pipes, deadline)
 
 
 def popen_pipes_gen(
-    proc: Popen[AnyStr], timeout: float | None = None
-) -> Iterable[tuple[Stdio, str | bytes]]:
-    """Yield stdout and stderr lines from a subprocess
+    proc: Popen[AnyStr],
+    timeout: float | None = None,
+    *,
+    lines: bool = True,
+) -> Iterator[tuple[Stdio, AnyStr]]:
+    """Yield stdout and stderr lines (or chunks) from a subprocess
+
+    The pipes are multiplexed w/ `selectors` (a reader thread per pipe on
+    windows) so the caller blocks until output is available instead of
+    polling. Both pipes are drained until EOF, so output written right
+    before the process exits is never lost, and then the process is waited
+    on. Text-mode (`text=True`) pipes are decoded like the Popen text
+    wrappers and yield str; binary pipes yield bytes.
 
     Args:
         proc (Popen): Popen process
         timeout (Optional[float], optional): Timeout in seconds. Defaults to None.
+        lines (bool): Yield whole lines if True; otherwise yield chunks as
+            they are read (lower latency, e.g. for progress bars)
 
     Yields:
         tuple[Stdio, str | bytes]: Tuples with stdio enum marker followed by a string
 
     Raises:
         ValueError: if proc is not Popen or proc.stdout or proc.stderr is None
+        TimeoutExpired: If the pipes are not closed and the process has not
+            exited within timeout seconds (the process is terminated)
 
     """
     if not isinstance(proc, Popen):
         raise ValueError("proc must be a Popen object")
-    _raise_err = False
-    if proc.stdout is not None and proc.stderr is not None:
-        ti = time()
-        with ThreadPoolExecutor(2) as pool:
-            q_stdout: Queue[AnyStr] = Queue()
-            q_stderr: Queue[AnyStr] = Queue()
-            _block = True
-            stdout_future = pool.submit(
-                _enqueue_output_iter_readline, proc.stdout, q_stdout, block=_block
-            )
-            stderr_future = pool.submit(
-                _enqueue_output_iter_readline, proc.stderr, q_stderr, block=_block
-            )
-            while proc.poll() is None:
-                try:
-                    yield Stdio.stdout, q_stdout.get_nowait()
-                except Empty:
-                    ...
-                try:
-                    yield Stdio.stderr, q_stderr.get_nowait()
-                except Empty:
-                    ...
-                if timeout is not None and time() - ti > timeout:
-                    _raise_err = True
-                    stdout_future.cancel()
-                    stderr_future.cancel()
-                    pool.shutdown(wait=False)
-                    break
-        if _raise_err and timeout is not None:
-            proc.terminate()
-            raise TimeoutExpired(proc.args, timeout, output=None, stderr=None)
-
-    else:
+    if proc.stdout is None or proc.stderr is None:
         raise ValueError("proc.stdout and proc.stderr must be not None")
+    return _popen_pipes_gen(proc, timeout=timeout, lines=lines)
+
+
+def _popen_pipes_gen(
+    proc: Popen[AnyStr], *, timeout: float | None, lines: bool
+) -> Iterator[tuple[Stdio, AnyStr]]:
+    deadline = None if timeout is None else monotonic() + timeout
+    pipes = _pipes(proc)
+    decoders = {
+        stdio: _PipeDecoder.from_fileio(fileio, lines=lines)
+        for stdio, fileio in pipes.values()
+    }
+    try:
+        for stdio, data in _read_chunks(
+            {fd: stdio for fd, (stdio, _) in pipes.items()}, deadline
+        ):
+            for chunk in decoders[stdio].feed(data, final=not data):
+                yield stdio, chunk
+        proc.wait(timeout=_remaining(deadline))
+    except (TimeoutError, TimeoutExpired):
+        proc.terminate()
+        raise TimeoutExpired(
+            proc.args, timeout or 0.0, output=None, stderr=None
+        ) from None
 
 
 def popen_gen(
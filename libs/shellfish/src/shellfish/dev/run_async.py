@@ -23,6 +23,7 @@ if TYPE_CHECKING:
     from typing import IO, Any
 
     from shellfish._types import FsPath
+    from shellfish.hooks import Launch
 
 __all__ = ("run_async",)
 
@@ -61,6 +62,7 @@ async def run_dtee_async(
     tee: bool = False,
     ok_code: int | list[int] | tuple[int, ...] | set[int] = 0,
     universal_newlines: bool = False,
+    launch: Launch | None = None,
     **other_popen_kwargs: Any,
 ) -> tuple[CompletedProcess[bytes], ProcessDt]:
     _args = list(_flatten_args(*popenargs))
@@ -96,6 +98,8 @@ async def run_dtee_async(
             cwd=_cwd,
         )
 
+    if launch is not None:
+        launch.spawned(_proc.pid)
     _out_buf = BytesIO()
     _err_buf = BytesIO()
     _stdout = b""
@@ -107,99 +111,122 @@ async def run_dtee_async(
 
     def _tee_string(line: bytes, sink: BytesIO, pipe: IO[str]) -> None:
         sink.write(line)
-        pipe.write(line.decode())
+        if tee:
+            pipe.write(line.decode())
+        if launch is not None:
+            launch.output()
 
-    _bg = []
-    if tee:
-        if _input_bytes is not None and _proc.stdin is not None:
-            _proc.stdin.write(_input_bytes)
-            _proc.stdin.close()
-        if _proc.stdout is not None:
-            _bg.append(
-                asyncio.create_task(
-                    _read_stream(
-                        _proc.stdout,
-                        lambda line: _tee_string(line, _out_buf, sys.stdout),
+    # the process is killed if the awaiting task is cancelled (e.g. by
+    # sh.do_many's fail-fast) so no orphan processes are left running
+    try:
+        _bg = []
+        # w/ hooks the output is streamed (not tee-d) to see the first output
+        _stream = tee or launch is not None
+        if _stream:
+            if _input_bytes is not None and _proc.stdin is not None:
+                _proc.stdin.write(_input_bytes)
+                _proc.stdin.close()
+            if _proc.stdout is not None:
+                _bg.append(
+                    asyncio.create_task(
+                        _read_stream(
+                            _proc.stdout,
+                            lambda line: _tee_string(line, _out_buf, sys.stdout),
+                        )
                     )
                 )
-            )
-        if _proc.stderr is not None:
-            _bg.append(
-                asyncio.create_task(
-                    _read_stream(
-                        _proc.stderr,
-                        lambda line: _tee_string(line, _err_buf, sys.stderr),
+            if _proc.stderr is not None:
+                _bg.append(
+                    asyncio.create_task(
+                        _read_stream(
+                            _proc.stderr,
+                            lambda line: _tee_string(line, _err_buf, sys.stderr),
+                        )
                     )
                 )
-            )
 
-        if timeout:
-            try:
-                await asyncio.wait_for(
-                    asyncio.gather(
-                        *_bg,
-                    ),
-                    timeout=timeout,
-                )
-                tf = time()
-            except ValueError as ve:
-                for task in _bg:
-                    task.cancel()
-                _proc.terminate()
-                raise TimeoutExpired(
-                    cmd=_args,
-                    timeout=timeout,
-                    output=_out_buf.getvalue(),
-                    stderr=_err_buf.getvalue(),
-                ) from ve
-            except TimeoutError as te:
-                for task in _bg:
-                    task.cancel()
-                raise TimeoutExpired(
-                    cmd=_args,
-                    timeout=timeout,
-                    output=_out_buf.getvalue(),
-                    stderr=_err_buf.getvalue(),
-                ) from te
-            finally:
-                await _proc.wait()
-        else:
-            await asyncio.gather(
-                *_bg,
-            )
-            tf = time()
-    else:
-        if timeout:
-            try:
-                if _input_bytes is not None and _proc.stdin is not None:
-                    (_stdout, _stderr) = await asyncio.wait_for(
-                        _proc.communicate(
-                            input=_input_bytes
-                        ),  # wait for subprocess to finish
+            if timeout:
+                try:
+                    await asyncio.wait_for(
+                        asyncio.gather(
+                            *_bg,
+                        ),
                         timeout=timeout,
                     )
-                else:
-                    (_stdout, _stderr) = await asyncio.wait_for(
-                        _proc.communicate(),  # wait for subprocess to finish
+                    tf = time()
+                except ValueError as ve:
+                    for task in _bg:
+                        task.cancel()
+                    _proc.terminate()
+                    if launch is not None:
+                        launch.timed_out()
+                    raise TimeoutExpired(
+                        cmd=_args,
                         timeout=timeout,
-                    )
+                        output=_out_buf.getvalue(),
+                        stderr=_err_buf.getvalue(),
+                    ) from ve
+                except TimeoutError as te:
+                    for task in _bg:
+                        task.cancel()
+                    _proc.terminate()
+                    if launch is not None:
+                        launch.timed_out()
+                    raise TimeoutExpired(
+                        cmd=_args,
+                        timeout=timeout,
+                        output=_out_buf.getvalue(),
+                        stderr=_err_buf.getvalue(),
+                    ) from te
+                finally:
+                    await _proc.wait()
+            else:
+                await asyncio.gather(
+                    *_bg,
+                )
                 tf = time()
-            except TimeoutError as te:
-                _proc.terminate()
-                raise TimeoutExpired(
-                    cmd=_args,
-                    timeout=timeout,
-                    output=_out_buf.getvalue(),
-                    stderr=_err_buf.getvalue(),
-                ) from te
-            finally:
-                await _proc.wait()
         else:
-            (_stdout, _stderr) = await _proc.communicate(input=_input_bytes)
-            tf = time()
-    if tee:
+            if timeout:
+                try:
+                    if _input_bytes is not None and _proc.stdin is not None:
+                        (_stdout, _stderr) = await asyncio.wait_for(
+                            _proc.communicate(
+                                input=_input_bytes
+                            ),  # wait for subprocess to finish
+                            timeout=timeout,
+                        )
+                    else:
+                        (_stdout, _stderr) = await asyncio.wait_for(
+                            _proc.communicate(),  # wait for subprocess to finish
+                            timeout=timeout,
+                        )
+                    tf = time()
+                except TimeoutError as te:
+                    _proc.terminate()
+                    if launch is not None:
+                        launch.timed_out()
+                    raise TimeoutExpired(
+                        cmd=_args,
+                        timeout=timeout,
+                        output=_out_buf.getvalue(),
+                        stderr=_err_buf.getvalue(),
+                    ) from te
+                finally:
+                    await _proc.wait()
+            else:
+                (_stdout, _stderr) = await _proc.communicate(input=_input_bytes)
+                tf = time()
+    except asyncio.CancelledError:
+        if _proc.returncode is None:
+            _proc.kill()
+            await asyncio.shield(_proc.wait())
+        raise
+    if _stream:
         _stdout = _out_buf.getvalue()
         _stderr = _err_buf.getvalue()
+    if launch is not None:
+        await _proc.wait()
+        launch.exited(_proc.returncode)
     if universal_newlines:
         _stdout = _stdout.replace(b"\r\n", b"\n")
         _stderr = _stderr.replace(b"\r\n", b"\n")
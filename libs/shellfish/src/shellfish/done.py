@@ -5,18 +5,32 @@ from __future__ import annotations
 import signal
 import sys
 
+from array import array
+from bisect import bisect_right
+from dataclasses import dataclass, field
 from functools import lru_cache
+from io import BytesIO
+from os import remove
 from pathlib import Path
+from re import compile as _re_compile
+from shutil import copyfileobj
 from subprocess import CompletedProcess, SubprocessError
-from typing import TYPE_CHECKING, Any, AnyStr, TypedDict
+from tempfile import NamedTemporaryFile
+from typing import IO, TYPE_CHECKING, Any, AnyStr, TypedDict, cast
+from weakref import finalize
 
-from pydantic import AliasChoices, Field
+from pydantic import AliasChoices, Field, computed_field
+from pydantic_core import core_schema
 
 from jsonbourne import JSON
 from shellfish import fs
 from shellfish._pydantic import _ShellfishBaseModel
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from pydantic import GetCoreSchemaHandler
+
     from shellfish._types import (
         STDIN as STDIN,
         FsPath as FsPath,
@@ -25,11 +39,15 @@ if TYPE_CHECKING:
     )
 
 __all__ = (
+    "DoManyResult",
     "Done",
     "DoneDict",
     "DoneError",
+    "DoneOutput",
     "HrTime",
     "HrTimeDict",
+    "Rusage",
+    "RusageDict",
 )
 
 
@@ -90,6 +108,96 @@ class HrTime(_ShellfishBaseModel):
         return self.nanos
 
 
+class RusageDict(TypedDict):
+    """Process resource usage as a typed-dict; see [Rusage][shellfish.done.Rusage]"""
+
+    utime: float
+    """User CPU time (seconds)"""
+    stime: float
+    """System CPU time (seconds)"""
+    maxrss: int
+    """Peak resident set size (bytes)"""
+    minflt: int
+    """Minor (no I/O) page faults"""
+    majflt: int
+    """Major (I/O) page faults"""
+    inblock: int
+    """Block input operations"""
+    oublock: int
+    """Block output operations"""
+    nvcsw: int
+    """Voluntary context switches"""
+    nivcsw: int
+    """Involuntary context switches"""
+
+
+# ru_maxrss is in kilobytes on linux (and most unices) but bytes on macos
+_MAXRSS_UNIT = 1 if sys.platform == "darwin" else 1024
+
+
+class Rusage(_ShellfishBaseModel):
+    """Resource usage of a finished (child) process (see `getrusage(2)`)
+
+    Examples:
+        >>> Rusage(utime=0.5, stime=0.25, maxrss=2**20).cpu
+        0.75
+
+    """
+
+    utime: float
+    """User CPU time (seconds)"""
+    stime: float
+    """System CPU time (seconds)"""
+    maxrss: int
+    """Peak resident set size (bytes)"""
+    minflt: int = 0
+    """Minor (no I/O) page faults"""
+    majflt: int = 0
+    """Major (I/O) page faults"""
+    inblock: int = 0
+    """Block input operations"""
+    oublock: int = 0
+    """Block output operations"""
+    nvcsw: int = 0
+    """Voluntary context switches"""
+    nivcsw: int = 0
+    """Involuntary context switches"""
+
+    @classmethod
+    def from_struct_rusage(cls, ru: Any) -> Rusage:
+        """Return a Rusage from a `resource.struct_rusage` (e.g. from os.wait4)"""
+        return cls(
+            utime=ru.ru_utime,
+            stime=ru.ru_stime,
+            maxrss=ru.ru_maxrss * _MAXRSS_UNIT,
+            minflt=ru.ru_minflt,
+            majflt=ru.ru_majflt,
+            inblock=ru.ru_inblock,
+            oublock=ru.ru_oublock,
+            nvcsw=ru.ru_nvcsw,
+            nivcsw=ru.ru_nivcsw,
+        )
+
+    @property
+    def cpu(self) -> float:
+        """Total (user + system) CPU time (seconds)"""
+        return self.utime + self.stime
+
+    def rusage_dict(self) -> RusageDict:
+        """Return this Rusage as a typed-dict"""
+        return {
+            "utime": self.utime,
+            "stime": self.stime,
+            "maxrss": self.maxrss,
+            "minflt": self.minflt,
+            "majflt": self.majflt,
+            "inblock": self.inblock,
+            "oublock": self.oublock,
+            "nvcsw": self.nvcsw,
+            "nivcsw": self.nivcsw,
+        }
+
+
 class DoneError(SubprocessError):
     r"""Error raised when a process returns a non-zero/not-ok exit status
 
@@ -186,6 +294,364 @@ class DoneDict(TypedDict):
     """True if the process was run asynchronously"""
     verbose: bool
     """True if stdout/stderr were echoed to the parent process' stdout/stderr"""
+    rusage: RusageDict | None
+    """Resource usage of the process, if collected (`rusage=True`)"""
+
+
+# line boundaries recognized by str.splitlines
+_LINE_BREAK_RE = _re_compile(r"\r\n|[\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]")
+
+
+def _decode(data: bytes) -> str:
+    """Decode utf-8 bytes falling back to latin-1 (like decode_stdio_bytes)"""
+    try:
+        return data.decode()
+    except UnicodeDecodeError:
+        return data.decode("latin-1")
+
+
+def _decode_stdio(data: bytes) -> str:
+    r"""Decode stdout/stderr bytes; `\r\n` line endings become `\n`"""
+    return _decode(data).replace("\r\n", "\n")
+
+
+# bytes starting a line boundary (other than `\n`) in utf-8/latin-1 text
+_RAW_LINE_BREAK_START_RE = _re_compile(rb"[\r\x0b\x0c\x1c\x1d\x1e\x85\xe2]")
+
+
+def _raw_line_splits(raw: bytes) -> list[tuple[int, int]]:
+    r"""Split a `\n`-terminated raw line like str.splitlines splits its text
+
+    Returns (nbytes, line-break nbytes) for each of the (decoded) lines.
+    """
+    if not _RAW_LINE_BREAK_START_RE.search(raw):
+        return [(len(raw), 1 if raw.endswith(b"\n") else 0)]
+    try:
+        text, encoding = raw.decode(), "utf-8"
+    except UnicodeDecodeError:
+        text, encoding = raw.decode("latin-1"), "latin-1"
+    splits = []
+    for line in text.splitlines(keepends=True):
+        nbytes = len(line.encode(encoding))
+        (content,) = line.splitlines() or [""]
+        splits.append((nbytes, nbytes - len(content.encode(encoding))))
+    return splits
+
+
+def _rm_spill_file(fspath: str) -> None:
+    try:
+        remove(fspath)
+    except OSError:
+        ...
+
+
+class DoneOutput:
+    r"""Captured stdout/stderr of a process; backs `Done.stdout`/`Done.stderr`
+
+    The output is either held in memory or, for huge outputs captured w/
+    `do(spill=...)`, in a temp file (deleted w/ the DoneOutput). Spilled
+    output is only read when asked for; `lines`, `iter_lines`, `grep` and
+    `json_parse(jsonl=True)` stream it line by line.
+
+    In-memory output is kept as the raw bytes and only decoded on first
+    access. A line-offset index is built (once) on first use so that
+    indexing/slicing lines (`out[i]`, `out[i:j]`), `nlines` and `grep` do
+    not split/copy the whole output.
+
+    Examples:
+        >>> out = DoneOutput(b"hello\nworld\n")
+        >>> out.text
+        'hello\nworld\n'
+        >>> out.lines()
+        ['hello', 'world']
+        >>> out.grep("wor")
+        ['world']
+        >>> out[1], out[-2:], out.nlines
+        ('world', ['hello', 'world'], 2)
+        >>> out.spilled
+        False
+
+    """
+
+    __slots__ = ("__weakref__", "_data", "_fspath", "_index", "_text")
+
+    def __init__(self, data: bytes | str = b"", *, fspath: str | None = None) -> None:
+        self._data: bytes | None = None
+        self._text: str | None = None
+        # (line starts, line ends w/o the line-break) offsets into the text
+        # (into the raw bytes for spilled output); built on first use
+        self._index: tuple[array[int], array[int]] | None = None
+        if fspath is None:
+            if isinstance(data, bytes):
+                self._data = data
+            else:
+                self._text = data
+        self._fspath = fspath
+        if fspath is not None:
+            finalize(self, _rm_spill_file, fspath)
+
+    @classmethod
+    def __get_pydantic_core_schema__(
+        cls, source_type: Any, handler: GetCoreSchemaHandler
+    ) -> core_schema.CoreSchema:
+        return core_schema.no_info_plain_validator_function(cls.validate)
+
+    @classmethod
+    def validate(cls, value: Any) -> DoneOutput:
+        """Return a DoneOutput given a DoneOutput, str or bytes"""
+        if isinstance(value, DoneOutput):
+            return value
+        if isinstance(value, str | bytes):
+            return cls(value)
+        if isinstance(value, bytearray | memoryview):
+            return cls(bytes(value))
+        _emsg = f"Expected str or bytes; got {type(value).__name__}"
+        raise TypeError(_emsg)
+
+    @property
+    def spilled(self) -> bool:
+        """True if the output was spilled to a temp file"""
+        return self._fspath is not None
+
+    @property
+    def fspath(self) -> str | None:
+        """Path to the temp file the output was spilled to (if spilled)"""
+        return self._fspath
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the (raw) output in bytes"""
+        if self._fspath is not None:
+            return Path(self._fspath).stat().st_size
+        return len(self.raw)
+
+    @property
+    def raw(self) -> bytes:
+        """The raw output bytes (read from the temp file if spilled)"""
+        if self._data is not None:
+            return self._data
+        if self._fspath is not None:
+            return fs.read_bytes(self._fspath)
+        return (self._text or "").encode()
+
+    @property
+    def text(self) -> str:
+        """The decoded output; spilled output is re-read on each access"""
+        if self._text is not None:
+            return self._text
+        if self._fspath is not None:
+            return _decode_stdio(self.raw)
+        self._text = _decode_stdio(self._data or b"")
+        if len(self._text) == len(self._data or b"") and self._text.isascii():
+            # ascii w/o `\r\n`s; the bytes are exactly `text.encode()`
+            self._data = None
+        return self._text
+
+    def _line_index(self) -> tuple[array[int], array[int]]:
+        if self._index is not None:
+            return self._index
+        starts, ends = array("q"), array("q")
+        if self._fspath is None:
+            text = self.text
+            pos = 0
+            for match in _LINE_BREAK_RE.finditer(text):
+                starts.append(pos)
+                ends.append(match.start())
+                pos = match.end()
+            if pos < len(text):
+                starts.append(pos)
+                ends.append(len(text))
+        else:
+            pos = 0
+            with open(self._fspath, "rb") as f:
+                for raw in f:
+                    for nbytes, nbytes_break in _raw_line_splits(raw):
+                        starts.append(pos)
+                        ends.append(pos + nbytes - nbytes_break)
+                        pos += nbytes
+        self._index = (starts, ends)
+        return self._index
+
+    @property
+    def nlines(self) -> int:
+        """Number of lines in the output"""
+        return len(self._line_index()[0])
+
+    def _spilled_lines(self, start: int, stop: int) -> list[str]:
+        """Read lines [start, stop) of spilled output w/ a single seek+read"""
+        starts, ends = self._line_index()
+        if start >= stop:
+            return []
+        base = starts[start]
+        with open(cast("str", self._fspath), "rb") as f:
+            f.seek(base)
+            block = f.read(starts[stop] - base) if stop < len(starts) else f.read()
+        return [
+            _decode(block[starts[ix] - base : ends[ix] - base])
+            for ix in range(start, stop)
+        ]
+
+    def __getitem__(self, key: int | slice) -> Any:
+        """Return line(s) of the output by index/slice (w/o line-endings)"""
+        starts, ends = self._line_index()
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(starts))
+            if self._fspath is not None and step == 1:
+                return self._spilled_lines(start, stop)
+            return [self[ix] for ix in range(start, stop, step)]
+        if key < 0:
+            key += len(starts)
+        if not 0 <= key < len(starts):
+            raise IndexError("line index out of range")
+        if self._fspath is not None:
+            return self._spilled_lines(key, key + 1)[0]
+        return self.text[starts[key] : ends[key]]
+
+    def open(self) -> IO[bytes]:
+        """Return a binary file-object for reading the raw output"""
+        if self._fspath is not None:
+            return open(self._fspath, "rb")
+        return BytesIO(self.raw)
+
+    def iter_lines(self, *, keepends: bool = False) -> Iterator[str]:
+        """Yield the lines of the output (streamed from disk if spilled)
+
+        Args:
+            keepends: Keep the line-ending characters on each line
+
+        """
+        if self._fspath is None:
+            yield from self.text.splitlines(keepends=keepends)
+            return
+        with open(self._fspath, "rb") as f:
+            for raw in f:
+                yield from _decode_stdio(raw).splitlines(keepends=keepends)
+
+    def lines(self, *, keepends: bool = False) -> list[str]:
+        """Return the output split into lines
+
+        Args:
+            keepends: Keep the line-ending characters on each line
+
+        """
+        return list(self.iter_lines(keepends=keepends))
+
+    def grep(self, string: str) -> list[str]:
+        """Return the lines of the output that contain the given string
+
+        In-memory output is searched w/ `str.find` and only the matching
+        lines are sliced out (using the line index).
+        """
+        if self._fspath is not None:
+            return [line for line in self.iter_lines() if string in line]
+        if _LINE_BREAK_RE.search(string):
+            return []
+        text = self.text
+        starts, ends = self._line_index()
+        matches = []
+        pos = 0
+        while pos < len(text):
+            found = text.find(string, pos)
+            if found == -1:
+                break
+            ix = bisect_right(starts, found) - 1
+            matches.append(text[starts[ix] : ends[ix]])
+            if ix + 1 >= len(starts):
+                break
+            pos = starts[ix + 1]
+        return matches
+
+    def iter_jsonl(self, *, jsonc: bool = False) -> Iterator[Any]:
+        """Yield the json parsed lines of jsonl/ndjson output"""
+        for line in self.iter_lines():
+            yield JSON.loads(line, jsonc=jsonc)
+
+    def json_parse(
+        self, *, jsonc: bool = False, jsonl: bool = False, ndjson: bool = False
+    ) -> Any:
+        """Return the json parsed output
+
+        Args:
+            jsonc: Parse as jsonc (json with comments)
+            jsonl: Parse as jsonl (json-lines); streamed line by line
+            ndjson: Parse as ndjson (newline delimited json)
+
+        Returns:
+            The parsed output
+
+        """
+        if jsonl or ndjson:
+            return list(self.iter_jsonl(jsonc=jsonc))
+        return JSON.loads(self.text, jsonc=jsonc)
+
+    def write(self, filepath: FsPath, *, append: bool = False) -> None:
+        """Write the (decoded) output to a fspath
+
+        Args:
+            filepath: Filepath to write the output to
+            append: Append to the file instead of overwriting it
+
+        """
+        if self._fspath is None:
+            fs.write_bytes(Path(filepath), self.text.encode(), append=append)
+            return
+        with open(filepath, "ab" if append else "wb") as f:
+            for line in self.iter_lines(keepends=True):
+                f.write(line.encode())
+
+    def __str__(self) -> str:
+        return self.text
+
+    def __repr__(self) -> str:
+        if self._fspath is not None:
+            return f"{self.__class__.__name__}(fspath={self._fspath!r})"
+        return f"{self.__class__.__name__}({self.text!r})"
+
+    def __eq__(self, other: object) -> bool:
+        # compare the (decoded, newline-normalized) text that is serialized
+        # so outputs rebuilt from a dump compare equal to the originals
+        if isinstance(other, DoneOutput):
+            return self.text == other.text
+        if isinstance(other, str):
+            return self.text == other
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+
+class _SpillBuffer:
+    """Output capture buffer; moves to a temp file once it exceeds a threshold"""
+
+    __slots__ = ("_buf", "_file", "threshold")
+
+    def __init__(self, threshold: int) -> None:
+        self.threshold = threshold
+        self._buf = BytesIO()
+        self._file: IO[bytes] | None = None
+
+    def write(self, data: bytes) -> None:
+        if self._file is not None:
+            self._file.write(data)
+            return
+        self._buf.write(data)
+        if self._buf.tell() > self.threshold:
+            self._file = NamedTemporaryFile(
+                prefix="shellfish-", suffix=".out", delete=False
+            )
+            self._buf.seek(0)
+            copyfileobj(self._buf, self._file)
+            self._buf = BytesIO()
+
+    def discard(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            _rm_spill_file(self._file.name)
+
+    def output(self) -> DoneOutput:
+        if self._file is None:
+            return DoneOutput(self._buf.getvalue())
+        self._file.close()
+        return DoneOutput(fspath=self._file.name)
 
 
 @lru_cache(maxsize=32)
@@ -238,10 +704,10 @@ class Done(_ShellfishBaseModel):
     """Command args the process was run with"""
     returncode: int
     """Exit status of the process"""
-    stdout: str
-    """Standard output (stdout) of the process"""
-    stderr: str
-    """Standard error (stderr) of the process"""
+    stdout_output: DoneOutput = Field(alias="stdout", exclude=True, repr=False)
+    """Captured stdout; given as `stdout=...` (str, bytes or DoneOutput)"""
+    stderr_output: DoneOutput = Field(alias="stderr", exclude=True, repr=False)
+    """Captured stderr; given as `stderr=...` (str, bytes or DoneOutput)"""
     ti: float
     """Time the process started (seconds since epoch)"""
     tf: float
@@ -258,6 +724,8 @@ class Done(_ShellfishBaseModel):
     """True if the process was not actually run (dryrun)"""
     verbose: bool = Field(False, exclude=True)
     """Echo stdout/stderr to the parent process on init; excluded from dumps"""
+    rusage: Rusage | None = None
+    """Resource usage (CPU time, peak RSS, block I/O) if collected (`rusage=True`)"""
 
     def __post_init__(self) -> None:
         """Write stdout/stderr to sys.stdout/sys.stderr post object init"""
@@ -268,6 +736,26 @@ class Done(_ShellfishBaseModel):
         """Pydantic post-init hook; defers to `__post_init__`"""
         self.__post_init__()
 
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def stdout(self) -> str:
+        """Standard output (stdout) of the process (decoded on first access)"""
+        return self.stdout_output.text
+
+    @stdout.setter
+    def stdout(self, value: str | bytes | DoneOutput) -> None:
+        self.stdout_output = DoneOutput.validate(value)
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def stderr(self) -> str:
+        """Standard error (stderr) of the process (decoded on first access)"""
+        return self.stderr_output.text
+
+    @stderr.setter
+    def stderr(self, value: str | bytes | DoneOutput) -> None:
+        self.stderr_output = DoneOutput.validate(value)
+
     def __str__(self) -> str:
         """Return a multi-line string representation of this Done object"""
         return "\n".join((
@@ -324,7 +812,7 @@ class Done(_ShellfishBaseModel):
             List of stdout lines
 
         """
-        return self.stdout.splitlines(keepends=keepends)
+        return self.stdout_output.lines(keepends=keepends)
 
     def stderr_lines(self, *, keepends: bool = False) -> list[str]:
         """Return stderr split into lines
@@ -336,7 +824,7 @@ class Done(_ShellfishBaseModel):
             List of stderr lines
 
         """
-        return self.stderr.splitlines(keepends=keepends)
+        return self.stderr_output.lines(keepends=keepends)
 
     @property
     def lines(self) -> list[str]:
@@ -357,6 +845,7 @@ class Done(_ShellfishBaseModel):
             stdin=self.stdin,
             async_proc=self.async_proc,
             verbose=self.verbose,
+            rusage=self.rusage.rusage_dict() if self.rusage else None,
         )
 
     def _error(self) -> DoneError:
@@ -396,7 +885,7 @@ class Done(_ShellfishBaseModel):
             append: Append to the file instead of overwriting it
 
         """
-        fs.write_bytes(Path(filepath), self.stdout.encode("utf-8"), append=append)
+        self.stdout_output.write(filepath, append=append)
 
     def completed_process(self) -> CompletedProcess[str]:
         """Return subprocess.CompletedProcess object"""
@@ -415,7 +904,7 @@ class Done(_ShellfishBaseModel):
             append: Append to the file instead of overwriting it
 
         """
-        fs.write_bytes(Path(filepath), self.stderr.encode("utf-8"), append=append)
+        self.stderr_output.write(filepath, append=append)
 
     def __gt__(self, filepath: FsPath) -> None:
         """Operator overload for writing a stdout to a fspath
@@ -475,7 +964,7 @@ class Done(_ShellfishBaseModel):
             The parsed stdout
 
         """
-        return JSON.loads(self.stdout, jsonc=jsonc, jsonl=jsonl, ndjson=ndjson)
+        return self.stdout_output.json_parse(jsonc=jsonc, jsonl=jsonl, ndjson=ndjson)
 
     def json_parse_stderr(
         self, *, jsonc: bool = False, jsonl: bool = False, ndjson: bool = False
@@ -491,7 +980,7 @@ class Done(_ShellfishBaseModel):
             The parsed stderr
 
         """
-        return JSON.loads(self.stderr, jsonc=jsonc, jsonl=jsonl, ndjson=ndjson)
+        return self.stderr_output.json_parse(jsonc=jsonc, jsonl=jsonl, ndjson=ndjson)
 
     def json_parse(
         self,
@@ -554,6 +1043,28 @@ class Done(_ShellfishBaseModel):
                 search string
 
         """
-        return [
-            line for line in self.stdout.splitlines(keepends=False) if string in line
-        ]
+        return self.stdout_output.grep(string)
+
+
+@dataclass
+class DoManyResult:
+    """Results of a batch of commands run by `sh.do_many`/`sh.do_many_async`"""
+
+    dones: list[Done | None]
+    """Done objects in the order the commands were given (None if errored)"""
+    errors: dict[int, BaseException] = field(default_factory=dict)
+    """Errors (e.g. TimeoutExpired) keyed by command index"""
+    ti: float = 0.0
+    """Time the first command started (seconds since epoch)"""
+    tf: float = 0.0
+    """Time the last command finished (seconds since epoch)"""
+
+    @property
+    def dt(self) -> float:
+        """Wall time the batch took to run (seconds; `tf - ti`)"""
+        return self.tf - self.ti
+
+    @property
+    def dt_total(self) -> float:
+        """Sum of the run-times of all the commands (seconds)"""
+        return sum(done.dt for done in self.dones if done is not None)
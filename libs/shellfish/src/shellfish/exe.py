@@ -3,18 +3,32 @@
 
 from __future__ import annotations
 
+import asyncio
+
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from dataclasses import dataclass, field
+from queue import Empty, LifoQueue, SimpleQueue
 from shlex import split as _shplit
+from struct import Struct
+from subprocess import PIPE, Popen, TimeoutExpired
+from threading import Lock, Thread
+from time import time
 from typing import (
+    IO,
     TYPE_CHECKING,
     Any,
+    Literal,
     TypeVar,
 )
 
 from shellfish import sh
-from shellfish.sh import Done, flatten_args
+from shellfish.sh import Done, HrTime, flatten_args
 
 if TYPE_CHECKING:
+    from collections.abc import Generator, Iterable, Iterator
+    from types import TracebackType
+
     from shellfish._types import STDIN, FsPath, PopenArgs, PopenArgv
 
 __all__ = (
@@ -22,8 +36,14 @@ __all__ = (
     "ExeABC",
     "ExeAsync",
     "ExeConfig",
+    "ExeSession",
+    "ExeSessionPool",
 )
 
+SessionFraming = Literal["line", "length"]
+# length-prefixed framing: 4 byte big-endian unsigned payload length
+_LENGTH_PREFIX = Struct(">I")
+
 TExe = TypeVar("TExe", bound="ExeABC")
 
 
@@ -82,6 +102,7 @@ class ExeABC:
     """Return code(s) considered ok"""
     check: bool = False
     """Raise [DoneError][shellfish.done.DoneError] if the return code is not ok"""
+    _abspath_resolved: bool = False
 
     def __init__(
         self,
@@ -168,6 +189,11 @@ class ExeABC:
     def _which(self) -> str:
         """Return (and cache) the absolute path to the exe
 
+        A given `abspath` is used as is; otherwise the resolved path is
+        bound to the exe and re-validated (cheaply) by the
+        [WhichCache][shellfish.sh.WhichCache] on each call, so a moved or
+        replaced executable is re-resolved.
+
         Returns:
             Absolute path to the executable
 
@@ -175,13 +201,16 @@ class ExeABC:
             FileNotFoundError: If the executable is not found on the PATH
 
         """
-        if self.abspath is not None:
+        if self.abspath is not None and not self._abspath_resolved:
             return self.abspath
-        _abspath = sh.which(self.cmd)
+        _abspath = sh.which_lru(
+            self.cmd, path=self.env.get("PATH") if self.env else None
+        )
         if _abspath is None:
             _emsg = f"{self.cmd} not found"
             raise FileNotFoundError(_emsg)
         self.abspath = _abspath
+        self._abspath_resolved = True
         return self.abspath
 
     def which(self) -> str:
@@ -215,10 +244,22 @@ class ExeABC:
         self,
         popenargs: tuple[PopenArgs, ...],
         args: PopenArgs | None = None,
+        *,
+        shell: bool = False,
     ) -> PopenArgv:
-        """Return the full argv (`self.cmd` + flattened args) for a run"""
+        """Return the full argv (exe + flattened args) for a run
+
+        The exe is the bound absolute path (see `_which`) so the PATH is
+        not searched for every run; `self.cmd` if run through the shell or
+        if the exe cannot be found (the run then fails as it would have).
+        """
         argv = self._unredundify(popenargs, args)
-        return (self.cmd, *argv)
+        if shell or self.shell:
+            return (self.cmd, *argv)
+        try:
+            return (self._which(), *argv)
+        except FileNotFoundError:
+            return (self.cmd, *argv)
 
     def _do(
         self,
@@ -255,7 +296,7 @@ class ExeABC:
             [Done][shellfish.done.Done] object for the finished process
 
         """
-        _args = self._cmdargs(popenargs, args)
+        _args = self._cmdargs(popenargs, args, shell=shell)
         return sh.do(
             args=_args,
             env=env or self.env,
@@ -307,7 +348,7 @@ class ExeABC:
             [Done][shellfish.done.Done] object for the finished process
 
         """
-        _args = self._cmdargs(popenargs, args)
+        _args = self._cmdargs(popenargs, args, shell=shell)
         return await sh.do_async(
             args=_args,
             check=check,
@@ -322,6 +363,73 @@ class ExeABC:
             verbose=verbose or self.verbose,
         )
 
+    def session(
+        self,
+        *popenargs: PopenArgs,
+        args: PopenArgs | None = None,
+        framing: SessionFraming = "line",
+        env: dict[str, str] | None = None,
+        extenv: bool = True,
+        cwd: FsPath | None = None,
+        timeout: float | None = None,
+        restart: bool = True,
+    ) -> ExeSession:
+        """Return a persistent [ExeSession][shellfish.exe.ExeSession] for the exe
+
+        Args:
+            *popenargs: Args to start the exe with (e.g. `--stdin`/`serve`)
+            args: Args to start the exe with (alternative to `*popenargs`)
+            framing: "line" or "length" (4 byte big-endian length prefix)
+            env: Environment variables; defaults to `self.env`
+            extenv: Extend `os.environ` with `env` instead of replacing it
+            cwd: Working directory; defaults to `self.cwd`
+            timeout: Timeout in seconds per request; defaults to `self.timeout`
+            restart: Restart the process on the next request if it died
+
+        Returns:
+            ExeSession (started on its first request)
+
+        """
+        _env = env or self.env
+        return ExeSession(
+            self._cmdargs(popenargs, args),
+            framing=framing,
+            env=None if _env is None else sh.mkenv(_env, extenv=extenv),
+            cwd=cwd or self.cwd,
+            timeout=timeout or self.timeout,
+            restart=restart,
+        )
+
+    def session_pool(
+        self,
+        *popenargs: PopenArgs,
+        size: int = 4,
+        args: PopenArgs | None = None,
+        framing: SessionFraming = "line",
+        env: dict[str, str] | None = None,
+        extenv: bool = True,
+        cwd: FsPath | None = None,
+        timeout: float | None = None,
+        restart: bool = True,
+    ) -> ExeSessionPool:
+        """Return an [ExeSessionPool][shellfish.exe.ExeSessionPool] of `size` sessions
+
+        Takes the same args as [session][shellfish.exe.ExeABC.session].
+        """
+        return ExeSessionPool([
+            self.session(
+                *popenargs,
+                args=args,
+                framing=framing,
+                env=env,
+                extenv=extenv,
+                cwd=cwd,
+                timeout=timeout,
+                restart=restart,
+            )
+            for _ in range(size)
+        ])
+
     # aliases
     do = _do
     do_async = _do_async
@@ -436,3 +544,382 @@ class ExeAsync(ExeABC):
             timeout=timeout,
             verbose=verbose,
         )
+
+
+def _read_frames(
+    stdout: IO[bytes], framing: SessionFraming, responses: SimpleQueue[bytes | None]
+) -> None:
+    """Read response frames from a session's stdout (reader thread)
+
+    None is put on the queue once stdout hits EOF (the process exited).
+    """
+    try:
+        if framing == "line":
+            for line in stdout:
+                responses.put(line.rstrip(b"\r\n"))
+        else:
+            while (
+                len(header := stdout.read(_LENGTH_PREFIX.size)) == _LENGTH_PREFIX.size
+            ):
+                (size,) = _LENGTH_PREFIX.unpack(header)
+                payload = stdout.read(size)
+                if len(payload) < size:
+                    break
+                responses.put(payload)
+    except (OSError, ValueError):
+        ...
+    finally:
+        responses.put(None)
+
+
+def _drain_stderr(stderr: IO[bytes], buf: bytearray, lock: Lock) -> None:
+    try:
+        while chunk := stderr.read1(2**16):  # type: ignore[attr-defined]
+            with lock:
+                buf += chunk
+    except (OSError, ValueError):
+        ...
+
+
+class ExeSession:
+    r"""Persistent coprocess that requests are sent to over stdin/stdout
+
+    For tools w/ a REPL, server or `--stdin` batch mode: the process is
+    started once (on the first request) and kept alive, so requests do not
+    pay the process startup cost. Requests and responses are framed either
+    by lines (`"line"`; one line in, one line out) or w/ a 4 byte big-endian
+    length prefix (`"length"`; arbitrary bytes). Requests are serialized;
+    use an [ExeSessionPool][shellfish.exe.ExeSessionPool] for concurrency.
+
+    If the process dies it is restarted on the next request (unless
+    `restart=False`); a request that times out kills the process.
+
+    Examples:
+        >>> import sys
+        >>> upper = [sys.executable, "-u", "-c", (
+        ...     "import sys\n"
+        ...     "for line in sys.stdin: print(line.strip().upper())"
+        ... )]
+        >>> with ExeSession(upper) as session:
+        ...     [session.request(word).stdout for word in ("hello", "there")]
+        ['HELLO', 'THERE']
+        >>> session.nrequests
+        2
+
+    """
+
+    __slots__ = (
+        "_lock",
+        "_proc",
+        "_responses",
+        "_stderr",
+        "_stderr_lock",
+        "args",
+        "cwd",
+        "env",
+        "framing",
+        "nrequests",
+        "nrestarts",
+        "restart",
+        "timeout",
+    )
+
+    def __init__(
+        self,
+        args: PopenArgv | list[str],
+        *,
+        framing: SessionFraming = "line",
+        env: dict[str, str] | None = None,
+        cwd: FsPath | None = None,
+        timeout: float | None = None,
+        restart: bool = True,
+    ) -> None:
+        """Create a (not yet started) session
+
+        Args:
+            args: Args of the coprocess
+            framing: "line" or "length" (4 byte big-endian length prefix)
+            env: Environment of the coprocess (None for os.environ)
+            cwd: Working directory of the coprocess
+            timeout: Default timeout in seconds for each request
+            restart: Restart the process on the next request if it died
+
+        """
+        if framing not in ("line", "length"):
+            _emsg = f"framing must be 'line' or 'length', not {framing!r}"
+            raise ValueError(_emsg)
+        self.args = list(args)
+        self.framing: SessionFraming = framing
+        self.env = env
+        self.cwd = cwd
+        self.timeout = timeout
+        self.restart = restart
+        self.nrequests = 0
+        self.nrestarts = 0
+        self._lock = Lock()
+        self._proc: Popen[bytes] | None = None
+        self._responses: SimpleQueue[bytes | None] = SimpleQueue()
+        self._stderr = bytearray()
+        self._stderr_lock = Lock()
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(args={self.args!r}, "
+            f"framing={self.framing!r}, alive={self.alive})"
+        )
+
+    def __enter__(self) -> ExeSession:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    @property
+    def alive(self) -> bool:
+        """True if the coprocess is running"""
+        return self._proc is not None and self._proc.poll() is None
+
+    @property
+    def pid(self) -> int | None:
+        """Process id of the coprocess (None if not started)"""
+        return None if self._proc is None else self._proc.pid
+
+    def start(self) -> None:
+        """Start the coprocess (if it is not running)"""
+        if self.alive:
+            return
+        proc = Popen(
+            self.args,
+            stdin=PIPE,
+            stdout=PIPE,
+            stderr=PIPE,
+            env=self.env,
+            cwd=self.cwd,
+        )
+        self._proc = proc
+        self._responses = SimpleQueue()
+        self._stderr = bytearray()
+        Thread(
+            target=_read_frames,
+            args=(proc.stdout, self.framing, self._responses),
+            daemon=True,
+        ).start()
+        Thread(
+            target=_drain_stderr,
+            args=(proc.stderr, self._stderr, self._stderr_lock),
+            daemon=True,
+        ).start()
+
+    def close(self, timeout: float = 1.0) -> None:
+        """Stop the coprocess
+
+        Closes its stdin (which well behaved coprocesses exit on) and kills it
+        if it has not exited within `timeout` seconds.
+        """
+        proc, self._proc = self._proc, None
+        if proc is None:
+            return
+        try:
+            if proc.stdin is not None:
+                proc.stdin.close()
+        except OSError:
+            ...
+        try:
+            proc.wait(timeout=timeout)
+        except TimeoutExpired:
+            proc.kill()
+            proc.wait()
+        for fileio in (proc.stdout, proc.stderr):
+            if fileio is not None:
+                fileio.close()
+
+    def _ensure_started(self) -> Popen[bytes]:
+        if self._proc is not None and self._proc.poll() is not None:
+            if not self.restart:
+                _emsg = f"session process exited ({self._proc.returncode}): {self.args}"
+                raise ChildProcessError(_emsg)
+            self.close()
+            self.nrestarts += 1
+        self.start()
+        if self._proc is None:  # pragma: no cover
+            raise ChildProcessError(self.args)
+        return self._proc
+
+    def _frame(self, payload: bytes) -> bytes:
+        if self.framing == "length":
+            return _LENGTH_PREFIX.pack(len(payload)) + payload
+        payload = payload.removesuffix(b"\n")
+        if b"\n" in payload:
+            _emsg = "line framed requests must be a single line"
+            raise ValueError(_emsg)
+        return payload + b"\n"
+
+    def _take_stderr(self) -> bytes:
+        with self._stderr_lock:
+            data = bytes(self._stderr)
+            self._stderr.clear()
+        return data
+
+    def request(self, data: str | bytes, *, timeout: float | None = None) -> Done:
+        """Send a request to the coprocess and return its response as a Done
+
+        The Done's stdout is the response payload (w/o the line terminator
+        for "line" framing) and its stderr is what the process wrote to
+        stderr since the previous request. stderr is drained by a background
+        thread, so stderr written just before the response may only show up
+        in the next request's Done (attribution is best-effort). If the
+        process exits before
+        responding, the Done has the process' return code and empty stdout
+        (the process is restarted on the next request).
+
+        Args:
+            data: Request payload
+            timeout: Timeout in seconds (default: the session's timeout)
+
+        Returns:
+            [Done][shellfish.done.Done] for the request/response
+
+        Raises:
+            TimeoutExpired: If no response within timeout (the process is killed)
+            ValueError: If a "line" request has a newline in it
+            ChildProcessError: If the process died and restart is False
+
+        """
+        payload = data.encode() if isinstance(data, str) else data
+        frame = self._frame(payload)
+        _timeout = self.timeout if timeout is None else timeout
+        with self._lock:
+            proc = self._ensure_started()
+            ti = time()
+            response: bytes | None = None
+            try:
+                if proc.stdin is None:  # pragma: no cover
+                    raise BrokenPipeError
+                proc.stdin.write(frame)
+                proc.stdin.flush()
+            except (BrokenPipeError, ValueError):
+                ...
+            else:
+                try:
+                    response = self._responses.get(timeout=_timeout)
+                except Empty:
+                    proc.kill()
+                    proc.wait()
+                    raise TimeoutExpired(self.args, _timeout or 0.0) from None
+            if response is None:
+                proc.wait()
+            tf = time()
+            self.nrequests += 1
+            return Done(
+                args=self.args,
+                returncode=0 if response is not None else proc.returncode,
+                stdout=response or b"",
+                stderr=self._take_stderr(),
+                ti=ti,
+                tf=tf,
+                dt=tf - ti,
+                hrdt=HrTime.from_seconds(tf - ti),
+                stdin=data if isinstance(data, str) else None,
+                dryrun=False,
+            )
+
+    __call__ = request
+
+    async def request_async(
+        self, data: str | bytes, *, timeout: float | None = None
+    ) -> Done:
+        """Send a request w/o blocking the event loop (see `request`)"""
+        return await asyncio.to_thread(self.request, data, timeout=timeout)
+
+
+class ExeSessionPool:
+    r"""Pool of [ExeSession][shellfish.exe.ExeSession]s for concurrent requests
+
+    Each request is sent to an idle session (blocking until one is free);
+    the most recently released session is reused first and sessions are
+    started lazily, so a pool only spawns as many processes as there are
+    concurrent requests. Each Done's stderr is that of the session that
+    served the request (best-effort; see
+    [ExeSession.request][shellfish.exe.ExeSession.request]).
+
+    Examples:
+        >>> import sys
+        >>> echo = [sys.executable, "-u", "-c", (
+        ...     "import sys\n"
+        ...     "for line in sys.stdin: print(line.strip())"
+        ... )]
+        >>> with ExeSessionPool([ExeSession(echo) for _ in range(2)]) as pool:
+        ...     [done.stdout for done in pool.map(["a", "b", "c"])]
+        ['a', 'b', 'c']
+
+    """
+
+    __slots__ = ("_idle", "sessions")
+
+    def __init__(self, sessions: list[ExeSession]) -> None:
+        if not sessions:
+            _emsg = "ExeSessionPool requires at least one session"
+            raise ValueError(_emsg)
+        self.sessions = sessions
+        # LIFO: reuse the most recently released (already started) session
+        self._idle: LifoQueue[ExeSession] = LifoQueue()
+        for session in reversed(sessions):
+            self._idle.put(session)
+
+    def __len__(self) -> int:
+        return len(self.sessions)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(size={len(self)})"
+
+    def __enter__(self) -> ExeSessionPool:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    @contextmanager
+    def acquire(self) -> Generator[ExeSession, None, None]:
+        """Check out an idle session (blocks until one is available)"""
+        session = self._idle.get()
+        try:
+            yield session
+        finally:
+            self._idle.put(session)
+
+    def request(self, data: str | bytes, *, timeout: float | None = None) -> Done:
+        """Send a request to an idle session; see [ExeSession.request][shellfish.exe.ExeSession.request]"""
+        with self.acquire() as session:
+            return session.request(data, timeout=timeout)
+
+    __call__ = request
+
+    async def request_async(
+        self, data: str | bytes, *, timeout: float | None = None
+    ) -> Done:
+        """Send a request to an idle session w/o blocking the event loop"""
+        return await asyncio.to_thread(self.request, data, timeout=timeout)
+
+    def map(
+        self, requests: Iterable[str | bytes], *, timeout: float | None = None
+    ) -> Iterator[Done]:
+        """Send requests concurrently over the pool; yields Dones in order"""
+        with ThreadPoolExecutor(max_workers=len(self)) as pool:
+            yield from pool.map(
+                lambda data: self.request(data, timeout=timeout), requests
+            )
+
+    def close(self) -> None:
+        """Stop all the sessions' processes"""
+        for session in self.sessions:
+            session.close()
@@ -4,12 +4,19 @@
 
 from __future__ import annotations
 
+import errno
+import os
+import sys
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from glob import has_magic, iglob
 from itertools import chain, count
 from os import (
     DirEntry,
     chmod as _chmod,
     fspath as _fspath,
+    lstat as _lstat,
     makedirs as _makedirs,
     mkdir as _mkdir,
     path as path,
@@ -24,12 +31,13 @@ from os import (
     walk,
 )
 from pathlib import Path
-from shutil import copystat as _copystat, copytree, move as _move, rmtree
+from shutil import copystat as _copystat, move as _move, rmtree
 from time import time
 from typing import (
     TYPE_CHECKING,
     Any,
     AnyStr,
+    Literal,
     cast,
 )
 
@@ -87,6 +95,38 @@ from shellfish.fs._async import (
     wstr_async as wstr_async,
     wstring_async as wstring_async,
 )
+from shellfish.fs._atomic import (
+    _check_atomic_append,
+    _fsync_file,
+    atomic_open as atomic_open,
+    atomic_open_async as atomic_open_async,
+)
+from shellfish.fs._cmp import (
+    DirCmp as DirCmp,
+    FileHashCache as FileHashCache,
+    _cmp_contents,
+    dircmp as dircmp,
+)
+from shellfish.fs._du import (
+    DuResult as DuResult,
+    DuStats as DuStats,
+    du as du,
+)
+from shellfish.fs._dupes import (
+    DuplicateGroup as DuplicateGroup,
+    find_duplicates as find_duplicates,
+)
+from shellfish.fs._snapshot import (
+    FsSnapshot as FsSnapshot,
+    FsSnapshotEntry as FsSnapshotEntry,
+)
+from shellfish.fs._walk import walk_parallel_gen as walk_parallel_gen
+from shellfish.fs._watch import (
+    FsChanges as FsChanges,
+    FsWatcher as FsWatcher,
+    watch as watch,
+    watch_async as watch_async,
+)
 from shellfish.process import is_win as _is_win
 from shellfish.stdio import Stdio as Stdio
 
@@ -200,8 +240,7 @@ def scandir_list(dirpath: FsPath = ".") -> list[DirEntry[AnyStr]]:
     return list(scandir(dirpath))
 
 
-def scandir_gen_filter(
-    it: Iterator[DirEntry[AnyStr]] | Iterable[DirEntry[AnyStr]],
+def _scandir_filterfn(
     *,
     follow_symlinks: bool = True,
     files: bool = True,
@@ -210,25 +249,79 @@ def scandir_gen_filter(
     files_only: bool = False,
     dirs_only: bool = False,
     symlinks_only: bool = False,
-) -> Iterator[DirEntry[AnyStr]]:
+) -> Callable[[DirEntry[AnyStr]], bool] | None:
+    """Return the DirEntry predicate for the given flags (None if all pass)
+
+    The predicates only use the DirEntry methods which are answered from the
+    d_type cached by scandir; `stat` is only called when following symlinks.
+    """
     if files and dirs and symlinks:  # all
-        return (x for x in it)
+        return None
     if files_only or (files and not dirs and not symlinks):  # files (only)
-        return (el for el in it if el.is_file(follow_symlinks=follow_symlinks))
+        return lambda el: el.is_file(follow_symlinks=follow_symlinks)
     if dirs_only or (not files and dirs and not symlinks):  # dirs only
-        return (el for el in it if el.is_dir(follow_symlinks=follow_symlinks))
+        return lambda el: el.is_dir(follow_symlinks=follow_symlinks)
     if symlinks_only or (not files and not dirs and symlinks):  # symlinks
-        return (el for el in it if el.is_symlink())
+        return lambda el: el.is_symlink()
     if files and dirs and not symlinks:  # files and dirs
-        return (el for el in it if not el.is_symlink())
+        return lambda el: not el.is_symlink()
     if files and not dirs and symlinks:  # files and symlinks
-        return (el for el in it if not el.is_dir(follow_symlinks=follow_symlinks))
+        return lambda el: not el.is_dir(follow_symlinks=follow_symlinks)
     if not files and dirs and symlinks:  # dirs and symlinks
-        return (el for el in it if not el.is_file(follow_symlinks=follow_symlinks))
+        return lambda el: not el.is_file(follow_symlinks=follow_symlinks)
     _emsg = f"Invalid combination of arguments: files={files}, dirs={dirs}, symlinks={symlinks}"
     raise ValueError(_emsg)
 
 
+def scandir_gen_filter(
+    it: Iterator[DirEntry[AnyStr]] | Iterable[DirEntry[AnyStr]],
+    *,
+    follow_symlinks: bool = True,
+    files: bool = True,
+    dirs: bool = True,
+    symlinks: bool = True,
+    files_only: bool = False,
+    dirs_only: bool = False,
+    symlinks_only: bool = False,
+) -> Iterator[DirEntry[AnyStr]]:
+    _filterfn = _scandir_filterfn(
+        follow_symlinks=follow_symlinks,
+        files=files,
+        dirs=dirs,
+        symlinks=symlinks,
+        files_only=files_only,
+        dirs_only=dirs_only,
+        symlinks_only=symlinks_only,
+    )
+    if _filterfn is None:
+        return (x for x in it)
+    return (el for el in it if _filterfn(el))
+
+
+def _scandir_gen_recursive(
+    dirpath: str,
+    *,
+    follow_symlinks: bool,
+    filterfn: Callable[[DirEntry[str]], bool] | None,
+) -> Iterator[DirEntry[str]]:
+    """Yield DirEntry objects depth-first w/ an explicit stack of dirpaths
+
+    Each directory is scanned once; its entries are yielded (in scandir
+    order) before the entries of its sub-directories, which are descended
+    into in scandir order. Only one directory is open at a time.
+    """
+    stack = [dirpath]
+    while stack:
+        subdirs = []
+        with _scandir(stack.pop()) as it:
+            for el in it:
+                if el.is_dir(follow_symlinks=follow_symlinks):
+                    subdirs.append(el.path)
+                if filterfn is None or filterfn(el):
+                    yield el
+        stack.extend(reversed(subdirs))
+
+
 def scandir_gen(
     fspath: FsPath = ".",
     *,
@@ -243,6 +336,9 @@ def scandir_gen(
 ) -> Iterator[DirEntry[str]]:
     r"""Return an iterator of os.DirEntry objects
 
+    When recursive, each directory is scanned exactly once; a directory's
+    entries are yielded before those of its sub-directories.
+
     Args:
         fspath: (FsPath): dirpath to look through
         recursive (bool): recursively scan the directory
@@ -273,25 +369,7 @@ def scandir_gen(
             symlinks_only=symlinks_only,
         )
 
-    return scandir_gen_filter(
-        chain(
-            scandir(fspath),
-            *(
-                scandir_gen(
-                    el.path,
-                    recursive=True,
-                    follow_symlinks=follow_symlinks,
-                    files=files,
-                    dirs=True,
-                    symlinks=symlinks,
-                    files_only=files_only,
-                    dirs_only=dirs_only,
-                    symlinks_only=symlinks_only,
-                )
-                for el in scandir(fspath)
-                if el.is_dir(follow_symlinks=follow_symlinks)
-            ),
-        ),
+    _filterfn = _scandir_filterfn(
         follow_symlinks=follow_symlinks,
         files=files,
         dirs=dirs,
@@ -300,6 +378,12 @@ def scandir_gen(
         dirs_only=dirs_only,
         symlinks_only=symlinks_only,
     )
+    if not isdir(fspath):
+        _emsg = f"{fspath} is not a directory"
+        raise NotADirectoryError(_emsg)
+    return _scandir_gen_recursive(
+        _fspath(fspath), follow_symlinks=follow_symlinks, filterfn=_filterfn
+    )
 
 
 def listdir_gen(
@@ -950,6 +1034,8 @@ def write_bytes(
     *,
     append: bool = False,
     chmod: int | None = None,
+    atomic: bool = False,
+    fsync: bool = False,
 ) -> int:
     """Write/Save bytes to a fspath
 
@@ -962,6 +1048,11 @@ def write_bytes(
         append (bool): Append to the file if True, overwrite otherwise; default
             is False
         chmod (Optional[int]): chmod the file after writing; default is None
+        atomic (bool): Write to a temp file in the same directory and rename
+            it over filepath (readers never see a partial write); cannot be
+            combined w/ append
+        fsync (bool): fsync the file (and w/ atomic its directory) so the
+            data survives a crash/power-loss
 
     Returns:
         int: Number of bytes written
@@ -976,12 +1067,22 @@ def write_bytes(
         20
         >>> read_bytes(fspath)
         b'These are some bytes'
+        >>> write_bytes(fspath, b"replaced", atomic=True)
+        8
+        >>> read_bytes(fspath)
+        b'replaced'
         >>> import os; os.remove(fspath)
 
     """
+    if atomic:
+        _check_atomic_append(append=append)
+        with atomic_open(filepath, fsync=fsync, chmod=chmod) as fd:
+            return fd.write(bites)
     _write_mode = "ab" if append else "wb"
     with open(filepath, _write_mode) as fd:
         nbytes = fd.write(bites)
+        if fsync:
+            _fsync_file(fd)
     if chmod is not None:
         _chmod(filepath, chmod)
     return nbytes
@@ -1080,6 +1181,8 @@ def write_bytes_gen(
     *,
     append: bool = False,
     chmod: int | None = None,
+    atomic: bool = False,
+    fsync: bool = False,
 ) -> int:
     """Write/Save bytes to a fspath
 
@@ -1089,6 +1192,10 @@ def write_bytes_gen(
         append (bool): Append to the file if True, overwrite otherwise; default
             is False
         chmod (Optional[int]): chmod the file after writing; default is None
+        atomic (bool): Write to a temp file and rename it over filepath once
+            bytes_gen is exhausted (if bytes_gen raises, filepath is left
+            untouched)
+        fsync (bool): fsync the file (and w/ atomic its directory)
 
     Returns:
         int: Number of bytes written
@@ -1106,9 +1213,15 @@ def write_bytes_gen(
         >>> import os; os.remove(fspath)
 
     """
+    if atomic:
+        _check_atomic_append(append=append)
+        with atomic_open(filepath, fsync=fsync, chmod=chmod) as fd:
+            return sum(fd.write(chunk) for chunk in bytes_gen)
     _mode = const.ab if append else const.wb
     with open(filepath, mode=_mode) as fd:
         nbytes_written = sum(fd.write(chunk) for chunk in bytes_gen)
+        if fsync:
+            _fsync_file(fd)
     if chmod is not None:
         _chmod(filepath, chmod)
     return nbytes_written
@@ -1152,6 +1265,8 @@ def write_str(
     encoding: str = "utf-8",
     append: bool = False,
     chmod: int | None = None,
+    atomic: bool = False,
+    fsync: bool = False,
 ) -> int:
     """Save/Write a string to fspath
 
@@ -1161,6 +1276,8 @@ def write_str(
         encoding: String encoding to write file with
         append (bool): Flag to append to file; default = False
         chmod (Optional[int]): Optional chmod to set on file
+        atomic (bool): Write a temp file & rename it over filepath
+        fsync (bool): fsync the file (and w/ atomic its directory)
 
     Returns:
         None
@@ -1180,6 +1297,8 @@ def write_str(
         bites=string.encode(encoding),
         append=append,
         chmod=chmod,
+        atomic=atomic,
+        fsync=fsync,
     )
 
 
@@ -1194,6 +1313,8 @@ def write_json(
     default: Callable[[Any], Any] | None = None,
     chmod: int | None = None,
     append: bool = False,
+    atomic: bool = False,
+    fsync: bool = False,
     **kwargs: Any,
 ) -> int:
     """Save/Write json-serial-ize-able data to a fspath
@@ -1208,6 +1329,8 @@ def write_json(
         default: default function hook
         chmod (Optional[int]): Optional chmod to set on file
         append (bool): Append to the file if True, overwrite otherwise; default
+        atomic (bool): Write a temp file & rename it over filepath
+        fsync (bool): fsync the file (and w/ atomic its directory)
         **kwargs: Additional keyword arguments to pass to jsonbourne.JSON.dumpb
 
     Returns:
@@ -1256,6 +1379,8 @@ def write_json(
         ),
         chmod=chmod,
         append=append,
+        atomic=atomic,
+        fsync=fsync,
     )
 
 
@@ -1352,11 +1477,14 @@ def filecmp(
 ) -> bool:
     """Compare 2 files for equality given their filepaths
 
+    Large files are memory-mapped and compared in big slices; small files
+    are compared in blocksize chunks.
+
     Args:
         left (FsPath): Filepath 1
         right (FsPath): Filepath 2
         shallow (bool): Check only size and modification time if True
-        blocksize (int): Chunk size to read files
+        blocksize (int): Chunk size to read (small/unmappable) files
 
     Returns:
         True if files are equal, False otherwise
@@ -1372,14 +1500,7 @@ def filecmp(
         return True
     if left_stat.st_size != right_stat.st_size:
         return False
-    return not any(
-        left_chunk != right_chunk
-        for left_chunk, right_chunk in zip(
-            read_bytes_gen(left, blocksize=blocksize),
-            read_bytes_gen(right, blocksize=blocksize),
-            strict=False,
-        )
-    )
+    return _cmp_contents(left, right, size=left_stat.st_size, blocksize=blocksize)
 
 
 def shebang(fspath: FsPath) -> str | None:
@@ -1495,18 +1616,152 @@ def rmfile(fspath: FsPath, *, dryrun: bool = False) -> str:
     return _fspath(fspath)
 
 
-def rmdir(fspath: FsPath, *, force: bool = False, recursive: bool = False) -> None:
+@dataclass
+class RmTreeStats:
+    """rm_tree statistics"""
+
+    dirs: int
+    files: int
+    nbytes: int
+
+    __slots__ = ("dirs", "files", "nbytes")
+
+
+def _rm_files(fspaths: list[str], *, dryrun: bool, force: bool) -> tuple[int, int]:
+    """Unlink a batch of (non-directory) paths (worker fn)
+
+    Returns:
+        Tuple of (n-files removed, n-bytes freed); bytes are only counted
+        for files w/o other hard links
+
+    """
+    nfiles = nbytes = 0
+    for fspath in fspaths:
+        try:
+            st = _lstat(fspath)
+            if not dryrun:
+                remove(fspath)
+        except FileNotFoundError:
+            if force:
+                continue
+            raise
+        nfiles += 1
+        if st.st_nlink <= 1:
+            nbytes += st.st_size
+    return nfiles, nbytes
+
+
+def _rm_dir(fspath: str, *, force: bool) -> None:
+    try:
+        _rmdir(fspath)
+    except FileNotFoundError:
+        if not force:
+            raise
+
+
+def rm_tree(
+    dirpath: FsPath,
+    *,
+    workers: int | None = None,
+    batchsize: int = 256,
+    dryrun: bool = False,
+    force: bool = False,
+) -> RmTreeStats:
+    """Remove a directory tree concurrently
+
+    The tree is walked w/ `walk_parallel_gen` and files are unlinked in
+    batches by a thread pool while the walk is still going; directories
+    are then removed bottom-up (all the directories at a given depth at
+    once) once they are empty. Deleting large trees on high-latency
+    (network) file-systems is bound by per-unlink latency, so this is much
+    faster than `shutil.rmtree`.
+
+    Args:
+        dirpath: Directory to remove
+        workers: Max number of worker threads (default: ThreadPoolExecutor's)
+        batchsize: Number of files unlinked per worker task
+        dryrun: Do not remove anything; just return what would be removed
+        force: Ignore a missing dirpath and files/dirs removed concurrently
+
+    Returns:
+        RmTreeStats: number of dirs and files removed and bytes freed
+
+    Raises:
+        FileNotFoundError: If dirpath does not exist and force is False
+        NotADirectoryError: If dirpath is not a directory
+        ValueError: If batchsize is less than 1
+
+    """
+    _dirpath = _fspath(dirpath)
+    if batchsize < 1:
+        _emsg = f"batchsize must be >= 1; got {batchsize}"
+        raise ValueError(_emsg)
+    stats = RmTreeStats(dirs=0, files=0, nbytes=0)
+    if not path.lexists(_dirpath):
+        if force:
+            return stats
+        raise FileNotFoundError(_dirpath)
+    if not isdir(_dirpath) or path.islink(_dirpath):
+        raise NotADirectoryError(_dirpath)
+    dirs: dict[int, list[str]] = {0: [_dirpath]}
+    root_depth = _dirpath.rstrip(sep).count(sep)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        try:
+            futures = []
+            batch: list[str] = []
+            for entry in walk_parallel_gen(_dirpath, workers=workers):
+                if entry.is_dir(follow_symlinks=False):
+                    dirs.setdefault(entry.path.count(sep) - root_depth, []).append(
+                        entry.path
+                    )
+                    continue
+                batch.append(entry.path)
+                if len(batch) >= batchsize:
+                    futures.append(
+                        pool.submit(_rm_files, batch, dryrun=dryrun, force=force)
+                    )
+                    batch = []
+            if batch:
+                futures.append(
+                    pool.submit(_rm_files, batch, dryrun=dryrun, force=force)
+                )
+            for fut in as_completed(futures):
+                nfiles, nbytes = fut.result()
+                stats.files += nfiles
+                stats.nbytes += nbytes
+            for depth in sorted(dirs, reverse=True):
+                if not dryrun:
+                    exhaust(pool.map(lambda d: _rm_dir(d, force=force), dirs[depth]))
+                stats.dirs += len(dirs[depth])
+        except BaseException:
+            pool.shutdown(wait=True, cancel_futures=True)
+            raise
+    return stats
+
+
+def rmdir(
+    fspath: FsPath,
+    *,
+    force: bool = False,
+    recursive: bool = False,
+    workers: int | None = None,
+) -> None:
     """Remove directory at given fspath
 
     Args:
         fspath (FsPath): Directory path to remove
         force (bool): Force removal of files and directories
         recursive (bool): Recursively remove all contents if True
+        workers (int | None): Remove recursively w/ `rm_tree` using this
+            many worker threads if given
 
     Returns:
         None
 
     """
+    if recursive and workers is not None:
+        rm_tree(fspath, workers=workers, force=force)
+        return None
     if force:
         try:
             return rmdir(fspath, recursive=recursive)
@@ -1523,6 +1778,7 @@ def rm_gen(
     force: bool = False,
     recursive: bool = False,
     dryrun: bool = False,
+    workers: int | None = None,
 ) -> Generator[str, Any, Any]:
     """Remove files & directories in the style of the shell
 
@@ -1531,6 +1787,8 @@ def rm_gen(
         force (bool): Force removal of files and directories
         recursive (bool): Flag to remove recursively (like the `-r` in `rm -r dir`)
         dryrun (bool): Do not remove file if True
+        workers (int | None): Remove directories concurrently w/ `rm_tree`
+            using this many worker threads if given
 
     Raises:
         ValueError: If recursive and r are `False` and fspath is a directory
@@ -1544,7 +1802,7 @@ def rm_gen(
                 if isfile(_path_str):
                     remove(_path_str)
                 elif recursive:
-                    rmdir(_path_str, recursive=True, force=force)
+                    rmdir(_path_str, recursive=True, force=force, workers=workers)
                 else:
                     _emsg = f"{_path_str!s} (under {fspath!s}) is a directory -- use r=True or recursive=True"
                     raise ValueError(_emsg)
@@ -1555,7 +1813,7 @@ def rm_gen(
             yield _fspath(fspath)
         elif recursive:
             if not dryrun:
-                rmdir(fspath, force=force, recursive=True)
+                rmdir(fspath, force=force, recursive=True, workers=workers)
             yield _fspath(fspath)
         else:
             _emsg = f"{fspath!s} is a directory -- use r=True or recursive=True"
@@ -1569,6 +1827,7 @@ def rm(
     recursive: bool = False,
     dryrun: bool = False,
     verbose: bool = False,
+    workers: int | None = None,
 ) -> list[str] | None:
     """Remove files & directories in the style of the shell
 
@@ -1578,16 +1837,19 @@ def rm(
         recursive (bool): Flag to remove recursively (like the `-r` in `rm -r dir`)
         dryrun (bool): Do not remove file if True
         verbose (bool): Print the files being removed
+        workers (int | None): Remove directories concurrently w/ `rm_tree`
+            using this many worker threads if given
 
     Raises:
         ValueError: If recursive and r are `False` and fspath is a directory
 
     """
+    _rm_gen = rm_gen(
+        fspath=fspath, force=force, recursive=recursive, dryrun=dryrun, workers=workers
+    )
     if verbose:
-        return list(
-            rm_gen(fspath=fspath, force=force, recursive=recursive, dryrun=dryrun)
-        )
-    exhaust(rm_gen(fspath=fspath, force=force, recursive=recursive, dryrun=dryrun))
+        return list(_rm_gen)
+    exhaust(_rm_gen)
     return None
 
 
@@ -1610,11 +1872,93 @@ def symlink(link: FsPath, target: FsPath, *, _type: SymlinkType = "file") -> Non
     _symlink(str(link), str(target))
 
 
+# errnos for which the kernel copy paths fall back to the next strategy
+# (unsupported by the kernel/fs, cross-device on older kernels, etc)
+_COPYFILE_FALLBACK_ERRNOS = frozenset(
+    e
+    for e in (
+        errno.ENOSYS,
+        errno.EXDEV,
+        errno.EINVAL,
+        errno.EBADF,
+        errno.ETXTBSY,
+        errno.EPERM,
+        getattr(errno, "EOPNOTSUPP", None),
+        getattr(errno, "ENOTSUP", None),
+    )
+    if e is not None
+)
+_HAS_COPY_FILE_RANGE = hasattr(os, "copy_file_range")
+_HAS_SENDFILE_FILE = sys.platform.startswith("linux") and hasattr(os, "sendfile")
+
+
+def _copyfile_fd(src_fd: int, dest_fd: int, *, blocksize: int) -> int:
+    """Copy src_fd to dest_fd in kernel space; return n-bytes copied
+
+    Tries `os.copy_file_range` (which can reflink/server-side copy) and
+    then `os.sendfile`; both start at the offset the previous strategy
+    stopped at. Returns the number of bytes copied, which may be less than
+    the file size (eg 0 if neither is supported) in which case the caller
+    should finish the copy w/ a buffered loop.
+    """
+    copied = 0
+    if _HAS_COPY_FILE_RANGE:
+        try:
+            while n := os.copy_file_range(src_fd, dest_fd, blocksize, copied, copied):
+                copied += n
+        except OSError as e:
+            if e.errno not in _COPYFILE_FALLBACK_ERRNOS:
+                raise
+        else:
+            if copied:
+                return copied
+    if _HAS_SENDFILE_FILE:
+        try:
+            os.lseek(dest_fd, copied, os.SEEK_SET)
+            while n := os.sendfile(dest_fd, src_fd, copied, blocksize):
+                copied += n
+        except OSError as e:
+            if e.errno not in _COPYFILE_FALLBACK_ERRNOS:
+                raise
+    return copied
+
+
+def _copyfile(src: FsPath, dest: FsPath, *, blocksize: int = 2**18) -> int:
+    """Copy file contents w/o passing the bytes through python (if possible)
+
+    Strategies (fastest first): os.copy_file_range, os.sendfile (linux)
+    and a buffered read/write loop of `blocksize` chunks.
+
+    Returns:
+        int: Number of bytes copied
+
+    """
+    with open(src, "rb") as fsrc, open(dest, "wb") as fdest:
+        if _HAS_COPY_FILE_RANGE or _HAS_SENDFILE_FILE:
+            size = os.fstat(fsrc.fileno()).st_size
+            copied = _copyfile_fd(
+                fsrc.fileno(),
+                fdest.fileno(),
+                blocksize=min(max(size, 2**23), 2**30),
+            )
+            if copied:
+                fsrc.seek(copied)
+                fdest.seek(copied)
+        else:
+            copied = 0
+        while chunk := fsrc.read(blocksize):
+            copied += fdest.write(chunk)
+    return copied
+
+
 def copy_file(
     src: FsPath, dest: FsPath, *, dryrun: bool = False, mkdirp: bool = False
 ) -> tuple[str, str]:
     """Copy a file given a source-path and a destination-path
 
+    The contents are copied by the kernel when possible (`copy_file_range`
+    then `sendfile` on linux), falling back to a buffered read/write loop.
+
     Args:
         src (str): Source fspath
         dest (str): Destination fspath
@@ -1629,11 +1973,164 @@ def copy_file(
         _emsg = f"Destination directory {_dest.parent} does not exist"
         raise FileNotFoundError(_emsg)
     if not dryrun:
-        write_bytes_gen(dest, read_bytes_gen(src, blocksize=2**18))
+        _copyfile(src, dest)
         _copystat(src, dest, follow_symlinks=True)
     return (str(src), str(dest))
 
 
+@dataclass
+class CopyTreeStats:
+    """copy_tree statistics"""
+
+    dirs: int
+    files: int
+    skipped: int
+    nbytes: int
+
+    __slots__ = ("dirs", "files", "nbytes", "skipped")
+
+
+def _is_identical(
+    src: str, dest: str, *, skip_identical: Literal["mtime", "content"]
+) -> bool:
+    """Return True if dest exists and is identical to src"""
+    try:
+        dest_stat = _stat(dest)
+    except FileNotFoundError:
+        return False
+    src_stat = _stat(src)
+    if src_stat.st_size != dest_stat.st_size:
+        return False
+    if skip_identical == "mtime":
+        return src_stat.st_mtime_ns == dest_stat.st_mtime_ns
+    return filecmp(src, dest, shallow=False)
+
+
+def _copy_tree_file(
+    src: str,
+    dest: str,
+    *,
+    symlink: bool,
+    skip_identical: Literal["mtime", "content"] | None,
+    dryrun: bool,
+) -> int | None:
+    """Copy a single file (worker fn); returns n-bytes or None if skipped"""
+    if skip_identical is not None and _is_identical(
+        src, dest, skip_identical=skip_identical
+    ):
+        return None
+    if symlink:
+        if not dryrun:
+            if path.lexists(dest):
+                remove(dest)
+            _symlink(os.readlink(src), dest)
+        return 0
+    if dryrun:
+        return _stat(src).st_size
+    nbytes = _copyfile(src, dest)
+    _copystat(src, dest, follow_symlinks=True)
+    return nbytes
+
+
+def copy_tree(
+    src: FsPath,
+    dest: FsPath,
+    *,
+    workers: int | None = None,
+    dryrun: bool = False,
+    skip_identical: Literal["mtime", "content"] | None = None,
+    symlinks: bool = False,
+    progress: Callable[[str, str, int | None], Any] | None = None,
+) -> CopyTreeStats:
+    """Copy the contents of directory src into directory dest concurrently
+
+    The source tree is walked w/ `walk_parallel_gen`, all directories are
+    created (in order) and then the files are copied by a thread pool using
+    the kernel copy paths of `copy_file`. File and directory metadata are
+    copied like `shutil.copytree` (directories last, bottom-up). Copying
+    trees of many small files is bound by per-file latency so copying many
+    at once is much faster than a serial copy.
+
+    Args:
+        src: Source directory
+        dest: Destination directory (created if it does not exist)
+        workers: Max number of worker threads (default: ThreadPoolExecutor's)
+        dryrun: Do not create/copy anything; just return what would be done
+        skip_identical: Skip files that exist in dest and are identical;
+            "mtime" compares size & mtime, "content" compares size & bytes
+        symlinks: Re-create symlinks in dest if True; copy the contents of
+            the symlink targets if False (like shutil.copytree)
+        progress: Callback called (in the calling thread) w/ the src, dest
+            and n-bytes copied (None if skipped) as each file is done
+
+    Returns:
+        CopyTreeStats: number of dirs, files copied, files skipped and bytes
+
+    Raises:
+        NotADirectoryError: If src is not a directory
+
+    """
+    _src = _fspath(src)
+    _dest = _fspath(dest)
+    if not isdir(_src):
+        raise NotADirectoryError(_src)
+    stats = CopyTreeStats(dirs=0, files=0, skipped=0, nbytes=0)
+    dirpairs: list[tuple[str, str]] = [(_src, _dest)]
+    filepairs: list[tuple[str, str, bool]] = []
+    for entry in walk_parallel_gen(_src, workers=workers, follow_symlinks=not symlinks):
+        dest_path = path.join(_dest, entry.path[len(_src) :].lstrip(sep))
+        if symlinks and entry.is_symlink():
+            filepairs.append((entry.path, dest_path, True))
+        elif entry.is_dir(follow_symlinks=not symlinks):
+            dirpairs.append((entry.path, dest_path))
+        else:
+            filepairs.append((entry.path, dest_path, False))
+    stats.dirs = len(dirpairs)
+    if not dryrun:
+        for _, dirpath in dirpairs:
+            _makedirs(dirpath, exist_ok=True)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(
+                _copy_tree_file,
+                filesrc,
+                filedest,
+                symlink=is_symlink,
+                skip_identical=skip_identical,
+                dryrun=dryrun,
+            ): (filesrc, filedest)
+            for filesrc, filedest, is_symlink in filepairs
+        }
+        try:
+            for fut in as_completed(futures):
+                nbytes = fut.result()
+                if nbytes is None:
+                    stats.skipped += 1
+                else:
+                    stats.files += 1
+                    stats.nbytes += nbytes
+                if progress is not None:
+                    progress(*futures[fut], nbytes)
+        except BaseException:
+            pool.shutdown(wait=True, cancel_futures=True)
+            raise
+    if not dryrun:
+        for dirsrc, dirdest in reversed(dirpairs):
+            _copystat(dirsrc, dirdest, follow_symlinks=True)
+    return stats
+
+
+def _copy_files(
+    filepairs: list[tuple[str, str]], *, workers: int | None = None
+) -> None:
+    """Copy (src, dest) file pairs w/ copy_file; concurrently if > 1"""
+    if len(filepairs) == 1:
+        copy_file(*filepairs[0])
+    elif filepairs:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            exhaust(pool.map(lambda pair: copy_file(*pair), filepairs))
+
+
 def cp(
     src: FsPath,
     dest: FsPath,
@@ -1642,9 +2139,14 @@ def cp(
     recursive: bool = False,
     r: bool = False,
     f: bool = True,
+    workers: int | None = None,
 ) -> None:
     """Copy the directory/file src to the directory/file dest
 
+    When dest is an existing directory, the files matched by src are copied
+    into it concurrently by a thread pool (as are directory trees, via
+    `copy_tree`); otherwise the matches are copied one after the other.
+
     Args:
         src (str): Source directory/file to copy
         dest: Destination directory/file to copy
@@ -1652,6 +2154,7 @@ def cp(
         recursive: Recursive copy (like -r flag for cp in shell)
         r: alias for recursive
         f: alias for force
+        workers: Max number of worker threads (default: ThreadPoolExecutor's)
 
     Raises:
         ValueError: If src is a directory and recursive and r are both `False`
@@ -1659,20 +2162,27 @@ def cp(
     """
     _recursive = recursive or r
     _force = force or f
+    # dest -> src of the files to copy into the dest dir (last match wins)
+    filepairs: dict[str, str] = {}
+    into_dir = path.isdir(dest)
     for _src in iglob(_fspath(src), recursive=True):
         _dest = dest
         if (path.exists(dest) and not _force) or _src == dest:
-            return
+            break
         if path.isdir(_src) and not _recursive:
             raise ValueError("Source ({}) is directory; use r=True")
         if path.isfile(_src) and path.isdir(dest):
             _dest = path.join(dest, path.basename(_src))
         if path.isfile(_src) or path.islink(src):
-            copy_file(_src, _dest)
+            if into_dir:
+                filepairs[_fspath(_dest)] = _src
+            else:
+                copy_file(_src, _dest)
         if path.isdir(_src):
             if not path.exists(dest):
                 _makedirs(dest)
-            copytree(src, dest, dirs_exist_ok=True)
+            copy_tree(_src, dest, workers=workers)
+    _copy_files([(_src, _dest) for _dest, _src in filepairs.items()], workers=workers)
 
 
 # aliases
@@ -1690,16 +2200,32 @@ sjson = wjson = deprecated_alias(write_json)
 
 # module exports
 __all__ = (
+    "CopyTreeStats",
+    "DirCmp",
+    "DuResult",
+    "DuStats",
+    "DuplicateGroup",
+    "FileHashCache",
+    "FsChanges",
+    "FsSnapshot",
+    "FsSnapshotEntry",
+    "FsWatcher",
+    "RmTreeStats",
     "Stdio",
     "SymlinkType",
     "__version__",
+    "atomic_open",
+    "atomic_open_async",
     "chmod",
     "copy_file",
+    "copy_tree",
     "cp",
     "dir_exists",
     "dir_exists_async",
+    "dircmp",
     "dirpath_gen",
     "dirs_gen",
+    "du",
     "exists",
     "exists_async",
     "extension",
@@ -1713,6 +2239,7 @@ __all__ = (
     "files_gen",
     "filesize",
     "filesize_async",
+    "find_duplicates",
     "fspath",
     "glob",
     "is_dir",
@@ -1768,6 +2295,7 @@ __all__ = (
     "rjson_async",
     "rm",
     "rm_gen",
+    "rm_tree",
     "rmdir",
     "rmfile",
     "rstr",
@@ -1802,6 +2330,9 @@ __all__ = (
     "symlink",
     "touch",
     "walk_gen",
+    "walk_parallel_gen",
+    "watch",
+    "watch_async",
     "wbin",
     "wbin_async",
     "wbin_gen",
@@ -3,6 +3,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import os
 
 from collections.abc import AsyncIterable, AsyncIterator, Callable, Iterable
@@ -13,6 +14,7 @@ from aiopen import aiopen
 from jsonbourne import JSON
 from shellfish import aios
 from shellfish._internal import deprecated_alias
+from shellfish.fs._atomic import _check_atomic_append, atomic_open_async
 
 if TYPE_CHECKING:
     from shellfish._types import FsPath
@@ -180,6 +182,8 @@ async def write_bytes_async(
     *,
     append: bool = False,
     chmod: int | None = None,
+    atomic: bool = False,
+    fsync: bool = False,
 ) -> int:
     """(ASYNC) Write/Save bytes to a fspath
 
@@ -191,6 +195,9 @@ async def write_bytes_async(
         filepath: fspath to write to
         bites: Bytes to be written
         chmod: chmod the fspath to this mode after writing
+        atomic (bool): Write to a temp file in the same directory and rename
+            it over filepath (readers never see a partial write)
+        fsync (bool): fsync the file (and w/ atomic its directory)
 
     Returns:
         None
@@ -209,9 +216,15 @@ async def write_bytes_async(
         >>> import os; os.remove(fspath)
 
     """
+    if atomic:
+        _check_atomic_append(append=append)
+        async with atomic_open_async(filepath, fsync=fsync, chmod=chmod) as fd:
+            return int(await fd.write(bites))
     _write_mode = "ab" if append else "wb"
     async with aiopen(filepath, _write_mode) as fd:
         nbytes = await fd.write(bites)
+        if fsync:
+            await _fsync_async(fd)
     if chmod is not None:
         await aios.chmod(str(filepath), chmod)
     return int(nbytes)
@@ -329,6 +342,8 @@ async def write_bytes_gen_async(
     *,
     append: bool = False,
     chmod: int | None = None,
+    atomic: bool = False,
+    fsync: bool = False,
 ) -> int:
     """Write/save bytes to a filepath from an (async)iterable/iterator of bytes
 
@@ -337,6 +352,9 @@ async def write_bytes_gen_async(
         bytes_gen: AsyncIterable/Iterator of bytes to write
         append: Append to the fspath if True; otherwise overwrite
         chmod: chmod the fspath if not None
+        atomic: Write to a temp file and rename it over filepath once
+            bytes_gen is exhausted
+        fsync: fsync the file (and w/ atomic its directory)
 
     Returns:
         int: number of bytes written
@@ -400,22 +418,40 @@ async def write_bytes_gen_async(
 
 
     """
-    _bytes_written = 0
+    if atomic:
+        _check_atomic_append(append=append)
+        async with atomic_open_async(filepath, fsync=fsync, chmod=chmod) as f:
+            return await _write_chunks_async(f, bytes_gen)
     async with aiopen(filepath, "ab" if append else "wb") as f:
-        if isinstance(bytes_gen, AsyncIterator):
-            async for b in bytes_gen:
-                _bytes_written += await f.write(b)
-        elif isinstance(bytes_gen, AsyncIterable):
-            async for b in bytes_gen.__aiter__():
-                _bytes_written += await f.write(b)
-        else:
-            for b in bytes_gen:
-                _bytes_written += await f.write(b)
+        _bytes_written = await _write_chunks_async(f, bytes_gen)
+        if fsync:
+            await _fsync_async(f)
     if chmod is not None:  # pragma: nocov
         await aios.chmod(filepath, chmod)
     return _bytes_written
 
 
+async def _write_chunks_async(
+    f: Any, bytes_gen: Iterable[bytes] | AsyncIterable[bytes]
+) -> int:
+    _bytes_written = 0
+    if isinstance(bytes_gen, AsyncIterator):
+        async for b in bytes_gen:
+            _bytes_written += await f.write(b)
+    elif isinstance(bytes_gen, AsyncIterable):
+        async for b in bytes_gen.__aiter__():
+            _bytes_written += await f.write(b)
+    else:
+        for b in bytes_gen:
+            _bytes_written += await f.write(b)
+    return _bytes_written
+
+
+async def _fsync_async(f: Any) -> None:
+    await f.flush()
+    await asyncio.to_thread(os.fsync, f.fileno())
+
+
 async def read_str_async(filepath: FsPath, encoding: str = "utf-8") -> str:
     r"""(ASYNC) Load/Read a string given a fspath
 
@@ -437,6 +473,8 @@ async def write_str_async(
     encoding: str = "utf-8",
     append: bool = False,
     chmod: int | None = None,
+    atomic: bool = False,
+    fsync: bool = False,
 ) -> int:
     """(ASYNC) Save/Write a string to fspath
 
@@ -446,6 +484,8 @@ async def write_str_async(
         encoding (str): File encoding (Default='utf-8')
         append (bool): Append to the fspath if True; default is False
         chmod (Optional[int]): chmod the fspath if not None
+        atomic (bool): Write a temp file & rename it over filepath
+        fsync (bool): fsync the file (and w/ atomic its directory)
 
     Returns:
         int: number of bytes written
@@ -456,6 +496,8 @@ async def write_str_async(
         bites=string.encode(encoding),
         append=append,
         chmod=chmod,
+        atomic=atomic,
+        fsync=fsync,
     )
 
 
@@ -514,6 +556,8 @@ async def write_json_async(
     default: Callable[[Any], Any] | None = None,
     append: bool = False,
     chmod: int | None = None,
+    atomic: bool = False,
+    fsync: bool = False,
     **kwargs: Any,
 ) -> int:
     """Save/Write json-serial-ize-able data to a fspath
@@ -528,6 +572,8 @@ async def write_json_async(
         default: default function hook
         append (bool): Append to the fspath if True; default is False
         chmod (Optional[int]): chmod the fspath if not None
+        atomic (bool): Write a temp file & rename it over filepath
+        fsync (bool): fsync the file (and w/ atomic its directory)
         **kwargs: Additional keyword arguments to pass to jsonbourne.JSON.dump
 
     Returns:
@@ -577,6 +623,8 @@ async def write_json_async(
         ),
         append=append,
         chmod=chmod,
+        atomic=atomic,
+        fsync=fsync,
     )
 
 
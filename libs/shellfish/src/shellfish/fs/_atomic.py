@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+"""Atomic (write-temp-then-rename) & durable (fsync) file writes"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+
+from contextlib import asynccontextmanager, contextmanager
+from os import (
+    O_CREAT as _O_CREAT,
+    O_EXCL as _O_EXCL,
+    O_WRONLY as _O_WRONLY,
+    chmod as _chmod,
+    fspath as _fspath,
+    path,
+    replace as _replace,
+    stat as _stat,
+    unlink as _unlink,
+)
+from secrets import token_hex
+from stat import S_IMODE
+from typing import IO, TYPE_CHECKING, Any
+
+from aiopen import aiopen
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator, Generator
+
+    from shellfish._types import FsPath
+
+__all__ = ("atomic_open", "atomic_open_async")
+
+_O_BINARY: int = getattr(os, "O_BINARY", 0)
+
+
+def _check_atomic_append(*, append: bool) -> None:
+    if append:
+        _emsg = "atomic writes cannot append (atomic=True and append=True)"
+        raise ValueError(_emsg)
+
+
+def _mktemp(filepath: FsPath, *, chmod: int | None) -> tuple[str, str, int | None]:
+    """Create an empty temp file next to filepath; returns (target, tmp, mode)
+
+    Symlinks are resolved so the target's target is replaced (like the
+    non-atomic writers that write through the link) and the temp file is
+    created in its directory (so the final rename never crosses
+    file-systems). The mode is chmod or the target's mode if the target
+    exists (otherwise None for the umask default, like
+    `open(filepath, 'wb')`); it is applied by `_commit` after the write so
+    read-only modes do not block writing the temp file.
+    """
+    target = path.realpath(_fspath(filepath))
+    dirname, basename = path.split(target)
+    mode = chmod
+    if mode is None:
+        try:
+            mode = S_IMODE(_stat(target).st_mode)
+        except FileNotFoundError:
+            ...
+    while True:
+        tmp = path.join(dirname, f".{basename}.{token_hex(4)}.tmp")
+        try:
+            fd = os.open(tmp, _O_WRONLY | _O_CREAT | _O_EXCL | _O_BINARY, 0o666)
+        except FileExistsError:
+            continue
+        os.close(fd)
+        return target, tmp, mode
+
+
+def _discard(tmp: str) -> None:
+    try:
+        _unlink(tmp)
+    except FileNotFoundError:
+        ...
+
+
+def _fsync_dir(dirpath: FsPath) -> None:
+    """fsync a directory (persists renames/creations in it); no-op on windows"""
+    if os.name == "nt":
+        return
+    fd = os.open(_fspath(dirpath) or ".", os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _fsync_file(file: IO[Any]) -> None:
+    """Flush a file object's buffer and fsync it"""
+    file.flush()
+    os.fsync(file.fileno())
+
+
+def _commit(tmp: str, target: str, *, mode: int | None, fsync: bool) -> None:
+    """Apply the mode to the (written, closed) temp file & rename it over target"""
+    if mode is not None:
+        _chmod(tmp, mode)
+    _replace(tmp, target)
+    if fsync:
+        _fsync_dir(path.dirname(target))
+
+
+@contextmanager
+def atomic_open(
+    filepath: FsPath,
+    *,
+    fsync: bool = False,
+    chmod: int | None = None,
+) -> Generator[IO[bytes], None, None]:
+    """Open a temp file for writing that replaces filepath on success
+
+    Readers of filepath see either the old or the new contents, never a
+    partial write; if the block raises, the temp file is removed and
+    filepath is left untouched.
+
+    Args:
+        filepath: File path to (atomically) write
+        fsync: fsync the file before the rename and its directory after it
+            so the new contents survive a crash/power-loss
+        chmod: Mode for the file (default: the existing file's mode)
+
+    Yields:
+        Binary file object to write to
+
+    Examples:
+        >>> from shellfish import fs
+        >>> with atomic_open("atomic-open.doctest.txt") as f:
+        ...     f.write(b"all or nothing")
+        14
+        >>> fs.read_str("atomic-open.doctest.txt")
+        'all or nothing'
+        >>> fs.rm("atomic-open.doctest.txt")
+
+    """
+    target, tmp, mode = _mktemp(filepath, chmod=chmod)
+    try:
+        with open(tmp, "wb") as f:
+            yield f
+            if fsync:
+                _fsync_file(f)
+        _commit(tmp, target, mode=mode, fsync=fsync)
+    except BaseException:
+        _discard(tmp)
+        raise
+
+
+@asynccontextmanager
+async def atomic_open_async(
+    filepath: FsPath,
+    *,
+    fsync: bool = False,
+    chmod: int | None = None,
+) -> AsyncGenerator[Any, None]:
+    """(ASYNC) Open a temp file for writing that replaces filepath on success
+
+    Same as [atomic_open][shellfish.fs.atomic_open] w/ an async file object
+    (the temp-file creation, fsyncs & rename run in a worker thread).
+
+    Examples:
+        >>> from asyncio import run
+        >>> from shellfish import fs
+        >>> async def write():
+        ...     async with atomic_open_async("atomic-open-async.doctest.txt") as f:
+        ...         return await f.write(b"all or nothing")
+        >>> run(write())
+        14
+        >>> fs.read_str("atomic-open-async.doctest.txt")
+        'all or nothing'
+        >>> fs.rm("atomic-open-async.doctest.txt")
+
+    """
+    target, tmp, mode = await asyncio.to_thread(_mktemp, filepath, chmod=chmod)
+    try:
+        async with aiopen(tmp, "wb") as f:
+            yield f
+            if fsync:
+                await f.flush()
+                await asyncio.to_thread(os.fsync, f.fileno())
+        await asyncio.to_thread(_commit, tmp, target, mode=mode, fsync=fsync)
+    except BaseException:
+        _discard(tmp)
+        raise
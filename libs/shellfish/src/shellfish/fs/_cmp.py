@@ -0,0 +1,305 @@
+# -*- coding: utf-8 -*-
+"""File & directory-tree comparison (fs.filecmp fast path, fs.dircmp)"""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from mmap import ACCESS_READ, mmap
+from os import fspath as _fspath, path, stat as _stat
+from typing import TYPE_CHECKING
+
+from jsonbourne import JSON
+from shellfish.fs._walk import walk_parallel_gen
+from shellfish.libhash import hash_file
+
+if TYPE_CHECKING:
+    from os import stat_result
+
+    from shellfish._types import FsPath
+
+__all__ = ("DirCmp", "FileHashCache", "dircmp")
+
+# files at least this big are compared w/ mmap (in _MMAP_SLICE slices)
+_MMAP_THRESHOLD = 2**20
+_MMAP_SLICE = 2**23
+
+
+def _cmp_contents_mmap(left: str, right: str, *, size: int) -> bool:
+    with (
+        open(left, "rb") as lf,
+        open(right, "rb") as rf,
+        mmap(lf.fileno(), 0, access=ACCESS_READ) as lmap,
+        mmap(rf.fileno(), 0, access=ACCESS_READ) as rmap,
+    ):
+        if len(lmap) != size or len(rmap) != size:
+            return False
+        return all(
+            lmap[ix : ix + _MMAP_SLICE] == rmap[ix : ix + _MMAP_SLICE]
+            for ix in range(0, size, _MMAP_SLICE)
+        )
+
+
+def _cmp_contents_buffered(left: str, right: str, *, blocksize: int) -> bool:
+    with open(left, "rb") as lf, open(right, "rb") as rf:
+        while True:
+            lchunk = lf.read(blocksize)
+            if lchunk != rf.read(blocksize):
+                return False
+            if not lchunk:
+                return True
+
+
+def _cmp_contents(
+    left: FsPath, right: FsPath, *, size: int, blocksize: int = 65536
+) -> bool:
+    """Return True if 2 files (both of the given size) have the same bytes
+
+    Files of at least 1 MiB are memory-mapped and compared in 8 MiB slices
+    (a memcmp per slice); smaller files, and files that cannot be mapped,
+    are compared by reading blocksize chunks.
+    """
+    _left, _right = _fspath(left), _fspath(right)
+    if size >= _MMAP_THRESHOLD:
+        try:
+            return _cmp_contents_mmap(_left, _right, size=size)
+        except (OSError, ValueError):
+            ...
+    return _cmp_contents_buffered(_left, _right, blocksize=blocksize)
+
+
+def _stat_key(st: stat_result) -> tuple[int, int, int, int]:
+    return (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+class FileHashCache:
+    """Content-hash cache keyed by file (device, inode, size, mtime_ns)
+
+    Digests are only recomputed for files whose stat signature changed;
+    the cache can be saved to/loaded from a file to persist across runs.
+    Safe to share between threads (worst case a file is hashed twice).
+
+    Examples:
+        >>> from shellfish import fs
+        >>> cache = FileHashCache()
+        >>> _ = fs.write_str("file-hash-cache.txt", "hello")
+        >>> cache.digest("file-hash-cache.txt") == cache.digest("file-hash-cache.txt")
+        True
+        >>> len(cache)
+        1
+        >>> fs.rm("file-hash-cache.txt")
+
+    """
+
+    __slots__ = ("_digests", "algo")
+
+    def __init__(self, algo: str = "blake2b") -> None:
+        self.algo = algo
+        self._digests: dict[tuple[int, int, int, int], str] = {}
+
+    def __len__(self) -> int:
+        return len(self._digests)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(algo={self.algo!r}, n={len(self)})"
+
+    def digest(self, fspath: FsPath, *, st: stat_result | None = None) -> str:
+        """Return the (hex) digest of a file, from the cache if unchanged
+
+        Args:
+            fspath: File path
+            st: stat_result for fspath if already known
+
+        Returns:
+            str: hex digest
+
+        """
+        key = _stat_key(st if st is not None else _stat(fspath))
+        cached = self._digests.get(key)
+        if cached is not None:
+            return cached
+        digest = hash_file(fspath, self.algo)
+        self._digests[key] = digest
+        return digest
+
+    def clear(self) -> None:
+        self._digests.clear()
+
+    def save(self, fspath: FsPath) -> int:
+        """Save the cache to a (json) file; returns the number of bytes written"""
+        with open(fspath, "wb") as f:
+            return f.write(
+                JSON.dumpb({
+                    "algo": self.algo,
+                    "digests": [
+                        [*key, digest] for key, digest in self._digests.items()
+                    ],
+                })
+            )
+
+    @classmethod
+    def load(cls, fspath: FsPath) -> FileHashCache:
+        """Load a cache saved with `save`"""
+        with open(fspath, "rb") as f:
+            data = JSON.loads(f.read())
+        cache = cls(algo=data["algo"])
+        cache._digests = {
+            (dev, ino, size, mtime_ns): digest
+            for dev, ino, size, mtime_ns, digest in data["digests"]
+        }
+        return cache
+
+
+@dataclass
+class DirCmp:
+    """dircmp result; all paths are relative to left/right & sorted"""
+
+    left: str
+    right: str
+    left_only: list[str]
+    right_only: list[str]
+    common_dirs: list[str]
+    same_files: list[str]
+    diff_files: list[str]
+    funny_files: list[str]
+
+    __slots__ = (
+        "common_dirs",
+        "diff_files",
+        "funny_files",
+        "left",
+        "left_only",
+        "right",
+        "right_only",
+        "same_files",
+    )
+
+    @property
+    def identical(self) -> bool:
+        """True if the trees have the same paths and same file contents"""
+        return not (
+            self.left_only or self.right_only or self.diff_files or self.funny_files
+        )
+
+
+def _tree(dirpath: str, *, workers: int | None) -> dict[str, bool]:
+    """Return {relpath: is_dir} for all entries beneath dirpath"""
+    start = len(dirpath.rstrip(path.sep)) + 1
+    return {
+        entry.path[start:]: entry.is_dir(follow_symlinks=False)
+        for entry in walk_parallel_gen(dirpath, workers=workers)
+    }
+
+
+def _cmp_files(
+    left: str,
+    right: str,
+    *,
+    shallow: bool,
+    cache: FileHashCache | None,
+) -> bool | None:
+    """Compare 2 files (worker fn); None if they could not be compared"""
+    try:
+        lstat, rstat = _stat(left), _stat(right)
+        if lstat.st_size != rstat.st_size:
+            return False
+        if shallow and lstat.st_mtime_ns == rstat.st_mtime_ns:
+            return True
+        if cache is not None:
+            return cache.digest(left, st=lstat) == cache.digest(right, st=rstat)
+        return _cmp_contents(left, right, size=lstat.st_size)
+    except OSError:
+        return None
+
+
+def dircmp(
+    left: FsPath,
+    right: FsPath,
+    *,
+    shallow: bool = False,
+    workers: int | None = None,
+    cache: FileHashCache | None = None,
+) -> DirCmp:
+    """Compare 2 directory trees recursively, comparing files concurrently
+
+    Both trees are walked w/ `walk_parallel_gen` and the files common to
+    both are compared by a thread pool. With a `FileHashCache` files are
+    compared by content hash; unchanged files (same inode, size & mtime)
+    are then never re-read on subsequent comparisons.
+
+    Args:
+        left: Left directory
+        right: Right directory
+        shallow: Consider files w/ the same size and mtime equal w/o
+            comparing their contents (like filecmp.cmp)
+        workers: Max number of worker threads (default: ThreadPoolExecutor's)
+        cache: Content-hash cache to compare files with (and populate)
+
+    Returns:
+        DirCmp: left/right only paths, common dirs, same/diff files and
+            funny files (file vs dir mismatches and files that could not be
+            compared)
+
+    Raises:
+        NotADirectoryError: If left or right is not a directory
+
+    Examples:
+        >>> from shellfish import fs
+        >>> fs.mkdirp("dircmp-left/sub")
+        >>> fs.mkdirp("dircmp-right/sub")
+        >>> _ = fs.write_str("dircmp-left/sub/a.txt", "a")
+        >>> _ = fs.write_str("dircmp-right/sub/a.txt", "b")
+        >>> _ = fs.write_str("dircmp-left/b.txt", "b")
+        >>> result = dircmp("dircmp-left", "dircmp-right")
+        >>> result.diff_files, result.left_only, result.identical
+        (['sub/a.txt'], ['b.txt'], False)
+        >>> fs.rm("dircmp-left", recursive=True)
+        >>> fs.rm("dircmp-right", recursive=True)
+
+    """
+    _left, _right = _fspath(left), _fspath(right)
+    for dirpath in (_left, _right):
+        if not path.isdir(dirpath):
+            raise NotADirectoryError(dirpath)
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        left_fut = pool.submit(_tree, _left, workers=workers)
+        right_tree = _tree(_right, workers=workers)
+        left_tree = left_fut.result()
+    common_dirs, common_files, funny_files = [], [], []
+    for relpath, is_dir in left_tree.items():
+        if relpath not in right_tree:
+            continue
+        if is_dir != right_tree[relpath]:
+            funny_files.append(relpath)
+        elif is_dir:
+            common_dirs.append(relpath)
+        else:
+            common_files.append(relpath)
+    same_files, diff_files = [], []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(
+            lambda relpath: _cmp_files(
+                path.join(_left, relpath),
+                path.join(_right, relpath),
+                shallow=shallow,
+                cache=cache,
+            ),
+            common_files,
+        )
+        for relpath, same in zip(common_files, results, strict=True):
+            if same is None:
+                funny_files.append(relpath)
+            elif same:
+                same_files.append(relpath)
+            else:
+                diff_files.append(relpath)
+    return DirCmp(
+        left=_left,
+        right=_right,
+        left_only=sorted(left_tree.keys() - right_tree.keys()),
+        right_only=sorted(right_tree.keys() - left_tree.keys()),
+        common_dirs=sorted(common_dirs),
+        same_files=sorted(same_files),
+        diff_files=sorted(diff_files),
+        funny_files=sorted(funny_files),
+    )
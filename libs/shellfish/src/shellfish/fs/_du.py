@@ -0,0 +1,284 @@
+# -*- coding: utf-8 -*-
+"""Parallel disk-usage report (shellfish.fs.du)"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from heapq import heappush, heappushpop, nlargest
+from os import (
+    cpu_count,
+    fspath as _fspath,
+    path,
+    scandir as _scandir,
+    stat_result,
+)
+from queue import Queue
+from threading import Thread
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    from shellfish._types import FsPath
+
+__all__ = ("DuResult", "DuStats", "du")
+
+
+@dataclass
+class DuStats:
+    """Disk usage of a directory (and everything beneath it)"""
+
+    path: str
+    nbytes: int
+    """Apparent size of the files (sum of st_size)"""
+    disk: int
+    """Bytes allocated on disk for the files (st_blocks * 512)"""
+    files: int
+    """Number of files (all non-directory entries)"""
+    dirs: int
+    """Number of sub-directories"""
+
+    __slots__ = ("dirs", "disk", "files", "nbytes", "path")
+
+
+@dataclass
+class DuResult:
+    """fs.du result"""
+
+    total: DuStats
+    """Totals for the whole tree"""
+    dirs: list[DuStats]
+    """Per-directory totals (down to `depth`) sorted by path"""
+    largest: list[tuple[str, int]]
+    """(path, nbytes) of the largest files, largest first"""
+    errors: int
+    """Directories/entries that could not be scanned/stat-ed"""
+
+    __slots__ = ("dirs", "errors", "largest", "total")
+
+
+class _DuScan(NamedTuple):
+    """Result of scanning a single directory (in a worker thread)"""
+
+    dirpath: str
+    depth: int
+    nbytes: int
+    disk: int
+    files: int
+    subdirs: list[str]
+    # ((st_dev, st_ino), nbytes, disk, path) of files w/ other hard links
+    links: list[tuple[tuple[int, int], int, int, str]]
+    largest: list[tuple[int, str]]
+    errors: int
+
+
+_HAS_BLOCKS = hasattr(stat_result, "st_blocks")
+
+
+def _du_scan(dirpath: str, depth: int, *, top: int) -> _DuScan:
+    """Scan a directory and stat its (non-dir) entries (worker fn)
+
+    Entry types come from the d_type cached by scandir, so only
+    non-directories are stat-ed (w/ `DirEntry.stat`, which caches).
+    """
+    nbytes = disk = files = errors = 0
+    subdirs: list[str] = []
+    links: list[tuple[tuple[int, int], int, int, str]] = []
+    sizes: list[tuple[int, str]] = []
+    try:
+        with _scandir(dirpath) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                        continue
+                    st = entry.stat(follow_symlinks=False)
+                except OSError:
+                    errors += 1
+                    continue
+                size = st.st_size
+                ondisk = st.st_blocks * 512 if _HAS_BLOCKS else size
+                if st.st_nlink > 1:
+                    links.append(((st.st_dev, st.st_ino), size, ondisk, entry.path))
+                    continue
+                nbytes += size
+                disk += ondisk
+                files += 1
+                if top:
+                    sizes.append((size, entry.name))
+    except OSError:
+        errors += 1
+    return _DuScan(
+        dirpath=dirpath,
+        depth=depth,
+        nbytes=nbytes,
+        disk=disk,
+        files=files,
+        subdirs=subdirs,
+        links=links,
+        largest=[
+            (size, path.join(dirpath, name)) for size, name in nlargest(top, sizes)
+        ],
+        errors=errors,
+    )
+
+
+def _du_scans(dirpath: str, *, workers: int | None, top: int) -> list[_DuScan]:
+    """Scan all the directories beneath dirpath w/ `workers` threads
+
+    Workers pull directories from a shared queue and push the
+    sub-directories they find back onto it (no round trip through the
+    calling thread per directory); w/ a single worker the tree is scanned
+    in the calling thread.
+    """
+    nworkers = min(32, (cpu_count() or 1) + 4) if workers is None else workers
+    if nworkers < 1:
+        _emsg = f"workers must be >= 1 (or None); got {workers}"
+        raise ValueError(_emsg)
+    scans: list[_DuScan] = []
+    if nworkers == 1:
+        stack = [(dirpath, 0)]
+        while stack:
+            _dirpath, depth = stack.pop()
+            scan = _du_scan(_dirpath, depth, top=top)
+            stack.extend((subdir, depth + 1) for subdir in scan.subdirs)
+            scans.append(scan)
+        return scans
+
+    work: Queue[tuple[str, int] | None] = Queue()
+    failures: list[BaseException] = []
+
+    def _worker() -> None:
+        while (item := work.get()) is not None:
+            try:
+                if not failures:
+                    scan = _du_scan(*item, top=top)
+                    for subdir in scan.subdirs:
+                        work.put((subdir, item[1] + 1))
+                    scans.append(scan)
+            except BaseException as e:
+                failures.append(e)
+            finally:
+                work.task_done()
+
+    threads = [
+        Thread(target=_worker, name=f"shellfish-du-{ix}", daemon=True)
+        for ix in range(nworkers)
+    ]
+    work.put((dirpath, 0))
+    for thread in threads:
+        thread.start()
+    try:
+        work.join()
+    finally:
+        for _ in threads:
+            work.put(None)
+    for thread in threads:
+        thread.join()
+    if failures:
+        raise failures[0]
+    return scans
+
+
+def du(
+    dirpath: FsPath = ".",
+    *,
+    workers: int | None = None,
+    depth: int | None = None,
+    top: int = 10,
+) -> DuResult:
+    """Return the disk usage of a directory tree (like `du`) in one pass
+
+    Directories are scanned concurrently by `workers` threads (one scandir
+    per directory, a cached `DirEntry.stat` per file); per-directory
+    totals, file counts and the largest files are then collected from the
+    scans in one pass.
+    Files w/ multiple hard links are counted once (by device & inode).
+    Symlinks are not followed (they count as files of their own size).
+
+    Args:
+        dirpath: Directory to report on
+        workers: Number of worker threads (default: like ThreadPoolExecutor,
+            min(32, cpu-count + 4)); 1 scans in the calling thread
+        depth: Max depth of the directories to report totals for (like
+            `du -d`; 0 reports only dirpath); None for all directories.
+            Deeper directories are still counted in the totals.
+        top: Number of largest files to report
+
+    Returns:
+        DuResult: total, per-directory totals, largest files & error count
+
+    Raises:
+        NotADirectoryError: If dirpath is not a directory
+        ValueError: If workers is less than 1
+
+    Examples:
+        >>> from shellfish import fs
+        >>> fs.mkdirp("du.doctest/sub")
+        >>> _ = fs.write_bytes("du.doctest/a.bin", b"a" * 100)
+        >>> _ = fs.write_bytes("du.doctest/sub/b.bin", b"b" * 10)
+        >>> result = du("du.doctest", top=1)
+        >>> result.total.nbytes, result.total.files, result.total.dirs
+        (110, 2, 1)
+        >>> [(path.basename(d.path), d.nbytes) for d in result.dirs]
+        [('du.doctest', 110), ('sub', 10)]
+        >>> [(path.basename(p), nbytes) for p, nbytes in result.largest]
+        [('a.bin', 100)]
+        >>> fs.rm("du.doctest", recursive=True)
+
+    """
+    _dirpath = str(_fspath(dirpath))
+    if not path.isdir(_dirpath):
+        raise NotADirectoryError(_dirpath)
+    # dirpath -> [nbytes, disk, files, dirs] (local, then summed bottom-up)
+    totals: dict[str, list[int]] = {}
+    parents: dict[str, str] = {}
+    depths: dict[str, int] = {}
+    seen_links: set[tuple[int, int]] = set()
+    largest: list[tuple[int, str]] = []
+    errors = 0
+    for scan in _du_scans(_dirpath, workers=workers, top=top):
+        for subdir in scan.subdirs:
+            parents[subdir] = scan.dirpath
+        nbytes, disk, files = scan.nbytes, scan.disk, scan.files
+        sizes = scan.largest
+        for key, link_nbytes, link_disk, link_path in scan.links:
+            if key in seen_links:
+                continue
+            seen_links.add(key)
+            nbytes += link_nbytes
+            disk += link_disk
+            files += 1
+            if top:
+                sizes.append((link_nbytes, link_path))
+        for item in sizes:
+            if len(largest) < top:
+                heappush(largest, item)
+            elif item > largest[0]:
+                heappushpop(largest, item)
+        totals[scan.dirpath] = [nbytes, disk, files, len(scan.subdirs)]
+        depths[scan.dirpath] = scan.depth
+        errors += scan.errors
+    # sum the sub-directory totals into their parents (deepest first)
+    for _path in sorted(totals, key=depths.__getitem__, reverse=True):
+        parent = parents.get(_path)
+        if parent is not None:
+            ptotals = totals[parent]
+            for ix, value in enumerate(totals[_path]):
+                ptotals[ix] += value
+    dirs = [
+        DuStats(path=_path, nbytes=nbytes, disk=disk, files=files, dirs=ndirs)
+        for _path, (nbytes, disk, files, ndirs) in sorted(totals.items())
+        if depth is None or depths[_path] <= depth
+    ]
+    root_nbytes, root_disk, root_files, root_dirs = totals[_dirpath]
+    return DuResult(
+        total=DuStats(
+            path=_dirpath,
+            nbytes=root_nbytes,
+            disk=root_disk,
+            files=root_files,
+            dirs=root_dirs,
+        ),
+        dirs=dirs,
+        largest=[(_path, nbytes) for nbytes, _path in sorted(largest, reverse=True)],
+        errors=errors,
+    )
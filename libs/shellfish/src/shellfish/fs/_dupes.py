@@ -0,0 +1,301 @@
+# -*- coding: utf-8 -*-
+"""Duplicate-file finder (shellfish.fs.find_duplicates)"""
+
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from os import PathLike, cpu_count, fspath as _fspath, path, stat as _stat
+from queue import SimpleQueue
+from stat import S_ISREG
+from typing import TYPE_CHECKING, Any
+
+from shellfish.fs._walk import walk_parallel_gen
+from shellfish.libhash import hash_file, string2hasher
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+
+    from shellfish._types import FsPath
+    from shellfish.fs._cmp import FileHashCache
+
+__all__ = ("DuplicateGroup", "find_duplicates")
+
+
+@dataclass
+class DuplicateGroup:
+    """Files w/ identical contents"""
+
+    size: int
+    """Size (bytes) of each file"""
+    digest: str
+    """Content (hex) digest"""
+    paths: list[str]
+    """Paths of the files (sorted)"""
+
+    __slots__ = ("digest", "paths", "size")
+
+    @property
+    def wasted(self) -> int:
+        """Bytes that would be freed by keeping only one of the files"""
+        return self.size * (len(self.paths) - 1)
+
+
+def _partial_digest(fspath: str, size: int, algo: str, blocksize: int) -> str | None:
+    """Hash the head & tail blocks of a file (worker fn); None on error
+
+    Files of at most 2 * blocksize bytes are read whole, so their partial
+    digest is their full content digest (same as `hash_file`).
+    """
+    hasher = string2hasher(algo)
+    try:
+        with open(fspath, "rb") as f:
+            hasher.update(f.read(blocksize))
+            if size > blocksize:
+                f.seek(max(size - blocksize, blocksize))
+                hasher.update(f.read(blocksize))
+    except OSError:
+        return None
+    return hasher.hexdigest()
+
+
+def _full_digest(fspath: str, algo: str, cache: FileHashCache | None) -> str | None:
+    """Hash a whole file (worker fn); None on error"""
+    try:
+        if cache is not None:
+            return cache.digest(fspath)
+        return hash_file(fspath, algo)
+    except OSError:
+        return None
+
+
+def _sizes(
+    paths: Iterable[FsPath], *, min_size: int, workers: int | None
+) -> dict[int, list[str]]:
+    """Group the (regular, non-hardlinked-twice) files beneath paths by size"""
+    by_size: dict[int, list[str]] = {}
+    seen: set[tuple[int, int] | str] = set()
+
+    def _add(fspath: str, st: Any) -> None:
+        if not S_ISREG(st.st_mode) or st.st_size < min_size:
+            return
+        # hard link to (or same path as) a file already seen; on windows
+        # DirEntry.stat has no inode (0), so only the same path is caught
+        key = (
+            (st.st_dev, st.st_ino) if st.st_ino else path.normcase(path.abspath(fspath))
+        )
+        if key in seen:
+            return
+        seen.add(key)
+        by_size.setdefault(st.st_size, []).append(fspath)
+
+    for fspath in (_fspath(p) for p in paths):
+        if not path.isdir(fspath):
+            try:
+                _add(fspath, _stat(fspath, follow_symlinks=False))
+            except OSError:
+                ...
+            continue
+        for entry in walk_parallel_gen(fspath, workers=workers):
+            try:
+                if entry.is_file(follow_symlinks=False):
+                    _add(entry.path, entry.stat(follow_symlinks=False))
+            except OSError:
+                ...
+    return by_size
+
+
+class _Scheduler:
+    """Thread pool w/ a bounded number of tasks in flight
+
+    Tasks are queued (full-hash tasks in front of partial-hash tasks so
+    groups get confirmed, and yielded, as early as possible) and submitted
+    as earlier tasks complete.
+    """
+
+    __slots__ = ("_done", "_inflight", "_maxinflight", "_pool", "_queue")
+
+    def __init__(self, pool: ThreadPoolExecutor, maxinflight: int) -> None:
+        self._pool = pool
+        self._maxinflight = maxinflight
+        self._inflight = 0
+        self._queue: deque[tuple[Any, Callable[..., Any], tuple[Any, ...]]] = deque()
+        self._done: SimpleQueue[tuple[Any, Future[Any]]] = SimpleQueue()
+
+    def add(self, tag: Any, fn: Callable[..., Any], *args: Any, first: bool) -> None:
+        if first:
+            self._queue.appendleft((tag, fn, args))
+        else:
+            self._queue.append((tag, fn, args))
+
+    def _pump(self) -> None:
+        while self._queue and self._inflight < self._maxinflight:
+            tag, fn, args = self._queue.popleft()
+            self._inflight += 1
+            self._pool.submit(fn, *args).add_done_callback(
+                partial(self._task_done, tag)
+            )
+
+    def _task_done(self, tag: Any, fut: Future[Any]) -> None:
+        self._done.put((tag, fut))
+
+    def results(self) -> Iterator[tuple[Any, Any]]:
+        """Yield (tag, result) as tasks complete (until none are left)"""
+        self._pump()
+        while self._inflight:
+            tag, fut = self._done.get()
+            self._inflight -= 1
+            result = fut.result()
+            yield tag, result
+            self._pump()
+
+
+def find_duplicates(
+    paths: FsPath | Iterable[FsPath],
+    *,
+    algo: str = "blake2b",
+    min_size: int = 1,
+    blocksize: int = 2**16,
+    workers: int | None = None,
+    cache: FileHashCache | None = None,
+) -> Iterator[DuplicateGroup]:
+    """Find files w/ identical contents yielding groups as they are confirmed
+
+    A staged pipeline, each stage only looking at the candidates left by
+    the previous one:
+
+    1. the trees are walked (concurrent scandir) and files grouped by size;
+       files w/ a unique size cannot have duplicates
+    2. files in same-size groups are hashed by their head and tail blocks
+       (files of at most 2 * blocksize bytes are hashed whole here and are
+       confirmed by this stage)
+    3. files still colliding on (size, head/tail digest) are hashed whole,
+       in parallel (`hash_file` releases the GIL)
+
+    Hashing runs on a thread pool w/ a bounded number of tasks in flight,
+    and a group is yielded as soon as all its hashes are done. Symlinks are
+    not followed and hard links to the same file are not duplicates (only
+    the first path seen for an inode is considered; on windows, where
+    scandir provides no inodes, only a path given/walked twice is).
+
+    Args:
+        paths: Directories (walked recursively) and/or files to search
+        algo: Hash algorithm name (see `shellfish.libhash`)
+        min_size: Ignore files smaller than this many bytes (default 1:
+            empty files are ignored)
+        blocksize: Size of the head/tail blocks hashed in stage 2
+        workers: Max number of worker threads (default: ThreadPoolExecutor's)
+        cache: FileHashCache (w/ the same algo) to get full digests from
+            (and populate)
+
+    Returns:
+        Iterator[DuplicateGroup]: groups of 2 or more identical files
+
+    Raises:
+        ValueError: If algo is not a valid hash algorithm or the cache uses
+            a different algorithm
+
+    Examples:
+        >>> from shellfish import fs
+        >>> fs.mkdirp("find-dupes.doctest/sub")
+        >>> for fspath in ("a.txt", "sub/b.txt"):
+        ...     _ = fs.write_str(path.join("find-dupes.doctest", fspath), "same")
+        >>> _ = fs.write_str("find-dupes.doctest/c.txt", "diff")
+        >>> for group in find_duplicates("find-dupes.doctest"):
+        ...     print(group.size, [path.basename(p) for p in group.paths])
+        4 ['a.txt', 'b.txt']
+        >>> fs.rm("find-dupes.doctest", recursive=True)
+
+    """
+    string2hasher(algo)
+    if cache is not None and cache.algo != algo:
+        _emsg = f"cache algo ({cache.algo}) != algo ({algo})"
+        raise ValueError(_emsg)
+    _paths = [paths] if isinstance(paths, str | PathLike) else list(paths)
+    return _find_duplicates(
+        _paths,
+        algo=algo,
+        min_size=min_size,
+        blocksize=blocksize,
+        workers=workers,
+        cache=cache,
+    )
+
+
+def _find_duplicates(
+    paths: list[FsPath],
+    *,
+    algo: str,
+    min_size: int,
+    blocksize: int,
+    workers: int | None,
+    cache: FileHashCache | None,
+) -> Iterator[DuplicateGroup]:
+    by_size = _sizes(paths, min_size=min_size, workers=workers)
+    nworkers = min(32, (cpu_count() or 1) + 4) if workers is None else workers
+    # stage-2 state: size -> [n partial digests pending, {digest: paths}]
+    stage2: dict[int, tuple[list[int], dict[str, list[str]]]] = {}
+    # stage-3 state: (size, partial digest) -> [n pending, {digest: paths}]
+    stage3: dict[tuple[int, str], tuple[list[int], dict[str, list[str]]]] = {}
+    with ThreadPoolExecutor(
+        max_workers=nworkers, thread_name_prefix="shellfish-dupes"
+    ) as pool:
+        sched = _Scheduler(pool, maxinflight=nworkers * 4)
+        # largest sizes first (most bytes to reclaim)
+        for size in sorted(by_size, reverse=True):
+            fspaths = by_size.pop(size)
+            if len(fspaths) < 2:
+                continue
+            stage2[size] = ([len(fspaths)], {})
+            for fspath in fspaths:
+                sched.add(
+                    ("partial", size, fspath),
+                    _partial_digest,
+                    fspath,
+                    size,
+                    algo,
+                    blocksize,
+                    first=False,
+                )
+        for (stage, *key, fspath), digest in sched.results():
+            if stage == "partial":
+                (size,) = key
+                pending, digests = stage2[size]
+                if digest is not None:
+                    digests.setdefault(digest, []).append(fspath)
+                pending[0] -= 1
+                if pending[0]:
+                    continue
+                del stage2[size]
+                for pdigest, group in digests.items():
+                    if len(group) < 2:
+                        continue
+                    if size <= 2 * blocksize:  # hashed whole in stage 2
+                        yield DuplicateGroup(
+                            size=size, digest=pdigest, paths=sorted(group)
+                        )
+                        continue
+                    stage3[size, pdigest] = ([len(group)], {})
+                    for _fspath in group:
+                        sched.add(
+                            ("full", size, pdigest, _fspath),
+                            _full_digest,
+                            _fspath,
+                            algo,
+                            cache,
+                            first=True,
+                        )
+                continue
+            size, pdigest = key
+            pending, digests = stage3[size, pdigest]
+            if digest is not None:
+                digests.setdefault(digest, []).append(fspath)
+            pending[0] -= 1
+            if pending[0]:
+                continue
+            del stage3[size, pdigest]
+            for fdigest, group in digests.items():
+                if len(group) > 1:
+                    yield DuplicateGroup(size=size, digest=fdigest, paths=sorted(group))
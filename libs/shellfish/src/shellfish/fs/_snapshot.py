@@ -0,0 +1,502 @@
+# -*- coding: utf-8 -*-
+"""File-system snapshot/index (shellfish.fs.FsSnapshot)"""
+
+from __future__ import annotations
+
+import sys
+
+from array import array
+from dataclasses import dataclass
+from fnmatch import translate
+from os import fspath as _fspath, path, scandir as _scandir, stat as _stat
+from re import compile as _re_compile
+from stat import S_IFMT, S_ISDIR, S_ISREG
+from typing import TYPE_CHECKING, Any
+
+from jsonbourne import JSON
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from os import DirEntry, stat_result
+
+    from shellfish._types import FsPath
+
+__all__ = ("FsSnapshot", "FsSnapshotEntry")
+
+_MAGIC = b"shellfish.FsSnapshot\n"
+_VERSION = 2
+
+
+def _encode_paths(paths: list[str]) -> bytes:
+    # surrogateescape round-trips the undecodable bytes of os.fsdecode-d paths
+    return "\0".join(paths).encode("utf-8", "surrogateescape")
+
+
+def _decode_paths(data: bytes) -> list[str]:
+    return data.decode("utf-8", "surrogateescape").split("\0")
+
+
+@dataclass(frozen=True)
+class FsSnapshotEntry:
+    """FsSnapshot entry (relative path, size, mtime_ns, mode & inode)"""
+
+    relpath: str
+    size: int
+    mtime_ns: int
+    mode: int
+    ino: int
+
+    __slots__ = ("ino", "mode", "mtime_ns", "relpath", "size")
+
+    @property
+    def mtime(self) -> float:
+        return self.mtime_ns / 1e9
+
+    def is_dir(self) -> bool:
+        return S_ISDIR(self.mode)
+
+    def is_file(self) -> bool:
+        return S_ISREG(self.mode)
+
+
+class FsSnapshot:
+    """Compact, array-backed index of a directory tree
+
+    Built with one scan of the tree (one `scandir` per directory and one
+    `lstat` per entry); queries (glob, changed-since, total-size...) are
+    answered from the index instead of the file-system.
+
+    Entries are stored grouped by their parent directory: the relative
+    paths ('/'-separated) in a list and the size, mtime (ns), mode and
+    inode in `array.array` columns. For each directory the index stores
+    its mtime and the slice of entries it contains, which lets `refresh`
+    re-scan only the directories whose mtime has changed.
+
+    Examples:
+        >>> from shellfish.fs import FsSnapshot, mkdirp, write_str
+        >>> from shutil import rmtree
+        >>> mkdirp("fs_snapshot.doctest/a")
+        >>> write_str("fs_snapshot.doctest/a/b.txt", "howdy")
+        5
+        >>> snap = FsSnapshot.scan("fs_snapshot.doctest")
+        >>> len(snap)
+        2
+        >>> snap.total_size()
+        5
+        >>> list(snap.glob("*.txt"))
+        ['a/b.txt']
+        >>> rmtree("fs_snapshot.doctest")
+
+    """
+
+    __slots__ = (
+        "_dirs",
+        "_index",
+        "_ino",
+        "_mode",
+        "_mtime_ns",
+        "_relpaths",
+        "_size",
+        "follow_symlinks",
+        "root",
+    )
+
+    root: str
+    follow_symlinks: bool
+    # dir-relpath -> (dir-mtime-ns, start, stop) slice into the columns
+    _dirs: dict[str, tuple[int, int, int]]
+    _relpaths: list[str]
+    _size: array[int]
+    _mtime_ns: array[int]
+    _mode: array[int]
+    _ino: array[int]
+    _index: dict[str, int] | None
+
+    def __init__(self, root: FsPath, *, follow_symlinks: bool = False) -> None:
+        self.root = str(_fspath(root))
+        self.follow_symlinks = follow_symlinks
+        self._dirs = {}
+        self._relpaths = []
+        self._size = array("q")
+        self._mtime_ns = array("q")
+        self._mode = array("L")
+        self._ino = array("Q")
+        self._index = None
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(root={self.root!r}, entries={len(self)}, dirs={len(self._dirs)})"
+
+    def __len__(self) -> int:
+        return len(self._relpaths)
+
+    def __contains__(self, relpath: object) -> bool:
+        return relpath in self.index()
+
+    def __iter__(self) -> Iterator[FsSnapshotEntry]:
+        return (self._entry(i) for i in range(len(self._relpaths)))
+
+    def __getitem__(self, relpath: str) -> FsSnapshotEntry:
+        return self._entry(self.index()[relpath])
+
+    def _entry(self, i: int) -> FsSnapshotEntry:
+        return FsSnapshotEntry(
+            relpath=self._relpaths[i],
+            size=self._size[i],
+            mtime_ns=self._mtime_ns[i],
+            mode=self._mode[i],
+            ino=self._ino[i],
+        )
+
+    def index(self) -> dict[str, int]:
+        """Return (and cache) the relpath -> column-index mapping"""
+        if self._index is None:
+            self._index = {p: i for i, p in enumerate(self._relpaths)}
+        return self._index
+
+    def abspath(self, relpath: str) -> str:
+        """Return the file-system path for a snapshot relpath"""
+        return path.join(self.root, *relpath.split("/"))
+
+    def _append(self, relpath: str, st: stat_result) -> None:
+        self._relpaths.append(relpath)
+        self._size.append(st.st_size)
+        self._mtime_ns.append(st.st_mtime_ns)
+        self._mode.append(st.st_mode)
+        self._ino.append(st.st_ino)
+
+    def _scan_dir(self, dirrel: str, dir_mtime_ns: int) -> list[tuple[str, int]]:
+        """Scan & append a dir's entries; return its sub-dirs (relpath, mtime)"""
+        start = len(self._relpaths)
+        subdirs: list[tuple[str, int]] = []
+        prefix = f"{dirrel}/" if dirrel else ""
+        entry: DirEntry[str]
+        with _scandir(self.abspath(dirrel)) as it:
+            for entry in it:
+                try:
+                    st = entry.stat(follow_symlinks=self.follow_symlinks)
+                except OSError:
+                    continue
+                relpath = prefix + entry.name
+                self._append(relpath, st)
+                if S_ISDIR(st.st_mode):
+                    subdirs.append((relpath, st.st_mtime_ns))
+        self._dirs[dirrel] = (dir_mtime_ns, start, len(self._relpaths))
+        return subdirs
+
+    def _copy_dir(
+        self, prev: FsSnapshot, dirrel: str, dir_mtime_ns: int
+    ) -> list[tuple[str, int]]:
+        """Copy a dir's entries from a previous snapshot; return its sub-dirs"""
+        _, prev_start, prev_stop = prev._dirs[dirrel]
+        start = len(self._relpaths)
+        self._relpaths.extend(prev._relpaths[prev_start:prev_stop])
+        self._size.extend(prev._size[prev_start:prev_stop])
+        self._mtime_ns.extend(prev._mtime_ns[prev_start:prev_stop])
+        self._mode.extend(prev._mode[prev_start:prev_stop])
+        self._ino.extend(prev._ino[prev_start:prev_stop])
+        self._dirs[dirrel] = (dir_mtime_ns, start, len(self._relpaths))
+        return [
+            (prev._relpaths[i], prev._mtime_ns[i])
+            for i in range(prev_start, prev_stop)
+            if S_ISDIR(prev._mode[i])
+        ]
+
+    def _first_visit(self, st: stat_result, seen: set[tuple[int, int]]) -> bool:
+        """Return False if a dir (st) was already visited w/ follow_symlinks
+
+        Symlinks to an ancestor (loops) or to another dir in the tree would
+        otherwise be descended again and again; like `aios.scandir_recursive`
+        the (st_dev, st_ino) of visited dirs are tracked and repeats skipped
+        (the symlink itself is still listed as an entry of its dir).
+        """
+        if not self.follow_symlinks or not st.st_ino:
+            return True
+        key = (st.st_dev, st.st_ino)
+        if key in seen:
+            return False
+        seen.add(key)
+        return True
+
+    def _restat(self, start: int, stop: int) -> None:
+        """Re-stat the (non-dir) entries in the slice [start, stop)"""
+        for i in range(start, stop):
+            if S_ISDIR(self._mode[i]):
+                continue
+            try:
+                st = _stat(
+                    self.abspath(self._relpaths[i]),
+                    follow_symlinks=self.follow_symlinks,
+                )
+            except OSError:
+                continue
+            self._size[i] = st.st_size
+            self._mtime_ns[i] = st.st_mtime_ns
+            self._mode[i] = st.st_mode
+            self._ino[i] = st.st_ino
+
+    @classmethod
+    def scan(cls, dirpath: FsPath, *, follow_symlinks: bool = False) -> FsSnapshot:
+        """Scan a directory tree and return its snapshot
+
+        Args:
+            dirpath: Root directory to snapshot
+            follow_symlinks: Stat (and descend into) the targets of symlinks;
+                a dir reached more than once (e.g. via a symlink loop) is only
+                descended the first time
+
+        Returns:
+            FsSnapshot: snapshot of the directory tree
+
+        Raises:
+            NotADirectoryError: If dirpath is not a directory
+
+        """
+        snap = cls(dirpath, follow_symlinks=follow_symlinks)
+        if not path.isdir(snap.root):
+            raise NotADirectoryError(snap.root)
+        stack = [("", _stat(snap.root).st_mtime_ns)]
+        seen: set[tuple[int, int]] = set()
+        while stack:
+            dirrel, dir_mtime_ns = stack.pop()
+            try:
+                if follow_symlinks and not snap._first_visit(
+                    _stat(snap.abspath(dirrel)), seen
+                ):
+                    continue
+                subdirs = snap._scan_dir(dirrel, dir_mtime_ns)
+            except OSError:
+                continue
+            stack.extend(reversed(subdirs))
+        return snap
+
+    def refresh(self, *, restat: bool = False) -> FsSnapshot:
+        """Return a new, up-to-date snapshot re-scanning only changed dirs
+
+        Every directory in the tree is stat-ed; directories whose mtime has
+        not changed re-use their entries from this snapshot and only the
+        directories whose mtime changed (entries created/removed/renamed)
+        are re-scanned. This snapshot is not modified.
+
+        Modifying a file's contents does not change its directory's mtime;
+        use `restat=True` to also re-stat the files in unchanged dirs (still
+        w/o re-listing them).
+
+        Args:
+            restat: Re-stat the entries of unchanged directories
+
+        Returns:
+            FsSnapshot: refreshed snapshot
+
+        """
+        snap = self.__class__(self.root, follow_symlinks=self.follow_symlinks)
+        stack = [""]
+        seen: set[tuple[int, int]] = set()
+        while stack:
+            dirrel = stack.pop()
+            try:
+                st = _stat(snap.abspath(dirrel))
+            except OSError:
+                continue
+            if not snap._first_visit(st, seen):
+                continue
+            dir_mtime_ns = st.st_mtime_ns
+            prev = self._dirs.get(dirrel)
+            try:
+                if prev is not None and prev[0] == dir_mtime_ns:
+                    start = len(snap._relpaths)
+                    subdirs = snap._copy_dir(self, dirrel, dir_mtime_ns)
+                    if restat:
+                        snap._restat(start, len(snap._relpaths))
+                else:
+                    subdirs = snap._scan_dir(dirrel, dir_mtime_ns)
+            except OSError:
+                continue
+            stack.extend(reversed([relpath for relpath, _ in subdirs]))
+        return snap
+
+    def _changed(self, other: FsSnapshot, i: int, j: int) -> bool:
+        """Return True if entry i (of self) differs from entry j (of other)
+
+        Dirs are only 'changed' if replaced (their mtime changes whenever
+        an entry is created/removed in them).
+        """
+        if S_ISDIR(self._mode[i]) and S_ISDIR(other._mode[j]):
+            return False
+        return (
+            self._size[i] != other._size[j]
+            or self._mtime_ns[i] != other._mtime_ns[j]
+            or self._ino[i] != other._ino[j]
+            or S_IFMT(self._mode[i]) != S_IFMT(other._mode[j])
+        )
+
+    def diff(self, other: FsSnapshot) -> tuple[list[str], list[str], list[str]]:
+        """Return the (created, modified, deleted) relpaths from self to other
+
+        Compared directory by directory: for a directory listed the same in
+        both snapshots (the usual case for `refresh`-ed snapshots) entries
+        are compared pairwise w/o any lookups.
+
+        Args:
+            other: Newer snapshot of the same root (e.g. `self.refresh()`)
+
+        Returns:
+            tuple[list[str], list[str], list[str]]: created, modified and
+                deleted relpaths
+
+        """
+        created: list[str] = []
+        modified: list[str] = []
+        deleted: list[str] = []
+        for dirrel, (_, start, stop) in other._dirs.items():
+            prev = self._dirs.get(dirrel)
+            if prev is None:
+                created.extend(other._relpaths[start:stop])
+                continue
+            _, pstart, pstop = prev
+            if self._relpaths[pstart:pstop] == other._relpaths[start:stop]:
+                modified.extend(
+                    other._relpaths[j]
+                    for i, j in zip(
+                        range(pstart, pstop), range(start, stop), strict=True
+                    )
+                    if self._changed(other, i, j)
+                )
+                continue
+            prev_index = {self._relpaths[i]: i for i in range(pstart, pstop)}
+            for j in range(start, stop):
+                i = prev_index.pop(other._relpaths[j], -1)
+                if i < 0:
+                    created.append(other._relpaths[j])
+                elif self._changed(other, i, j):
+                    modified.append(other._relpaths[j])
+            deleted.extend(self._relpaths[i] for i in prev_index.values())
+        for dirrel, (_, pstart, pstop) in self._dirs.items():
+            if dirrel not in other._dirs:
+                deleted.extend(self._relpaths[pstart:pstop])
+        return created, modified, deleted
+
+    def relpaths(self, *, files: bool = True, dirs: bool = True) -> Iterator[str]:
+        """Yield the relative paths in the snapshot"""
+        if files and dirs:
+            return iter(self._relpaths)
+        return (
+            p
+            for p, mode in zip(self._relpaths, self._mode, strict=True)
+            if (dirs and S_ISDIR(mode)) or (files and not S_ISDIR(mode))
+        )
+
+    def glob(
+        self, pattern: str, *, files: bool = True, dirs: bool = True
+    ) -> Iterator[str]:
+        """Yield relpaths matching a (fnmatch-style) glob pattern
+
+        Patterns are matched against the full '/'-separated relpath and `*`
+        matches across '/' (like `fnmatch`), so '*.py' matches '.py' files at
+        any depth and 'src/*.py' matches '.py' files anywhere under 'src/'.
+        """
+        _match = _re_compile(translate(pattern)).match
+        return (p for p in self.relpaths(files=files, dirs=dirs) if _match(p))
+
+    def changed_since(self, timestamp: float, *, dirs: bool = False) -> Iterator[str]:
+        """Yield relpaths w/ an mtime newer than a timestamp (seconds)"""
+        return (
+            p
+            for p, mtime_ns, mode in zip(
+                self._relpaths, self._mtime_ns, self._mode, strict=True
+            )
+            if mtime_ns / 1e9 > timestamp and (dirs or not S_ISDIR(mode))
+        )
+
+    def total_size(self, pattern: str | None = None) -> int:
+        """Return the total size (in bytes) of the (matching) files"""
+        if pattern is None:
+            return sum(
+                size
+                for size, mode in zip(self._size, self._mode, strict=True)
+                if not S_ISDIR(mode)
+            )
+        _match = _re_compile(translate(pattern)).match
+        return sum(
+            size
+            for p, size, mode in zip(
+                self._relpaths, self._size, self._mode, strict=True
+            )
+            if not S_ISDIR(mode) and _match(p)
+        )
+
+    def _columns(self) -> tuple[array[int], ...]:
+        return (self._size, self._mtime_ns, self._mode, self._ino)
+
+    def to_bytes(self) -> bytes:
+        """Serialize the snapshot to bytes"""
+        relpaths = _encode_paths(self._relpaths)
+        # the root & dir relpaths may not be valid utf-8 (surrogate-escaped
+        # bytes) either, so they are stored like relpaths, not in the header
+        dirpaths = _encode_paths([self.root, *self._dirs])
+        header = JSON.dumpb({
+            "version": _VERSION,
+            "follow_symlinks": self.follow_symlinks,
+            "byteorder": sys.byteorder,
+            "n": len(self._relpaths),
+            "dirs": list(self._dirs.values()),
+            "dirpaths_nbytes": len(dirpaths),
+            "relpaths_nbytes": len(relpaths),
+            "columns": [[col.typecode, col.itemsize] for col in self._columns()],
+        })
+        return b"".join([
+            _MAGIC,
+            header,
+            b"\n",
+            dirpaths,
+            relpaths,
+            *(col.tobytes() for col in self._columns()),
+        ])
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> FsSnapshot:
+        """Deserialize a snapshot from bytes (see `to_bytes`)"""
+        if not data.startswith(_MAGIC):
+            raise ValueError("Invalid FsSnapshot data (bad magic)")
+        header_end = data.index(b"\n", len(_MAGIC))
+        header: dict[str, Any] = JSON.loads(data[len(_MAGIC) : header_end])
+        if header["version"] != _VERSION:
+            _emsg = f"Unsupported FsSnapshot version: {header['version']}"
+            raise ValueError(_emsg)
+        offset = header_end + 1
+        dirpaths_nbytes = header["dirpaths_nbytes"]
+        root, *dirrels = _decode_paths(data[offset : offset + dirpaths_nbytes])
+        offset += dirpaths_nbytes
+        snap = cls(root, follow_symlinks=header["follow_symlinks"])
+        n = header["n"]
+        relpaths_nbytes = header["relpaths_nbytes"]
+        relpaths = data[offset : offset + relpaths_nbytes]
+        offset += relpaths_nbytes
+        snap._relpaths = _decode_paths(relpaths) if n else []
+        columns = []
+        for typecode, itemsize in header["columns"]:
+            col = array(typecode)
+            if col.itemsize != itemsize:
+                _emsg = f"Incompatible FsSnapshot column ({typecode}, {itemsize})"
+                raise ValueError(_emsg)
+            col.frombytes(data[offset : offset + n * itemsize])
+            if header["byteorder"] != sys.byteorder:
+                col.byteswap()
+            offset += n * itemsize
+            columns.append(col)
+        snap._size, snap._mtime_ns, snap._mode, snap._ino = columns
+        snap._dirs = {
+            dirrel: tuple(v)  # type: ignore[misc]
+            for dirrel, v in zip(dirrels, header["dirs"], strict=True)
+        }
+        return snap
+
+    def save(self, fspath: FsPath) -> int:
+        """Save the snapshot to a file; returns the number of bytes written"""
+        with open(fspath, "wb") as f:
+            return f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, fspath: FsPath) -> FsSnapshot:
+        """Load a snapshot saved with `save`"""
+        with open(fspath, "rb") as f:
+            return cls.from_bytes(f.read())
@@ -0,0 +1,290 @@
+# -*- coding: utf-8 -*-
+"""Parallel (thread-pool) recursive directory walking"""
+
+from __future__ import annotations
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from os import (
+    cpu_count,
+    fspath as _fspath,
+    path,
+    scandir as _scandir,
+    stat as _stat,
+)
+from queue import SimpleQueue
+from typing import TYPE_CHECKING, Any, TypeAlias, cast
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+    from os import DirEntry
+
+    from shellfish._types import FsPath
+
+__all__ = ("walk_parallel_gen",)
+
+# max number of dir scans in flight or done-but-not-yet-consumed per worker
+_PENDING_PER_WORKER = 4
+
+# scanned dirpath, its depth and its entries w/ is-dir flags (or the error)
+_ScanResult: TypeAlias = tuple[str, int, "list[tuple[DirEntry[str], bool]] | OSError"]
+
+
+def _scan_dir(dirpath: str, depth: int, *, follow_symlinks: bool) -> _ScanResult:
+    """Scan a single directory (in a worker thread)
+
+    `DirEntry.is_dir` is resolved here (from the cached d_type on most
+    platforms) so the consuming thread never blocks on the file-system.
+    """
+    try:
+        with _scandir(dirpath) as it:
+            entries = []
+            for entry in it:
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=follow_symlinks)
+                except OSError:
+                    is_dir = False
+                entries.append((entry, is_dir))
+    except OSError as e:
+        return (dirpath, depth, e)
+    return (dirpath, depth, entries)
+
+
+def walk_parallel_gen(
+    dirpath: FsPath = ".",
+    *,
+    workers: int | None = None,
+    ordered: bool = False,
+    max_depth: int | None = None,
+    follow_symlinks: bool = False,
+    prune: Callable[[DirEntry[str]], bool] | None = None,
+    filterfn: Callable[[DirEntry[str]], bool] | None = None,
+    onerror: Callable[[OSError], Any] | None = None,
+    check: bool = True,
+) -> Iterator[DirEntry[str]]:
+    """Yield os.DirEntry objects beneath a dirpath scanning dirs in parallel
+
+    Directories are scanned concurrently by a thread pool; listing large
+    trees on high-latency (network) file-systems is bound by per-directory
+    latency, not cpu, so many scans in flight at once is a big win. The
+    number of scans in flight (or done but not yet consumed) is capped at
+    4 per worker, so memory use does not grow w/ the size of the tree.
+
+    Args:
+        dirpath: Directory path to walk down/through
+        workers: Max number of worker threads (default: ThreadPoolExecutor's)
+        ordered: If True, yield entries in the same order as
+            `scandir_gen(recursive=True)` (a directory's entries followed by
+            each sub-directory's entries); otherwise entries are yielded as
+            soon as their directory has been scanned
+        max_depth: Max depth to descend (like `find -maxdepth`); 1 yields
+            only the entries of `dirpath`; None for no limit
+        follow_symlinks: Descend into symlinked directories
+        prune: Callback called with each directory entry before descending;
+            the directory is not descended into if it returns True
+        filterfn: Callback called with each entry; the entry is not yielded
+            if it returns False (directories are still descended into)
+        onerror: Function called with the OSError if a directory cannot be
+            scanned; errors are ignored by default (like os.walk)
+        check: Check that dirpath is a directory
+
+    Returns:
+        Iterator of os.DirEntry objects
+
+    Raises:
+        NotADirectoryError: If check is True and dirpath is not a directory
+        ValueError: If max_depth is less than 1
+
+    """
+    _dirpath = _fspath(dirpath)
+    if check and not path.isdir(_dirpath):
+        raise NotADirectoryError(_dirpath)
+    if max_depth is not None and max_depth < 1:
+        _emsg = f"max_depth must be >= 1 (or None); got {max_depth}"
+        raise ValueError(_emsg)
+    return _walk_parallel_gen(
+        str(_dirpath),
+        workers=workers,
+        ordered=ordered,
+        max_depth=max_depth,
+        follow_symlinks=follow_symlinks,
+        prune=prune,
+        filterfn=filterfn,
+        onerror=onerror,
+    )
+
+
+def _walk_parallel_gen(
+    dirpath: str,
+    *,
+    workers: int | None,
+    ordered: bool,
+    max_depth: int | None,
+    follow_symlinks: bool,
+    prune: Callable[[DirEntry[str]], bool] | None,
+    filterfn: Callable[[DirEntry[str]], bool] | None,
+    onerror: Callable[[OSError], Any] | None,
+) -> Iterator[DirEntry[str]]:
+    # (st_dev, st_ino) of symlinked dirs already descended into; guards
+    # against symlink loops when following symlinks
+    _seen: set[tuple[int, int]] = set()
+    if follow_symlinks:
+        try:
+            st = _stat(dirpath)
+            _seen.add((st.st_dev, st.st_ino))
+        except OSError:
+            ...
+
+    def _descend(entry: DirEntry[str], depth: int) -> bool:
+        if max_depth is not None and depth >= max_depth:
+            return False
+        if prune is not None and prune(entry):
+            return False
+        if follow_symlinks and entry.is_symlink():
+            try:
+                st = entry.stat()
+            except OSError:
+                return False
+            key = (st.st_dev, st.st_ino)
+            if key in _seen:
+                return False
+            _seen.add(key)
+        return True
+
+    nworkers = min(32, (cpu_count() or 1) + 4) if workers is None else workers
+    pool = ThreadPoolExecutor(max_workers=nworkers, thread_name_prefix="shellfish-walk")
+    try:
+        if ordered:
+            yield from _walk_ordered(
+                pool,
+                dirpath,
+                max_pending=nworkers * _PENDING_PER_WORKER,
+                follow_symlinks=follow_symlinks,
+                descend=_descend,
+                filterfn=filterfn,
+                onerror=onerror,
+            )
+        else:
+            yield from _walk_unordered(
+                pool,
+                dirpath,
+                max_pending=nworkers * _PENDING_PER_WORKER,
+                follow_symlinks=follow_symlinks,
+                descend=_descend,
+                filterfn=filterfn,
+                onerror=onerror,
+            )
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _walk_unordered(
+    pool: ThreadPoolExecutor,
+    dirpath: str,
+    *,
+    max_pending: int,
+    follow_symlinks: bool,
+    descend: Callable[[DirEntry[str], int], bool],
+    filterfn: Callable[[DirEntry[str]], bool] | None,
+    onerror: Callable[[OSError], Any] | None,
+) -> Iterator[DirEntry[str]]:
+    done: SimpleQueue[Future[_ScanResult]] = SimpleQueue()
+    # dirs to scan once fewer than max_pending scans are outstanding
+    # (depth-first so the list of not-yet-submitted dirs stays short)
+    todo: list[tuple[str, int]] = [(dirpath, 0)]
+    outstanding = 0
+
+    def _submit() -> None:
+        nonlocal outstanding
+        while todo and outstanding < max_pending:
+            _dirpath, _depth = todo.pop()
+            outstanding += 1
+            pool.submit(
+                _scan_dir, _dirpath, _depth, follow_symlinks=follow_symlinks
+            ).add_done_callback(done.put)
+
+    _submit()
+    while outstanding:
+        _fut = done.get()
+        outstanding -= 1
+        _, depth, entries = _fut.result()
+        if isinstance(entries, OSError):
+            if onerror is not None:
+                onerror(entries)
+            _submit()
+            continue
+        # submit sub-directory scans before yielding to keep the pool busy
+        todo.extend(
+            (entry.path, depth + 1)
+            for entry, is_dir in entries
+            if is_dir and descend(entry, depth + 1)
+        )
+        _submit()
+        if filterfn is None:
+            yield from (entry for entry, _ in entries)
+        else:
+            yield from (entry for entry, _ in entries if filterfn(entry))
+
+
+class _OrderedScan:
+    """Directory to scan (in the ordered walk) & its scan, once submitted"""
+
+    __slots__ = ("depth", "dirpath", "future")
+
+    def __init__(self, dirpath: str, depth: int) -> None:
+        self.dirpath = dirpath
+        self.depth = depth
+        self.future: Future[_ScanResult] | None = None
+
+
+def _walk_ordered(
+    pool: ThreadPoolExecutor,
+    dirpath: str,
+    *,
+    max_pending: int,
+    follow_symlinks: bool,
+    descend: Callable[[DirEntry[str], int], bool],
+    filterfn: Callable[[DirEntry[str]], bool] | None,
+    onerror: Callable[[OSError], Any] | None,
+) -> Iterator[DirEntry[str]]:
+    stack = [_OrderedScan(dirpath, 0)]
+    outstanding = 0
+
+    def _submit(scan: _OrderedScan) -> None:
+        nonlocal outstanding
+        outstanding += 1
+        scan.future = pool.submit(
+            _scan_dir, scan.dirpath, scan.depth, follow_symlinks=follow_symlinks
+        )
+
+    def _prefetch() -> None:
+        # scan ahead the dirs that are consumed next (the top of the stack)
+        for scan in stack[: -max_pending - 1 : -1]:
+            if outstanding >= max_pending:
+                break
+            if scan.future is None:
+                _submit(scan)
+
+    while stack:
+        scan = stack.pop()
+        if scan.future is None:
+            _submit(scan)
+        _prefetch()
+        _, depth, entries = cast("Future[_ScanResult]", scan.future).result()
+        outstanding -= 1
+        if isinstance(entries, OSError):
+            if onerror is not None:
+                onerror(entries)
+            continue
+        # sub-directories are consumed depth-first in scandir order; the
+        # next ones are scanned in parallel (up to max_pending at a time)
+        children = [
+            _OrderedScan(entry.path, depth + 1)
+            for entry, is_dir in entries
+            if is_dir and descend(entry, depth + 1)
+        ]
+        stack.extend(reversed(children))
+        _prefetch()
+        if filterfn is None:
+            yield from (entry for entry, _ in entries)
+        else:
+            yield from (entry for entry, _ in entries if filterfn(entry))
@@ -0,0 +1,263 @@
+# -*- coding: utf-8 -*-
+"""Polling file-system watcher (shellfish.fs.watch)"""
+
+from __future__ import annotations
+
+import asyncio
+
+from dataclasses import dataclass
+from fnmatch import translate
+from os import PathLike, fspath as _fspath
+from re import compile as _re_compile
+from time import sleep, time
+from typing import TYPE_CHECKING
+
+from shellfish.fs._snapshot import FsSnapshot
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Callable, Iterable, Iterator
+
+    from shellfish._types import FsPath
+
+__all__ = ("FsChanges", "FsWatcher", "watch", "watch_async")
+
+
+@dataclass
+class FsChanges:
+    """Batch of changes found by one poll of a FsWatcher
+
+    Paths are the watched root joined w/ the changed entry's relative path
+    (so relative if the root is relative).
+    """
+
+    created: list[str]
+    modified: list[str]
+    deleted: list[str]
+    t: float
+    """Time of the poll (seconds since epoch)"""
+
+    __slots__ = ("created", "deleted", "modified", "t")
+
+    def __bool__(self) -> bool:
+        return bool(self.created or self.modified or self.deleted)
+
+    def __len__(self) -> int:
+        return len(self.created) + len(self.modified) + len(self.deleted)
+
+    def paths(self) -> list[str]:
+        """Return all the changed paths (sorted)"""
+        return sorted({*self.created, *self.modified, *self.deleted})
+
+
+def _patterns_match(patterns: Iterable[str] | str) -> Callable[[str], object]:
+    """Return a match fn for fnmatch-style patterns (any of them)"""
+    _patterns = [patterns] if isinstance(patterns, str) else list(patterns)
+    return _re_compile("|".join(translate(p) for p in _patterns)).match
+
+
+class FsWatcher:
+    """Polling file-system watcher
+
+    Keeps a [FsSnapshot][shellfish.fs.FsSnapshot] per watched directory;
+    each `poll` refreshes them (only directories whose mtime changed are
+    re-listed, the other entries are only re-stat-ed) and diffs the
+    (inode, size, mtime_ns) of every entry against the previous snapshot.
+    No OS notification service (inotify, FSEvents...) is used, so it works
+    on any file-system (including network mounts), at the cost of a stat
+    per entry per poll.
+
+    Examples:
+        >>> import os
+        >>> from shellfish import fs
+        >>> fs.mkdirp("fs-watcher.doctest")
+        >>> watcher = FsWatcher("fs-watcher.doctest", include="*.txt")
+        >>> watcher.start()
+        >>> _ = fs.write_str("fs-watcher.doctest/a.txt", "a")
+        >>> _ = fs.write_str("fs-watcher.doctest/b.log", "b")
+        >>> watcher.poll().created == [os.path.join("fs-watcher.doctest", "a.txt")]
+        True
+        >>> bool(watcher.poll())
+        False
+        >>> fs.rm("fs-watcher.doctest", recursive=True)
+
+    """
+
+    __slots__ = ("_exclude", "_include", "_snapshots", "follow_symlinks", "roots")
+
+    def __init__(
+        self,
+        paths: FsPath | Iterable[FsPath],
+        *,
+        include: Iterable[str] | str | None = None,
+        exclude: Iterable[str] | str | None = None,
+        follow_symlinks: bool = False,
+    ) -> None:
+        """Create a watcher (call `start` or `poll` to take the first snapshot)
+
+        Args:
+            paths: Directory (or directories) to watch recursively
+            include: fnmatch-style pattern(s) matched against the
+                '/'-separated path relative to its root (`*` matches across
+                '/'); only matching paths are reported (default: all)
+            exclude: Pattern(s) of paths not to report
+            follow_symlinks: Stat (and descend into) the targets of symlinks
+
+        """
+        self.roots = (
+            [_fspath(paths)]
+            if isinstance(paths, str | PathLike)
+            else [_fspath(p) for p in paths]
+        )
+        self.follow_symlinks = follow_symlinks
+        self._include = None if include is None else _patterns_match(include)
+        self._exclude = None if exclude is None else _patterns_match(exclude)
+        self._snapshots: list[FsSnapshot] | None = None
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(roots={self.roots!r})"
+
+    def _reported(self, relpaths: list[str], snap: FsSnapshot) -> list[str]:
+        return [
+            snap.abspath(relpath)
+            for relpath in relpaths
+            if (self._include is None or self._include(relpath))
+            and (self._exclude is None or not self._exclude(relpath))
+        ]
+
+    def start(self) -> None:
+        """Take the initial snapshots
+
+        Raises:
+            NotADirectoryError: If a watched path is not a directory
+
+        """
+        self._snapshots = [
+            FsSnapshot.scan(root, follow_symlinks=self.follow_symlinks)
+            for root in self.roots
+        ]
+
+    def poll(self) -> FsChanges:
+        """Refresh the snapshots and return the changes since the last poll
+
+        The first call (if `start` was not called) takes the initial
+        snapshots and returns no changes.
+        """
+        t = time()
+        changes = FsChanges(created=[], modified=[], deleted=[], t=t)
+        if self._snapshots is None:
+            self.start()
+            return changes
+        snapshots = []
+        for snap in self._snapshots:
+            refreshed = snap.refresh(restat=True)
+            created, modified, deleted = snap.diff(refreshed)
+            changes.created.extend(self._reported(created, refreshed))
+            changes.modified.extend(self._reported(modified, refreshed))
+            changes.deleted.extend(self._reported(deleted, snap))
+            snapshots.append(refreshed)
+        self._snapshots = snapshots
+        return changes
+
+    def __iter__(self) -> Iterator[FsChanges]:
+        return watch(self)
+
+    def __aiter__(self) -> AsyncIterator[FsChanges]:
+        return watch_async(self)
+
+
+def watch(
+    paths: FsPath | Iterable[FsPath] | FsWatcher,
+    *,
+    interval: float = 1.0,
+    include: Iterable[str] | str | None = None,
+    exclude: Iterable[str] | str | None = None,
+    follow_symlinks: bool = False,
+) -> Iterator[FsChanges]:
+    """Watch directories (by polling) yielding batches of changes
+
+    The directories are snapshot once up front, then re-polled every
+    `interval` seconds; a FsChanges batch (created/modified/deleted paths)
+    is yielded for every poll that found (reported) changes. Runs until
+    the caller stops iterating.
+
+    Args:
+        paths: Directory (or directories) to watch, or a FsWatcher
+        interval: Seconds to sleep between polls
+        include: fnmatch-style pattern(s) of (relative) paths to report
+        exclude: Pattern(s) of (relative) paths not to report
+        follow_symlinks: Stat (and descend into) the targets of symlinks
+
+    Yields:
+        FsChanges: non-empty batches of changes
+
+    Examples:
+        >>> import os
+        >>> from shellfish import fs
+        >>> from threading import Timer
+        >>> fs.mkdirp("fs-watch.doctest")
+        >>> Timer(0.1, fs.write_str, ("fs-watch.doctest/a.txt", "a")).start()
+        >>> for changes in watch("fs-watch.doctest", interval=0.05):
+        ...     break
+        >>> changes.created == [os.path.join("fs-watch.doctest", "a.txt")]
+        True
+        >>> fs.rm("fs-watch.doctest", recursive=True)
+
+    """
+    watcher = (
+        paths
+        if isinstance(paths, FsWatcher)
+        else FsWatcher(
+            paths, include=include, exclude=exclude, follow_symlinks=follow_symlinks
+        )
+    )
+    if watcher._snapshots is None:
+        watcher.start()
+    while True:
+        sleep(interval)
+        changes = watcher.poll()
+        if changes:
+            yield changes
+
+
+async def watch_async(
+    paths: FsPath | Iterable[FsPath] | FsWatcher,
+    *,
+    interval: float = 1.0,
+    include: Iterable[str] | str | None = None,
+    exclude: Iterable[str] | str | None = None,
+    follow_symlinks: bool = False,
+) -> AsyncIterator[FsChanges]:
+    """(ASYNC) Watch directories (by polling) yielding batches of changes
+
+    Same as [watch][shellfish.fs.watch]; the snapshots are taken in a worker
+    thread so the event loop is never blocked on the file-system.
+
+    Examples:
+        >>> import asyncio, os
+        >>> from shellfish import fs
+        >>> fs.mkdirp("fs-watch-async.doctest")
+        >>> async def first_changes():
+        ...     loop = asyncio.get_running_loop()
+        ...     loop.call_later(0.1, fs.write_str, "fs-watch-async.doctest/a.txt", "a")
+        ...     async for changes in watch_async("fs-watch-async.doctest", interval=0.05):
+        ...         return changes
+        >>> changes = asyncio.run(first_changes())
+        >>> changes.created == [os.path.join("fs-watch-async.doctest", "a.txt")]
+        True
+        >>> fs.rm("fs-watch-async.doctest", recursive=True)
+
+    """
+    watcher = (
+        paths
+        if isinstance(paths, FsWatcher)
+        else FsWatcher(
+            paths, include=include, exclude=exclude, follow_symlinks=follow_symlinks
+        )
+    )
+    if watcher._snapshots is None:
+        await asyncio.to_thread(watcher.start)
+    while True:
+        await asyncio.sleep(interval)
+        changes = await asyncio.to_thread(watcher.poll)
+        if changes:
+            yield changes
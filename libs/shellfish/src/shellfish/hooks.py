@@ -0,0 +1,389 @@
+# -*- coding: utf-8 -*-
+"""Subprocess launch hooks (spawn, first output, exit, timeout) & metrics
+
+Hooks are callables registered w/ [add_hook][shellfish.hooks.add_hook] that
+receive a [HookEvent][shellfish.hooks.HookEvent] for every subprocess
+launched by `sh.do`, `sh.do_async` (and so `Exe`/`ExeAsync`) and
+`LIN.rsync`. With no hooks registered the launchers skip all of it (a
+single list check per launch).
+"""
+
+from __future__ import annotations
+
+import warnings
+
+from bisect import bisect_left
+from dataclasses import dataclass
+from os import PathLike, path
+from threading import Lock
+from time import time
+from typing import IO, TYPE_CHECKING, Any, Literal
+
+from jsonbourne import JSON
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Sequence
+    from types import TracebackType
+
+    from shellfish._types import FsPath
+
+__all__ = (
+    "HookEvent",
+    "HookHistogram",
+    "HookStats",
+    "JsonlHookExporter",
+    "Launch",
+    "add_hook",
+    "clear_hooks",
+    "get_hooks",
+    "launch",
+    "remove_hook",
+)
+
+HookEventKind = Literal["spawn", "first_output", "exit", "timeout"]
+
+_HOOKS: list[Callable[[HookEvent], Any]] = []
+
+
+@dataclass
+class HookEvent:
+    """A subprocess launch event passed to the registered hooks"""
+
+    kind: HookEventKind
+    """'spawn', 'first_output', 'exit' or 'timeout'"""
+    source: str
+    """What launched the process ('do', 'do_async', 'rsync', ...)"""
+    args: list[str]
+    """Command args of the process"""
+    ti: float
+    """Time the process was launched (seconds since epoch)"""
+    t: float
+    """Time of the event (seconds since epoch)"""
+    pid: int | None
+    """Process id (None if not known)"""
+    returncode: int | None
+    """Return code ('exit' events only)"""
+
+    __slots__ = ("args", "kind", "pid", "returncode", "source", "t", "ti")
+
+    @property
+    def dt(self) -> float:
+        """Seconds from launch to the event"""
+        return self.t - self.ti
+
+    @property
+    def cmd(self) -> str:
+        """Name of the command (basename of the first arg)"""
+        return path.basename(self.args[0]) if self.args else ""
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "kind": self.kind,
+            "source": self.source,
+            "cmd": self.cmd,
+            "args": self.args,
+            "ti": self.ti,
+            "t": self.t,
+            "dt": self.dt,
+            "pid": self.pid,
+            "returncode": self.returncode,
+        }
+
+
+def add_hook(fn: Callable[[HookEvent], Any]) -> Callable[[HookEvent], Any]:
+    """Register a hook called w/ every HookEvent; returns fn (decorator friendly)
+
+    Hooks are called synchronously from the launching thread (or event
+    loop), so they should be fast; exceptions they raise are turned into
+    warnings so they never break a subprocess run.
+    """
+    _HOOKS.append(fn)
+    return fn
+
+
+def remove_hook(fn: Callable[[HookEvent], Any]) -> None:
+    """Unregister a hook (no-op if it is not registered)"""
+    try:
+        _HOOKS.remove(fn)
+    except ValueError:
+        ...
+
+
+def clear_hooks() -> None:
+    """Unregister all the hooks"""
+    _HOOKS.clear()
+
+
+def get_hooks() -> tuple[Callable[[HookEvent], Any], ...]:
+    """Return the registered hooks"""
+    return tuple(_HOOKS)
+
+
+class Launch:
+    """Fires the hook events of a single subprocess launch"""
+
+    __slots__ = ("_first_output", "args", "pid", "source", "ti")
+
+    def __init__(self, args: Sequence[str] | str, source: str) -> None:
+        self.args = [args] if isinstance(args, str) else [str(arg) for arg in args]
+        self.source = source
+        self.ti = time()
+        self.pid: int | None = None
+        self._first_output = False
+
+    def _emit(self, kind: HookEventKind, returncode: int | None = None) -> None:
+        event = HookEvent(
+            kind=kind,
+            source=self.source,
+            args=self.args,
+            ti=self.ti,
+            t=time(),
+            pid=self.pid,
+            returncode=returncode,
+        )
+        for fn in tuple(_HOOKS):
+            try:
+                fn(event)
+            except Exception as e:
+                warnings.warn(
+                    f"shellfish hook {fn!r} raised {e!r}", RuntimeWarning, stacklevel=3
+                )
+
+    def spawned(self, pid: int | None) -> None:
+        self.pid = pid
+        self._emit("spawn")
+
+    def output(self) -> None:
+        """Fire 'first_output' (only for the first call)"""
+        if not self._first_output:
+            self._first_output = True
+            self._emit("first_output")
+
+    def exited(self, returncode: int | None) -> None:
+        self._emit("exit", returncode=returncode)
+
+    def timed_out(self) -> None:
+        self._emit("timeout")
+
+
+def launch(args: Sequence[str] | str, source: str) -> Launch | None:
+    """Return a Launch for a subprocess about to run; None if no hooks are registered"""
+    if not _HOOKS:
+        return None
+    return Launch(args, source)
+
+
+# histogram bucket upper bounds (seconds): 100us doubling up to ~7.5 hours
+_BOUNDS: tuple[float, ...] = tuple(1e-4 * 2**ix for ix in range(28))
+
+
+@dataclass
+class HookStats:
+    """Wall-time stats for one command; see [HookHistogram][shellfish.hooks.HookHistogram]"""
+
+    cmd: str
+    """Command (histogram key)"""
+    count: int
+    """Number of runs"""
+    total: float
+    """Total wall time (seconds)"""
+    min: float
+    """Shortest run (seconds)"""
+    max: float
+    """Longest run (seconds)"""
+    errors: int
+    """Runs that exited w/ a non-zero return code"""
+    timeouts: int
+    """Runs that timed out"""
+    buckets: list[int]
+    """Run counts per histogram bucket (upper bounds: `HookHistogram.bounds`)"""
+    bounds: tuple[float, ...]
+    """Upper bounds of the buckets (the last bucket is unbounded)"""
+
+    __slots__ = (
+        "bounds",
+        "buckets",
+        "cmd",
+        "count",
+        "errors",
+        "max",
+        "min",
+        "timeouts",
+        "total",
+    )
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """Return an upper bound for the q-quantile (0 <= q <= 1) run time"""
+        rank = q * self.count
+        seen = 0
+        for ix, nbucket in enumerate(self.buckets):
+            seen += nbucket
+            if nbucket and seen >= rank:
+                return (
+                    min(self.bounds[ix], self.max)
+                    if ix < len(self.bounds)
+                    else self.max
+                )
+        return self.max
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "cmd": self.cmd,
+            "count": self.count,
+            "total": self.total,
+            "mean": self.mean,
+            "min": self.min,
+            "max": self.max,
+            "p50": self.quantile(0.5),
+            "p90": self.quantile(0.9),
+            "p99": self.quantile(0.99),
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+        }
+
+
+class HookHistogram:
+    """Hook aggregating subprocess wall times into per-command histograms
+
+    Examples:
+        >>> import sys
+        >>> from shellfish import sh
+        >>> hist = sh.add_hook(HookHistogram())
+        >>> _ = sh.do(sys.executable, "-c", "print(1)")
+        >>> sh.remove_hook(hist)
+        >>> stats = hist.top(1)[0]
+        >>> stats.cmd == path.basename(sys.executable), stats.count, stats.errors
+        (True, 1, 0)
+
+    """
+
+    __slots__ = ("_lock", "_stats", "bounds", "key")
+
+    def __init__(
+        self,
+        *,
+        key: Callable[[HookEvent], str] | None = None,
+        bounds: Sequence[float] = _BOUNDS,
+    ) -> None:
+        """Create an (empty) histogram aggregator
+
+        Args:
+            key: Function returning the histogram key of an event (default:
+                the command name, `HookEvent.cmd`)
+            bounds: Ascending bucket upper bounds in seconds
+
+        """
+        self.key = key
+        self.bounds = tuple(bounds)
+        self._lock = Lock()
+        self._stats: dict[str, HookStats] = {}
+
+    def __call__(self, event: HookEvent) -> None:
+        if event.kind not in ("exit", "timeout"):
+            return
+        key = event.cmd if self.key is None else self.key(event)
+        dt = event.dt
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = HookStats(
+                    cmd=key,
+                    count=0,
+                    total=0.0,
+                    min=dt,
+                    max=dt,
+                    errors=0,
+                    timeouts=0,
+                    buckets=[0] * (len(self.bounds) + 1),
+                    bounds=self.bounds,
+                )
+            stats.count += 1
+            stats.total += dt
+            stats.min = min(stats.min, dt)
+            stats.max = max(stats.max, dt)
+            stats.buckets[bisect_left(self.bounds, dt)] += 1
+            if event.kind == "timeout":
+                stats.timeouts += 1
+            elif event.returncode:
+                stats.errors += 1
+
+    def stats(self) -> dict[str, HookStats]:
+        """Return the stats keyed by command"""
+        with self._lock:
+            return dict(self._stats)
+
+    def top(self, n: int = 10) -> list[HookStats]:
+        """Return the stats of the n commands w/ the most total wall time"""
+        return sorted(self.stats().values(), key=lambda s: s.total, reverse=True)[:n]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+class JsonlHookExporter:
+    """Hook writing every event as a JSON line to a file (or text stream)
+
+    Examples:
+        >>> import io, sys
+        >>> from shellfish import sh
+        >>> sio = io.StringIO()
+        >>> exporter = sh.add_hook(JsonlHookExporter(sio, kinds=("exit",)))
+        >>> _ = sh.do(sys.executable, "-c", "print(1)")
+        >>> sh.remove_hook(exporter)
+        >>> [JSON.loads(line)["returncode"] for line in sio.getvalue().splitlines()]
+        [0]
+
+    """
+
+    __slots__ = ("_file", "_lock", "_owned", "kinds")
+
+    def __init__(
+        self,
+        file: FsPath | IO[str],
+        *,
+        kinds: Iterable[HookEventKind] | None = None,
+    ) -> None:
+        """Create an exporter
+
+        Args:
+            file: Path of a file to append to, or a writable text stream
+            kinds: Event kinds to export (default: all)
+
+        """
+        self.kinds = None if kinds is None else frozenset(kinds)
+        self._owned = isinstance(file, str | PathLike)
+        self._file: IO[str] = (
+            open(file, "a", encoding="utf-8")
+            if isinstance(file, str | PathLike)
+            else file
+        )
+        self._lock = Lock()
+
+    def __call__(self, event: HookEvent) -> None:
+        if self.kinds is not None and event.kind not in self.kinds:
+            return
+        line = JSON.dumps(event.to_dict())
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self) -> None:
+        """Close the file (if the exporter opened it)"""
+        if self._owned:
+            self._file.close()
+
+    def __enter__(self) -> JsonlHookExporter:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        self.close()
@@ -1,14 +1,32 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from hashlib import blake2b, blake2s, md5, sha1, sha224, sha256, sha384, sha512
-from typing import TYPE_CHECKING, Union
+from mmap import ACCESS_READ, mmap
+from os import fspath as _fspath, fstat as _fstat, stat as _stat
+from typing import TYPE_CHECKING, Any, Union
+
+from jsonbourne import JSON
 
 if TYPE_CHECKING:
-    from collections.abc import Callable, Iterator
+    from collections.abc import Callable, Iterable, Iterator
     from hashlib import _Hash
 
-__all__ = ("hash_bytes_gen", "string2hasher")
+    from shellfish._types import FsPath
+
+__all__ = (
+    "FileHash",
+    "Manifest",
+    "ManifestDiff",
+    "hash_bytes_gen",
+    "hash_file",
+    "hash_files",
+    "string2hasher",
+)
+
+# files at least this big are hashed from a memory map in a single update
+_MMAP_THRESHOLD = 2**20
 
 _HASHERS: dict[str, Callable[[], _Hash]] = {
     "blake2b": blake2b,  # type: ignore[dict-item]
@@ -87,3 +105,218 @@ def hash_bytes_gen(it: Iterator[bytes], hashlike: HashLike) -> str:
     for chunk in it:
         _hasher.update(chunk)
     return _hasher.hexdigest()
+
+
+def hash_file(
+    fspath: FsPath, algo: HashLike = "blake2b", *, blocksize: int = 2**20
+) -> str:
+    """Return the (hex) digest of a file
+
+    Large files are memory-mapped and hashed w/ a single `update` call;
+    hashlib releases the GIL while hashing so many files can be hashed in
+    parallel by threads. Small (and unmappable) files are read in blocksize
+    chunks into a reused buffer.
+
+    Args:
+        fspath: File path
+        algo: Hash algorithm name or hash object
+        blocksize: Read buffer size for small/unmappable files
+
+    Returns:
+        str: hex digest
+
+    """
+    _hasher = hasher(algo)
+    with open(fspath, "rb") as f:
+        if _fstat(f.fileno()).st_size >= _MMAP_THRESHOLD:
+            try:
+                with mmap(f.fileno(), 0, access=ACCESS_READ) as m:
+                    _hasher.update(m)
+                    return _hasher.hexdigest()
+            except (OSError, ValueError):
+                ...
+        buf = bytearray(blocksize)
+        view = memoryview(buf)
+        while n := f.readinto(buf):
+            _hasher.update(view[:n])
+    return _hasher.hexdigest()
+
+
+@dataclass(frozen=True)
+class FileHash:
+    """Manifest entry: file path, size, mtime (ns) and digest"""
+
+    path: str
+    size: int
+    mtime_ns: int
+    digest: str
+
+    __slots__ = ("digest", "mtime_ns", "path", "size")
+
+
+@dataclass
+class ManifestDiff:
+    """Difference between 2 manifests (sorted paths)"""
+
+    added: list[str]
+    removed: list[str]
+    changed: list[str]
+
+    __slots__ = ("added", "changed", "removed")
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+
+class Manifest:
+    """File manifest; maps paths to FileHash entries (path/size/mtime/digest)"""
+
+    __slots__ = ("algo", "entries")
+
+    def __init__(
+        self, entries: Iterable[FileHash] = (), *, algo: str = "blake2b"
+    ) -> None:
+        self.algo = algo
+        self.entries: dict[str, FileHash] = {el.path: el for el in entries}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __iter__(self) -> Iterator[FileHash]:
+        return iter(self.entries.values())
+
+    def __contains__(self, fspath: object) -> bool:
+        return fspath in self.entries
+
+    def __getitem__(self, fspath: str) -> FileHash:
+        return self.entries[fspath]
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Manifest):
+            return NotImplemented
+        return self.algo == other.algo and self.entries == other.entries
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(algo={self.algo!r}, n={len(self)})"
+
+    def compare(self, other: Manifest) -> ManifestDiff:
+        """Compare this (new) manifest against another (old) one by digest
+
+        Args:
+            other: Manifest to compare against
+
+        Returns:
+            ManifestDiff: paths added, removed and w/ a changed digest
+
+        Raises:
+            ValueError: If the manifests were built w/ different algorithms
+
+        """
+        if self.algo != other.algo:
+            _emsg = f"Cannot compare {self.algo} manifest to {other.algo} manifest"
+            raise ValueError(_emsg)
+        return ManifestDiff(
+            added=sorted(self.entries.keys() - other.entries.keys()),
+            removed=sorted(other.entries.keys() - self.entries.keys()),
+            changed=sorted(
+                fspath
+                for fspath, entry in self.entries.items()
+                if fspath in other.entries
+                and other.entries[fspath].digest != entry.digest
+            ),
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "algo": self.algo,
+            "files": [
+                [el.path, el.size, el.mtime_ns, el.digest]
+                for el in self.entries.values()
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Manifest:
+        return cls((FileHash(*el) for el in data["files"]), algo=data["algo"])
+
+    def save(self, fspath: FsPath) -> int:
+        """Save the manifest to a (json) file; returns the number of bytes written"""
+        with open(fspath, "wb") as f:
+            return f.write(JSON.dumpb(self.to_dict()))
+
+    @classmethod
+    def load(cls, fspath: FsPath) -> Manifest:
+        """Load a manifest saved with `save`"""
+        with open(fspath, "rb") as f:
+            return cls.from_dict(JSON.loads(f.read()))
+
+
+def _hash_file_entry(fspath: str, algo: str, previous: Manifest | None) -> FileHash:
+    """Stat & hash a file (worker fn); reuses previous digest if unchanged"""
+    st = _stat(fspath)
+    if previous is not None:
+        prev = previous.entries.get(fspath)
+        if (
+            prev is not None
+            and prev.size == st.st_size
+            and prev.mtime_ns == st.st_mtime_ns
+        ):
+            return prev
+    return FileHash(
+        path=fspath,
+        size=st.st_size,
+        mtime_ns=st.st_mtime_ns,
+        digest=hash_file(fspath, algo),
+    )
+
+
+def hash_files(
+    paths: Iterable[FsPath],
+    algo: str = "blake2b",
+    *,
+    workers: int | None = None,
+    previous: Manifest | None = None,
+) -> Manifest:
+    """Hash files concurrently and return a Manifest
+
+    Files are hashed by a thread pool w/ `hash_file` (hashlib releases the
+    GIL so hashing scales w/ threads). Given a previous manifest, files
+    whose size and mtime are unchanged reuse the previous digest and are
+    not re-read (incremental re-hashing).
+
+    Args:
+        paths: File paths to hash
+        algo: Hash algorithm name
+        workers: Max number of worker threads (default: ThreadPoolExecutor's)
+        previous: Previous manifest (w/ the same algo) to reuse digests from
+
+    Returns:
+        Manifest: path/size/mtime/digest entries (in the order of paths)
+
+    Raises:
+        ValueError: If algo is not a valid hash algorithm or the previous
+            manifest was built w/ a different algorithm
+
+    Examples:
+        >>> from shellfish import fs
+        >>> _ = fs.write_str("hash-files.txt", "Hello World")
+        >>> manifest = hash_files(["hash-files.txt"], "sha256")
+        >>> manifest["hash-files.txt"].digest
+        'a591a6d40bf420404a011733cfb7b190d62c65bf0bcda32b57b277d9ad9f146e'
+        >>> bool(hash_files(["hash-files.txt"], "sha256", previous=manifest).compare(manifest))
+        False
+        >>> fs.rm("hash-files.txt")
+
+    """
+    string2hasher(algo)
+    if previous is not None and previous.algo != algo:
+        _emsg = f"previous manifest algo ({previous.algo}) != algo ({algo})"
+        raise ValueError(_emsg)
+    _paths = [_fspath(el) for el in paths]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return Manifest(
+            pool.map(lambda fspath: _hash_file_entry(fspath, algo, previous), _paths),
+            algo=algo,
+        )
@@ -3,133 +3,220 @@
 
 from __future__ import annotations
 
+from os import DirEntry, scandir as _scandir
+from os.path import realpath
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, NamedTuple
 
 if TYPE_CHECKING:
     from collections.abc import Callable, Iterator
 
 
-class _DirTree:
-    """DirTree object for use by the tree command"""
-
-    _filename_prefix_mid: str = "├──"
-    _filename_prefix_last: str = "└──"
-    _parent_prefix_middle: str = "    "
-    _parent_refix_last: str = "│   "
-
-    path: Path
-    is_last: bool
-    depth: int
-    parent: _DirTree | None
-
-    def __init__(
-        self,
-        path: str | Path,
-        *,
-        parent_path: _DirTree | None,
-        is_last: bool = False,
-    ) -> None:
-        """Construct a DirTree object
-
-        Args:
-            path: Path-string to start the directory tree at
-            parent_path: The parent path to start the directory tree at
-            is_last: Is the current tree the last directory in the tree
-
-        """
-        self.path = Path(str(path))
-        self.parent = parent_path
-        self.is_last = is_last
-        self.depth: int = self.parent.depth + 1 if self.parent else 0
-
-    @classmethod
-    def make_tree(
-        cls,
-        root: Path,
-        *,
-        parent: _DirTree | None = None,
-        is_last: bool = False,
-        filterfn: Callable[..., bool] | None = None,
-    ) -> Iterator[_DirTree]:
-        """Make a DirTree object
-
-        Args:
-            root: Root directory
-            parent: Parent directory
-            is_last: Is last
-            filterfn: Function to filter with
-
-        Yields:
-            DirTree object
-
-        """
-        root = Path(str(root))
-        filterfn = filterfn or _DirTree._default_filter
-
-        displayable_root = cls(str(root), parent_path=parent, is_last=is_last)
-        yield displayable_root
-
-        children = sorted(
-            (fspath for fspath in root.iterdir() if filterfn(str(fspath))),
-            key=lambda s: str(s).lower(),
-        )
-        for idx, child in enumerate(children, start=1):
-            is_last = idx == len(children)
-
-            if child.is_dir():
-                yield from cls.make_tree(
-                    child,
-                    parent=displayable_root,
-                    is_last=is_last,
-                    filterfn=filterfn,
+_FILE_MID = "├── "
+_FILE_LAST = "└── "
+_PARENT_MID = "│   "
+_PARENT_LAST = "    "
+
+
+class _TreeEntry(NamedTuple):
+    name: str
+    path: str
+    is_dir: bool
+    descend: bool
+    size: int
+
+
+def _default_filter(path_string: str) -> bool:
+    """Return True/False if the fspath is to be filtered/ignored"""
+    ignore_strings = (".pyc", "__pycache__")
+    return not any(ignored in str(path_string).lower() for ignored in ignore_strings)
+
+
+def _fmt_size(nbytes: int) -> str:
+    """Format a size like `tree -h`/`du -h` ('512', '4.0K', '1.2M', ...)"""
+    size = float(nbytes)
+    for unit in ("", "K", "M", "G", "T"):
+        if size < 1024 or unit == "T":
+            return f"{size:.0f}" if not unit else f"{size:.1f}{unit}"
+        size /= 1024
+    return str(nbytes)  # pragma: no cover
+
+
+def _entry_is_dir(entry: DirEntry[str]) -> tuple[bool, bool]:
+    """Return (is_dir, is_symlink) from the d_type cached by scandir
+
+    Only symlinks are stat-ed (to display symlinked dirs as dirs).
+    """
+    try:
+        if entry.is_symlink():
+            return entry.is_dir(), True
+        return entry.is_dir(follow_symlinks=False), False
+    except OSError:
+        return False, False
+
+
+def _entry_size(entry: DirEntry[str]) -> int:
+    try:
+        return entry.stat(follow_symlinks=False).st_size
+    except OSError:
+        return 0
+
+
+def _scan_tree_dir(
+    dirpath: str,
+    *,
+    filterfn: Callable[[str], bool],
+    follow_symlinks: bool,
+    sizes: bool,
+) -> list[_TreeEntry]:
+    """Return the (filtered) entries of a directory sorted like `_DirTree`"""
+    entries = []
+    with _scandir(dirpath) as it:
+        for entry in it:
+            if not filterfn(entry.path):
+                continue
+            is_dir, is_symlink = _entry_is_dir(entry)
+            entries.append(
+                _TreeEntry(
+                    name=entry.name,
+                    path=entry.path,
+                    is_dir=is_dir,
+                    descend=is_dir and (follow_symlinks or not is_symlink),
+                    size=_entry_size(entry) if sizes and not is_dir else 0,
                 )
+            )
+    entries.sort(key=lambda e: e.path.lower())
+    return entries
+
+
+def _dir_totals(
+    dirpath: str,
+    totals: dict[str, int],
+    *,
+    filterfn: Callable[[str], bool],
+    follow_symlinks: bool,
+) -> int:
+    """Sum the (apparent) file sizes beneath dirpath into totals (per dir)
+
+    Iterative (an explicit stack, like `tree_lines`) so very deep trees do
+    not hit the recursion limit; w/ follow_symlinks each real directory is
+    only totaled once (so symlink loops terminate).
+    """
+    # (dirpath, parent dirpath) in scan order (parents before children)
+    scanned: list[tuple[str, str | None]] = []
+    stack: list[tuple[str, str | None]] = [(dirpath, None)]
+    seen: set[str] = set()
+    while stack:
+        _dirpath, parent = stack.pop()
+        if follow_symlinks:
+            real = realpath(_dirpath)
+            if real in seen:
+                continue
+            seen.add(real)
+        scanned.append((_dirpath, parent))
+        try:
+            entries = _scan_tree_dir(
+                _dirpath, filterfn=filterfn, follow_symlinks=follow_symlinks, sizes=True
+            )
+        except OSError:
+            entries = []
+        total = 0
+        for entry in entries:
+            if entry.descend:
+                stack.append((entry.path, _dirpath))
             else:
-                yield cls(child, parent_path=displayable_root, is_last=is_last)
-
-    @staticmethod
-    def _default_filter(path_string: str) -> bool:
-        """Return True/False if the fspath is to be filtered/ignored"""
-        ignore_strings = (".pyc", "__pycache__")
-        return not any(
-            ignored in str(path_string).lower() for ignored in ignore_strings
-        )
-
-    @property
-    def displayname(self) -> str:
-        """Display name for DirTree root path name
-
-        Returns:
-            str: root path name as a string
-
-        """
-        if self.path.is_dir():
-            return self.path.name + "/"
-        return self.path.name
-
-    def displayable(self) -> str:
-        """Return displayable tree string
-
-        Returns:
-            str: displayable tree string
-
-        """
-        if self.parent is None:
-            return self.displayname
-
-        _filename_prefix = (
-            self._filename_prefix_last if self.is_last else self._filename_prefix_mid
-        )
-
-        parts = [f"{_filename_prefix!s} {self.displayname!s}"]
-
-        parent = self.parent
-        while parent and parent.parent is not None:  # type: ignore[truthy-bool]
-            parts.append(
-                self._parent_prefix_middle
-                if parent.is_last
-                else self._parent_refix_last
+                total += entry.size
+        totals[_dirpath] = total
+    # sum the sub-directory totals into their parents (children first)
+    for _dirpath, parent in reversed(scanned):
+        if parent is not None:
+            totals[parent] += totals[_dirpath]
+    return totals[dirpath]
+
+
+def _tree_line(
+    prefix: str, entry: _TreeEntry, totals: dict[str, int] | None, suffix: str = ""
+) -> str:
+    displayname = entry.name + "/" if entry.is_dir else entry.name
+    if totals is not None:
+        size = totals.get(entry.path, 0) if entry.descend else entry.size
+        displayname = f"[{_fmt_size(size)}]  {displayname}"
+    return prefix + displayname + suffix
+
+
+def _pending(
+    entries: list[_TreeEntry], max_entries: int | None
+) -> tuple[list[_TreeEntry], int]:
+    """Return (entries to show reversed for popping, n entries not shown)"""
+    shown = entries if max_entries is None else entries[:max_entries]
+    return shown[::-1], len(entries) - len(shown)
+
+
+def tree_lines(
+    root: str,
+    *,
+    filterfn: Callable[[str], bool] | None = None,
+    max_depth: int | None = None,
+    max_entries: int | None = None,
+    sizes: bool = False,
+    follow_symlinks: bool = False,
+) -> Iterator[str]:
+    """Yield the lines of a directory tree as the tree is scanned
+
+    Only the sorted entries of the directories on the current path are held
+    in memory, so lines are produced right away and memory does not grow
+    with the size of the tree. With `sizes` the tree is scanned once up
+    front to total the directory sizes (only the totals are kept).
+
+    Raises:
+        OSError: If root cannot be scanned (unreadable sub-directories are
+            marked '[error opening dir]')
+
+    """
+    _root = str(Path(root))
+    _filterfn = filterfn or _default_filter
+    root_entries = _scan_tree_dir(
+        _root, filterfn=_filterfn, follow_symlinks=follow_symlinks, sizes=sizes
+    )
+    totals: dict[str, int] | None = None
+    if sizes:
+        totals = {}
+        _dir_totals(_root, totals, filterfn=_filterfn, follow_symlinks=follow_symlinks)
+    root_entry = _TreeEntry(
+        name=Path(_root).name, path=_root, is_dir=True, descend=True, size=0
+    )
+    yield _tree_line("", root_entry, totals)
+    if max_depth is not None and max_depth < 1:
+        return
+    # stack of (entries left to show (reversed), n entries not shown, prefix)
+    stack: list[tuple[list[_TreeEntry], int, str]] = [
+        (*_pending(root_entries, max_entries), "")
+    ]
+    while stack:
+        entries, nhidden, prefix = stack[-1]
+        if not entries:
+            stack.pop()
+            if nhidden:
+                yield f"{prefix}{_FILE_LAST}... {nhidden} more"
+            continue
+        entry = entries.pop()
+        is_last = not entries and not nhidden
+        line_prefix = prefix + (_FILE_LAST if is_last else _FILE_MID)
+        if not entry.descend or (max_depth is not None and len(stack) >= max_depth):
+            yield _tree_line(line_prefix, entry, totals)
+            continue
+        try:
+            children = _scan_tree_dir(
+                entry.path,
+                filterfn=_filterfn,
+                follow_symlinks=follow_symlinks,
+                sizes=sizes,
             )
-            parent = parent.parent
-
-        return "".join(reversed(parts))
+        except OSError:
+            yield _tree_line(line_prefix, entry, totals, "  [error opening dir]")
+            continue
+        yield _tree_line(line_prefix, entry, totals)
+        stack.append((
+            *_pending(children, max_entries),
+            prefix + (_PARENT_LAST if is_last else _PARENT_MID),
+        ))
@@ -3,22 +3,39 @@
 
 from __future__ import annotations
 
+import asyncio
+import signal
+import sys
+
+from contextlib import ExitStack
 from functools import cache, lru_cache
+from locale import getpreferredencoding
 from os import (
     chdir,
+    defpath as _defpath,
     environ,
     fspath as _fspath,
     getcwd,
     listdir,
     makedirs,
     path as path,
+    pathsep as _pathsep,
+    stat as _stat,
 )
 from pathlib import Path
 from platform import system
 from shlex import quote as _quote, split as _shplit
 from shutil import which as _which
-from subprocess import PIPE, CompletedProcess, TimeoutExpired, run
-from time import time
+from subprocess import (
+    PIPE,
+    CalledProcessError,
+    CompletedProcess,
+    Popen,
+    TimeoutExpired,
+    run,
+)
+from threading import Thread
+from time import monotonic, time
 from typing import (
     IO,
     TYPE_CHECKING,
@@ -29,26 +46,53 @@ from typing import (
 
 from asyncify import asyncify
 from listless import flatten_strings as _flatten_strings
-from shellfish import fs, sp
+from shellfish import fs, hooks as _hooks, sp
 from shellfish.__about__ import __version__
 from shellfish.dev import run_async as __run_async
+from shellfish.dev.popen_gen import (
+    _PipeDecoder,
+    _read_chunks,
+    _remaining,
+    popen_pipes_gen,
+)
 from shellfish.done import (
+    DoManyResult as DoManyResult,
     Done as Done,
     DoneDict as DoneDict,
     DoneError as DoneError,
+    DoneOutput as DoneOutput,
     HrTime as HrTime,
     HrTimeDict as HrTimeDict,
+    Rusage as Rusage,
+    RusageDict as RusageDict,
+    _SpillBuffer,
 )
 from shellfish.echo import echo as echo
 from shellfish.fs import (
+    CopyTreeStats as CopyTreeStats,
+    DirCmp as DirCmp,
+    DuplicateGroup as DuplicateGroup,
+    DuResult as DuResult,
+    DuStats as DuStats,
+    FileHashCache as FileHashCache,
+    FsChanges as FsChanges,
+    FsSnapshot as FsSnapshot,
+    FsSnapshotEntry as FsSnapshotEntry,
+    FsWatcher as FsWatcher,
+    RmTreeStats as RmTreeStats,
     SymlinkType as SymlinkType,
+    atomic_open as atomic_open,
+    atomic_open_async as atomic_open_async,
     chmod as chmod,
     copy_file as copy_file,
+    copy_tree as copy_tree,
     cp as cp,
     dir_exists as dir_exists,
     dir_exists_async as dir_exists_async,
+    dircmp as dircmp,
     dirpath_gen as dirpath_gen,
     dirs_gen as dirs_gen,
+    du as du,
     exists as exists,
     exists_async as exists_async,
     extension as extension,
@@ -62,6 +106,7 @@ from shellfish.fs import (
     files_gen as files_gen,
     filesize as filesize,
     filesize_async as filesize_async,
+    find_duplicates as find_duplicates,
     fspath as fspath,
     glob as glob,
     is_dir as is_dir,
@@ -114,6 +159,7 @@ from shellfish.fs import (
     rjson as rjson,
     rjson_async as rjson_async,
     rm_gen as rm_gen,
+    rm_tree as rm_tree,
     rmdir as rmdir,
     rmfile as rmfile,
     rstr as rstr,
@@ -148,6 +194,9 @@ from shellfish.fs import (
     symlink as symlink,
     touch as touch,
     walk_gen as walk_gen,
+    walk_parallel_gen as walk_parallel_gen,
+    watch as watch,
+    watch_async as watch_async,
     wbin as wbin,
     wbin_async as wbin_async,
     wbin_gen as wbin_gen,
@@ -171,13 +220,30 @@ from shellfish.fs import (
     wstring as wstring,
     wstring_async as wstring_async,
 )
-from shellfish.libsh._dirtree import _DirTree
+from shellfish.hooks import (
+    HookEvent as HookEvent,
+    HookHistogram as HookHistogram,
+    HookStats as HookStats,
+    JsonlHookExporter as JsonlHookExporter,
+    add_hook as add_hook,
+    clear_hooks as clear_hooks,
+    get_hooks as get_hooks,
+    remove_hook as remove_hook,
+)
+from shellfish.libsh._dirtree import tree_lines as _tree_lines
 from shellfish.osfs import LIN as _LIN, WIN as _WIN
 from shellfish.process import is_win
 from shellfish.stdio import Stdio as Stdio
 
 if TYPE_CHECKING:
-    from collections.abc import Callable, Iterable, Sequence
+    from collections.abc import (
+        AsyncGenerator,
+        Callable,
+        Iterable,
+        Iterator,
+        Mapping,
+        Sequence,
+    )
 
     from shellfish._types import (
         STDIN as STDIN,
@@ -189,26 +255,53 @@ if TYPE_CHECKING:
 __all__ = (
     "LIN",
     "WIN",
+    "CopyTreeStats",
+    "DirCmp",
+    "DoManyResult",
     "Done",
     "DoneDict",
     "DoneError",
+    "DoneOutput",
+    "DuResult",
+    "DuStats",
+    "DuplicateGroup",
+    "EnvOverlay",
+    "FileHashCache",
     "Flag",
     "FlagMeta",
+    "FsChanges",
+    "FsSnapshot",
+    "FsSnapshotEntry",
+    "FsWatcher",
+    "HookEvent",
+    "HookHistogram",
+    "HookStats",
     "HrTime",
     "HrTimeDict",
     # fs exports
+    "JsonlHookExporter",
+    "RmTreeStats",
+    "Rusage",
+    "RusageDict",
     "Stdio",
     "SymlinkType",
     "TimeoutExpired",
+    "WhichCache",
     "__version__",
+    "add_hook",
+    "atomic_open",
+    "atomic_open_async",
     "basename",
     "cd",
     "chmod",
+    "clear_hooks",
     "copy_file",
+    "copy_tree",
     "cp",
     "decode_stdio_bytes",
     "dir_exists",
     "dir_exists_async",
+    "dircmp",
     "dirname",
     "dirpath_gen",
     "dirs_gen",
@@ -216,7 +309,12 @@ __all__ = (
     "do_",
     "do_async",
     "do_asyncify",
+    "do_many",
+    "do_many_async",
+    "do_many_gen",
+    "do_many_gen_async",
     "doa",
+    "du",
     "echo",
     "exists",
     "exists_async",
@@ -232,9 +330,12 @@ __all__ = (
     "files_gen",
     "filesize",
     "filesize_async",
+    "find_duplicates",
     "flatten_args",
     "fspath",
+    "get_hooks",
     "glob",
+    "invalidate_env_cache",
     "is_dir",
     "is_dir_async",
     "is_file",
@@ -277,6 +378,8 @@ __all__ = (
     "mv",
     "path",
     "path_gen",
+    "pipe",
+    "pipe_gen",
     "popen_has_pipe_character",
     "pstderr",
     "pstdout",
@@ -300,11 +403,13 @@ __all__ = (
     "read_json_async",
     "read_str",
     "read_str_async",
+    "remove_hook",
     "rename",
     "rjson",
     "rjson_async",
     "rm",
     "rm_gen",
+    "rm_tree",
     "rmdir",
     "rmfile",
     "rstr",
@@ -347,6 +452,7 @@ __all__ = (
     "sync",
     "touch",
     "tree",
+    "tree_gen",
     "unlink_dir",
     "unlink_dirs",
     "unlink_file",
@@ -355,6 +461,9 @@ __all__ = (
     "validate_popen_args",
     "validate_stdin",
     "walk_gen",
+    "walk_parallel_gen",
+    "watch",
+    "watch_async",
     "wbin",
     "wbin_async",
     "wbin_gen",
@@ -383,6 +492,8 @@ __all__ = (
 )
 
 IS_WIN: bool = is_win()
+# exit signal of upstream pipeline stages whose reader went away (not on windows)
+_SIGPIPE: int | None = getattr(signal, "SIGPIPE", None)
 
 
 class FlagMeta(type):
@@ -423,6 +534,96 @@ class Flag(metaclass=FlagMeta):
     """
 
 
+class _EnvironState:
+    """os.environ version & snapshot shared by all EnvOverlay objects"""
+
+    version: int = 0
+    key: tuple[int, dict[Any, Any]] | None = None
+    snapshot: dict[str, str] = {}  # noqa: RUF012
+
+
+def _environ_raw() -> Mapping[Any, Any]:
+    # os.environ's underlying (encoded) dict; comparing it to a copy is cheap
+    # (no per-item decoding) and catches any change made through os.environ
+    return getattr(environ, "_data", environ)
+
+
+def _environ_snapshot() -> dict[str, str]:
+    """Return a (shared, do not mutate) copy of os.environ
+
+    A new snapshot (a new object) is taken whenever os.environ changed
+    (vars set, deleted or given a new value) since the last one.
+    """
+    key = _EnvironState.key
+    if key is None or key[0] != _EnvironState.version or key[1] != _environ_raw():
+        _EnvironState.snapshot = dict(environ)
+        _EnvironState.key = (_EnvironState.version, dict(_environ_raw()))
+    return _EnvironState.snapshot
+
+
+def invalidate_env_cache() -> None:
+    """Invalidate the cached environments (EnvOverlay, mkenv)
+
+    Changes made through `os.environ` are detected; call it after changing
+    the process environment by other means (e.g. `os.putenv`).
+    """
+    _EnvironState.version += 1
+
+
+class EnvOverlay:
+    """Environment variables overlaid on `os.environ` w/ a cached merged env
+
+    The merged mapping (`os.environ` updated w/ the overlay) is built once
+    and reused until `os.environ` changes (or
+    [invalidate_env_cache][shellfish.sh.invalidate_env_cache] is called), so
+    launching many subprocesses w/ the same env does not copy `os.environ`
+    each time.
+
+    Examples:
+        >>> overlay = EnvOverlay({"SHELLFISH_OVERLAY": "1"})
+        >>> merged = overlay.merged()
+        >>> merged["SHELLFISH_OVERLAY"]
+        '1'
+        >>> overlay.merged() is merged
+        True
+        >>> _ = setenv("SHELLFISH_OVERLAY_OTHER", "2")
+        >>> overlay.merged() is merged
+        False
+        >>> del environ["SHELLFISH_OVERLAY_OTHER"]
+
+    """
+
+    __slots__ = ("_base", "_merged", "env")
+
+    def __init__(self, env: dict[str, str] | None = None) -> None:
+        self.env: dict[str, str] = dict(env) if env else {}
+        self._base: dict[str, str] | None = None
+        self._merged: dict[str, str] = {}
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.env!r})"
+
+    def merged(self) -> dict[str, str]:
+        """Return the merged env (shared between calls; do not mutate it)"""
+        base = _environ_snapshot()
+        if self._base is not base:
+            self._merged = {**base, **self.env}
+            self._base = base
+        return self._merged
+
+
+@lru_cache(maxsize=128)
+def _env_overlay(items: frozenset[tuple[str, str]]) -> EnvOverlay:
+    return EnvOverlay(dict(items))
+
+
+def _mkenv(env: dict[str, str], *, extenv: bool) -> dict[str, str]:
+    """Return the env for a subprocess; the merged dict is cached & shared"""
+    if extenv:
+        return _env_overlay(frozenset(env.items())).merged()
+    return env
+
+
 def mkenv(env: dict[str, str], *, extenv: bool = True) -> dict[str, str]:
     """Return the environment dict to run a subprocess with
 
@@ -602,20 +803,159 @@ def _do_tee(
     env: dict[str, str] | None,
     timeout: float | None,
     shell: bool = False,
+    rusage: bool = False,
+    launch: _hooks.Launch | None = None,
 ) -> Done:
-    completed, pdt = sp.run_dtee(
-        args, input=input, cwd=cwd, env=env, timeout=timeout, shell=shell
+    completed, pdt, proc = sp._run_dtee(
+        args,
+        input=input,
+        cwd=cwd,
+        env=env,
+        timeout=timeout,
+        shell=shell,
+        popen_cls=sp.RusagePopen if rusage else Popen,
+        launch=launch,
     )
     return Done(
         args=completed.args,
-        stdout=completed.stdout.decode(),
-        stderr=completed.stderr.decode(),
+        stdout=completed.stdout,
+        stderr=completed.stderr,
         returncode=completed.returncode,
         ti=pdt.ti,
         tf=pdt.tf,
         dt=pdt.dt,
         dryrun=False,
         verbose=False,
+        rusage=_proc_rusage(proc),
+    )
+
+
+# spill threshold for capturing w/ _do_spill w/o ever spilling to disk
+_NO_SPILL = sys.maxsize
+
+
+def _proc_rusage(proc: Popen[Any]) -> Rusage | None:
+    """Return the Rusage recorded by a sp.RusagePopen (None otherwise)"""
+    ru = getattr(proc, "rusage", None)
+    return None if ru is None else Rusage.from_struct_rusage(ru)
+
+
+def _run_rusage(
+    args: PopenArgs, *, input: Any, timeout: float | None, **kwargs: Any
+) -> tuple[CompletedProcess[Any], Rusage | None]:
+    """`subprocess.run` w/ the child reaped by `os.wait4` to get its rusage"""
+    with sp.RusagePopen(
+        args,
+        stdin=PIPE if input is not None else None,
+        stdout=PIPE,
+        stderr=PIPE,
+        **kwargs,
+    ) as proc:
+        try:
+            stdout, stderr = proc.communicate(input, timeout=timeout)
+        except BaseException:
+            proc.kill()
+            raise
+    return (
+        CompletedProcess(proc.args, proc.returncode, stdout, stderr),
+        _proc_rusage(proc),
+    )
+
+
+def _text_output(output: DoneOutput) -> DoneOutput:
+    r"""Decode in-memory output like `subprocess.run(text=True)` does
+
+    Decoded w/ the locale encoding and w/ universal newlines (`\r\n` and
+    `\r` become `\n`); spilled output is left as is.
+    """
+    if output.spilled:
+        return output
+    text = output.raw.decode(getpreferredencoding(do_setlocale=False))
+    return DoneOutput(text.replace("\r\n", "\n").replace("\r", "\n"))
+
+
+def _write_stdin(stdin: IO[bytes], data: bytes) -> None:
+    try:
+        stdin.write(data)
+    except BrokenPipeError:
+        ...
+    finally:
+        try:
+            stdin.close()
+        except BrokenPipeError:
+            ...
+
+
+def _do_spill(
+    args: PopenArgs,
+    *,
+    input: bytes | None,
+    cwd: FsPath | None,
+    env: dict[str, str] | None,
+    timeout: float | None,
+    shell: bool,
+    verbose: bool,
+    spill: int,
+    text: bool = False,
+    rusage: bool = False,
+    launch: _hooks.Launch | None = None,
+) -> Done:
+    """Run a subprocess capturing stdout/stderr w/ spill-to-disk buffers
+
+    Each stream is buffered in memory until it exceeds `spill` bytes and is
+    then written to a temp file (see [DoneOutput][shellfish.done.DoneOutput]).
+    Un-spilled output is the same as captured by `subprocess.run` (used by
+    `_do` w/o spill/hooks), incl. for `text=True`.
+    """
+    stdout_buf = _SpillBuffer(spill)
+    stderr_buf = _SpillBuffer(spill)
+    ti = time()
+    with (sp.RusagePopen if rusage else Popen)(
+        args=args,
+        stdout=PIPE,
+        stderr=PIPE,
+        stdin=PIPE if input is not None else None,
+        env=env,
+        cwd=cwd,
+        shell=shell,
+    ) as proc:
+        if launch is not None:
+            launch.spawned(proc.pid)
+        try:
+            if input is not None and proc.stdin:
+                Thread(
+                    target=_write_stdin, args=(proc.stdin, input), daemon=True
+                ).start()
+            for io_type, chunk in popen_pipes_gen(proc, timeout=timeout, lines=False):
+                if launch is not None:
+                    launch.output()
+                if io_type == 1:  # stdout is 1
+                    stdout_buf.write(chunk)
+                else:
+                    stderr_buf.write(chunk)
+        except BaseException as e:
+            proc.kill()
+            stdout_buf.discard()
+            stderr_buf.discard()
+            if launch is not None and isinstance(e, TimeoutExpired):
+                launch.timed_out()
+            raise
+    tf = time()
+    if launch is not None:
+        launch.exited(proc.returncode)
+    return Done(
+        args=proc.args if isinstance(proc.args, list) else [proc.args],
+        returncode=proc.returncode,
+        stdout=_text_output(stdout_buf.output()) if text else stdout_buf.output(),
+        stderr=_text_output(stderr_buf.output()) if text else stderr_buf.output(),
+        ti=ti,
+        tf=tf,
+        dt=tf - ti,
+        hrdt=HrTime.from_seconds(tf - ti),
+        verbose=verbose,
+        stdin=input.decode() if input is not None else None,
+        dryrun=False,
+        rusage=_proc_rusage(proc),
     )
 
 
@@ -634,6 +974,9 @@ def _do(
     tee: bool = False,
     ok_code: int | list[int] | tuple[int, ...] | set[int] = 0,
     dryrun: bool = False,
+    spill: int | None = None,
+    rusage: bool = False,
+    hook_source: str = "do",
 ) -> Done:
     """Run a subprocess synchronously
 
@@ -652,14 +995,22 @@ def _do(
         timeout: Timeout in seconds for the process if not None
         ok_code: Code(s) to consider as OK
         dryrun: Flag to not run the subprocess and return a faux Done
+        spill: Capture stdout/stderr in memory up to this many bytes (each)
+            and spill the rest to a temp file; None to capture in memory
+        rusage: Collect the process' resource usage (`Done.rusage`)
+        hook_source: Launch source reported to the hooks (see `shellfish.hooks`)
 
     Returns:
         [Done][shellfish.done.Done] object for the finished subprocess
 
     Raises:
-        ValueError: If args has pipe character (`|`)
+        ValueError: If args has pipe character (`|`) or both tee and spill
+            are given
 
     """
+    if tee and spill is not None:
+        _emsg = "spill is not supported w/ tee=True"
+        raise ValueError(_emsg)
     _input = validate_stdin(input)
     _args = [args] if isinstance(args, (str, bytes)) else list(args)
     if IS_WIN:
@@ -673,7 +1024,7 @@ def _do(
     if not shell and popen_has_pipe_character(_args):
         _emsg = f"WARNING: has a pipe character, but shell=False; args: {_args}"
         raise ValueError(_emsg)
-    _env = None if env is None else mkenv(env, extenv=extenv)
+    _env = None if env is None else _mkenv(env, extenv=extenv)
     args_str = " ".join(_args)
     if dryrun:
         return Done(
@@ -690,6 +1041,7 @@ def _do(
             dryrun=True,
         )
 
+    launch = _hooks.launch(_args, hook_source)
     if tee:
         return _do_tee(
             args=args,
@@ -698,28 +1050,60 @@ def _do(
             env=_env,
             timeout=timeout,
             shell=shell,
+            rusage=rusage,
+            launch=launch,
         )
 
+    # w/ hooks registered the output is streamed (to see the first output)
+    if spill is not None or launch is not None:
+        done = _do_spill(
+            args=_args if IS_WIN or not shell else args_str,
+            input=_input if not isinstance(_input, str) else _input.encode(),
+            cwd=cwd,
+            env=_env,
+            timeout=timeout,
+            shell=shell,
+            verbose=verbose,
+            spill=spill if spill is not None else _NO_SPILL,
+            text=text,
+            rusage=rusage,
+            launch=launch,
+        )
+        if check or ok_code != 0:
+            done.check(ok_code=ok_code)
+        return done
+
     ti = time()
-    proc = run(
-        args=_args if IS_WIN or not shell else args_str,
-        stdout=PIPE,
-        stderr=PIPE,
-        env=_env,
-        cwd=cwd,
-        shell=shell,
-        input=validate_stdin(input),
-        timeout=timeout,
-        text=text,
-    )
+    _rusage = None
+    if rusage:
+        proc, _rusage = _run_rusage(
+            _args if IS_WIN or not shell else args_str,
+            env=_env,
+            cwd=cwd,
+            shell=shell,
+            input=_input,
+            timeout=timeout,
+            text=text,
+        )
+    else:
+        proc = run(
+            args=_args if IS_WIN or not shell else args_str,
+            stdout=PIPE,
+            stderr=PIPE,
+            env=_env,
+            cwd=cwd,
+            shell=shell,
+            input=validate_stdin(input),
+            timeout=timeout,
+            text=text,
+        )
     tf = time()
-    stdout_str = pstdout(proc)
-    stderr_str = pstderr(proc)
+    # raw bytes; Done decodes them on first access
     done = Done(
         args=proc.args if isinstance(proc.args, list) else [proc.args],
         returncode=proc.returncode,
-        stdout=stdout_str,
-        stderr=stderr_str,
+        stdout=proc.stdout if proc.stdout is not None else b"",
+        stderr=proc.stderr if proc.stderr is not None else b"",
         ti=ti,
         tf=tf,
         dt=tf - ti,
@@ -727,6 +1111,7 @@ def _do(
         verbose=verbose,
         stdin=_input if not isinstance(_input, bytes) else _input.decode(),
         dryrun=False,
+        rusage=_rusage,
     )
     if check or ok_code != 0:
         done.check(ok_code=ok_code)
@@ -747,6 +1132,8 @@ def do(
     timeout: float | int | None = None,
     ok_code: int | list[int] | tuple[int, ...] | set[int] = 0,
     dryrun: bool = False,
+    spill: int | None = None,
+    rusage: bool = False,
 ) -> Done:
     """Run a subprocess synchronously
 
@@ -765,12 +1152,19 @@ def do(
         timeout: Timeout in seconds for the process if not None
         ok_code: Return code(s) to check against
         dryrun: Don't run the subprocess
+        spill: Capture stdout/stderr in memory up to this many bytes (each)
+            and spill the rest to a temp file (for huge outputs); the Done's
+            `lines`/`grep`/`json_parse(jsonl=True)` then stream from disk.
+            Not supported w/ tee.
+        rusage: Collect the process' CPU time, peak RSS and block I/O as
+            `Done.rusage` (via `os.wait4`; None on windows)
 
     Returns:
         Finished PRun object which is a dictionary, so a dictionary
 
     Raises:
-        ValueError: if args and *popenargs are both given
+        ValueError: if args and *popenargs are both given, or if both tee
+            and spill are given
 
     """
     if args and popenargs:
@@ -790,6 +1184,8 @@ def do(
         ok_code=ok_code,
         dryrun=dryrun,
         tee=tee,
+        spill=spill,
+        rusage=rusage,
     )
 
 
@@ -847,6 +1243,273 @@ def shell(
 
 shx = shell
 
+
+def _pipe_stages(
+    cmds: tuple[PopenArgs, ...], env: dict[str, str] | None
+) -> list[list[str]]:
+    if not cmds:
+        raise ValueError("pipe requires at least one command")
+    stages = []
+    for cmd in cmds:
+        args = _validate_popen_args_platform((cmd,), env)
+        if popen_has_pipe_character(args):
+            _emsg = (
+                f"pipe stage has a pipe character; give each stage separately: {args}"
+            )
+            raise ValueError(_emsg)
+        stages.append(args)
+    return stages
+
+
+def _pipe_gen(
+    stages: list[list[str]],
+    *,
+    input: bytes | None,
+    env: dict[str, str] | None,
+    cwd: FsPath | None,
+    timeout: float | None,
+    stream: bool,
+    dones: list[Done],
+) -> Iterator[bytes]:
+    """Run a pipeline of processes connected by OS pipes (no shell)
+
+    Yields the last stage's stdout chunks if `stream` (otherwise it is
+    captured) and appends a Done per stage to `dones` once all the stages
+    have exited.
+    """
+    deadline = None if timeout is None else monotonic() + timeout
+    nstages = len(stages)
+    stderr_bufs = [bytearray() for _ in stages]
+    stdout_buf = bytearray()
+    tis: list[float] = []
+    tfs: list[float | None] = [None] * nstages
+    with ExitStack() as stack:
+        procs: list[Popen[bytes]] = []
+        try:
+            for args in stages:
+                tis.append(time())
+                prev_stdout = procs[-1].stdout if procs else None
+                procs.append(
+                    stack.enter_context(
+                        Popen(
+                            args,
+                            stdin=prev_stdout or (PIPE if input is not None else None),
+                            stdout=PIPE,
+                            stderr=PIPE,
+                            env=env,
+                            cwd=cwd,
+                        )
+                    )
+                )
+                if prev_stdout is not None:
+                    # the parent's copy must be closed so the upstream stage
+                    # gets SIGPIPE/EOF if the downstream one exits early
+                    prev_stdout.close()
+            if input is not None and procs[0].stdin:
+                if input:
+                    Thread(
+                        target=_write_stdin, args=(procs[0].stdin, input), daemon=True
+                    ).start()
+                else:
+                    # empty input: EOF right away (like `subprocess.run`)
+                    procs[0].stdin.close()
+            last = procs[-1]
+            pipes: dict[int, tuple[int, Stdio]] = {
+                proc.stderr.fileno(): (ix, Stdio.stderr)
+                for ix, proc in enumerate(procs)
+                if proc.stderr is not None
+            }
+            if last.stdout is not None:
+                pipes[last.stdout.fileno()] = (nstages - 1, Stdio.stdout)
+            nopen = [0] * nstages
+            for ix, _ in pipes.values():
+                nopen[ix] += 1
+            for (ix, stdio), data in _read_chunks(pipes, deadline):
+                if data:
+                    if stdio == Stdio.stderr:
+                        stderr_bufs[ix] += data
+                    elif stream:
+                        yield data
+                    else:
+                        stdout_buf += data
+                    continue
+                nopen[ix] -= 1
+                if not nopen[ix] and procs[ix].poll() is not None:
+                    tfs[ix] = time()
+            for ix, proc in enumerate(procs):
+                if tfs[ix] is None:
+                    proc.wait(timeout=_remaining(deadline))
+                    tfs[ix] = time()
+        except (TimeoutError, TimeoutExpired):
+            for proc in procs:
+                proc.kill()
+            raise TimeoutExpired(
+                " | ".join(" ".join(args) for args in stages), timeout or 0.0
+            ) from None
+        except BaseException:
+            for proc in procs:
+                proc.kill()
+            raise
+    for ix, (args, proc) in enumerate(zip(stages, procs, strict=True)):
+        ti, tf = tis[ix], tfs[ix] or time()
+        dones.append(
+            Done(
+                args=args,
+                returncode=proc.returncode,
+                stdout=bytes(stdout_buf) if ix == nstages - 1 else b"",
+                stderr=bytes(stderr_bufs[ix]),
+                ti=ti,
+                tf=tf,
+                dt=tf - ti,
+                hrdt=HrTime.from_seconds(tf - ti),
+                stdin=input.decode() if input is not None and ix == 0 else None,
+                dryrun=False,
+            )
+        )
+
+
+def _pipe_check(
+    dones: list[Done], ok_code: int | list[int] | tuple[int, ...] | set[int]
+) -> None:
+    for done in dones[:-1]:
+        # upstream stages killed by SIGPIPE (e.g. `yes | head`) are expected
+        if _SIGPIPE is None or done.returncode != -_SIGPIPE:
+            done.check(ok_code=ok_code)
+    dones[-1].check(ok_code=ok_code)
+
+
+def _pipe_input(input: STDIN) -> bytes | None:
+    if isinstance(input, str):
+        # "" is empty input (an immediately closed stdin) like b""
+        return input.encode()
+    _input = validate_stdin(input)
+    return _input.encode() if isinstance(_input, str) else _input
+
+
+def pipe(
+    *cmds: PopenArgs,
+    env: dict[str, str] | None = None,
+    extenv: bool = True,
+    cwd: FsPath | None = None,
+    input: STDIN = None,
+    timeout: float | None = None,
+    check: bool = False,
+    ok_code: int | list[int] | tuple[int, ...] | set[int] = 0,
+) -> list[Done]:
+    r"""Run a pipeline of commands connected by OS pipes w/o a shell
+
+    `sh.pipe(["find", "."], ["grep", "py"], ["sort"])` is the shell-free
+    equivalent of `sh.do("find . | grep py | sort", shell=True)`: each
+    stage is a Popen process whose stdin is the previous stage's stdout,
+    so there is no `/bin/sh` to spawn and no quoting to get right. The last
+    stage's stdout and every stage's stderr are captured.
+
+    Args:
+        *cmds: Commands (args lists or strings to split) for the stages
+        env: Environment variables as a dictionary (Default value = None)
+        extenv: Extend the environment with the current environment (Default value = True)
+        cwd: Current working directory (Default value = None)
+        input: Stdin to give to the first stage
+        timeout: Timeout in seconds for the whole pipeline if not None
+        check: Check the stages' return codes
+        ok_code: Return code(s) to check against; upstream stages killed by
+            SIGPIPE (because a downstream stage exited early) are OK
+
+    Returns:
+        list[Done]: a Done per stage (w/ its timings); the last Done has the
+            pipeline's stdout
+
+    Raises:
+        ValueError: If no commands are given or a stage has a pipe character
+        TimeoutExpired: If the pipeline does not finish within timeout
+        DoneError: If check/ok_code and a stage's return code is not ok
+
+    Examples:
+        >>> dones = pipe(["echo", "b\na\nc"], ["sort"], ["head", "-n", "2"])
+        >>> dones[-1].stdout
+        'a\nb\n'
+        >>> [done.returncode for done in dones]
+        [0, 0, 0]
+
+    """
+    _env = None if env is None else _mkenv(env, extenv=extenv)
+    stages = _pipe_stages(cmds, env)
+    dones: list[Done] = []
+    for _ in _pipe_gen(
+        stages,
+        input=_pipe_input(input),
+        env=_env,
+        cwd=cwd,
+        timeout=timeout,
+        stream=False,
+        dones=dones,
+    ):
+        ...
+    if check or ok_code != 0:
+        _pipe_check(dones, ok_code)
+    return dones
+
+
+def pipe_gen(
+    *cmds: PopenArgs,
+    env: dict[str, str] | None = None,
+    extenv: bool = True,
+    cwd: FsPath | None = None,
+    input: STDIN = None,
+    timeout: float | None = None,
+    lines: bool = True,
+    check: bool = False,
+    ok_code: int | list[int] | tuple[int, ...] | set[int] = 0,
+    dones: list[Done] | None = None,
+) -> Iterator[str]:
+    r"""Run a shell-free pipeline streaming the last stage's stdout
+
+    Like [pipe][shellfish.sh.pipe], but the last stage's stdout is yielded
+    as it is produced (decoded; by line or by chunk) instead of captured.
+    Closing the generator early kills the pipeline.
+
+    Args:
+        *cmds: Commands (args lists or strings to split) for the stages
+        env: Environment variables as a dictionary (Default value = None)
+        extenv: Extend the environment with the current environment (Default value = True)
+        cwd: Current working directory (Default value = None)
+        input: Stdin to give to the first stage
+        timeout: Timeout in seconds for the whole pipeline if not None
+        lines: Yield whole lines if True; otherwise chunks as they are read
+        check: Check the stages' return codes (after the output is consumed)
+        ok_code: Return code(s) to check against
+        dones: List to append a Done per stage to once the pipeline exits
+
+    Yields:
+        str: stdout lines/chunks of the last stage
+
+    Examples:
+        >>> dones = []
+        >>> list(pipe_gen(["echo", "b\na"], ["sort"], dones=dones))
+        ['a\n', 'b\n']
+        >>> len(dones)
+        2
+
+    """
+    _env = None if env is None else _mkenv(env, extenv=extenv)
+    stages = _pipe_stages(cmds, env)
+    _dones: list[Done] = [] if dones is None else dones
+    decoder = _PipeDecoder(lines=lines, encoding="utf-8")
+    for chunk in _pipe_gen(
+        stages,
+        input=_pipe_input(input),
+        env=_env,
+        cwd=cwd,
+        timeout=timeout,
+        stream=True,
+        dones=_dones,
+    ):
+        yield from decoder.feed(chunk)
+    yield from decoder.feed(b"", final=True)
+    if check or ok_code != 0:
+        _pipe_check(_dones, ok_code)
+
+
 _run_async = asyncify(run)
 _do_asyncify = asyncify(do)
 
@@ -936,6 +1599,7 @@ async def _do_async(
     timeout: float | int | None = None,
     ok_code: int | list[int] | tuple[int, ...] | set[int] = 0,
     dryrun: bool = False,
+    rusage: bool = False,
 ) -> Done:
     """Run a subprocess and await completion
 
@@ -952,6 +1616,8 @@ async def _do_async(
         timeout: Timeout in seconds for the process if not None
         ok_code: Return code(s) to check if ok
         dryrun: Don't run the subprocess
+        rusage: Collect the process' resource usage (`Done.rusage`); the
+            process is then run on a worker thread
 
     Returns:
         Finished PRun object which is a dictionary, so a dictionary
@@ -975,7 +1641,7 @@ async def _do_async(
     # input is None or bytes
     _input = input if not isinstance(input, str) else input.encode()
 
-    _env = None if env is None else mkenv(env, extenv=extenv)
+    _env = None if env is None else _mkenv(env, extenv=extenv)
     _cwd = pwd()
     if cwd and path.exists(cwd) and path.isdir(cwd):
         _cwd = cwd
@@ -1006,6 +1672,32 @@ async def _do_async(
             dryrun=True,
             async_proc=True,
         )
+    if rusage:
+        # asyncio's child watcher reaps processes w/ waitpid (no rusage), so
+        # run it on a worker thread where it is reaped w/ os.wait4
+        done = await asyncio.to_thread(
+            _do,
+            _args,
+            env=env,
+            extenv=extenv,
+            cwd=_cwd,
+            shell=shell,
+            verbose=verbose,
+            input=_input,
+            timeout=timeout,
+            rusage=True,
+            hook_source="do_async",
+        )
+        done.async_proc = True
+        _ok_codes = {ok_code} if isinstance(ok_code, int) else set(ok_code)
+        if done.returncode and done.returncode not in _ok_codes:
+            raise CalledProcessError(
+                returncode=done.returncode,
+                output=done.stdout_output.raw,
+                stderr=done.stderr_output.raw,
+                cmd=str(_args),
+            )
+        return done
     _proc, _pdt = await __run_async.run_dtee_async(
         *_args,
         env=_env,
@@ -1017,6 +1709,7 @@ async def _do_async(
         timeout=timeout,
         input=_input,
         universal_newlines=True,
+        launch=_hooks.launch(_args, "do_async"),
     )
     _args_array = (
         list(map(str, args)) if isinstance(args, list | tuple) else [str(args)]
@@ -1024,8 +1717,8 @@ async def _do_async(
     return Done(
         args=_args_array,
         returncode=_proc.returncode,
-        stdout=decode_stdio_bytes(_proc.stdout),
-        stderr=decode_stdio_bytes(_proc.stderr),
+        stdout=_proc.stdout,
+        stderr=_proc.stderr,
         stdin=input.decode(encoding="utf-8") if isinstance(input, bytes) else None,
         ti=_pdt.ti,
         tf=_pdt.tf,
@@ -1052,6 +1745,7 @@ async def do_async(
     timeout: float | None = None,
     ok_code: int | list[int] | tuple[int, ...] | set[int] = 0,
     dryrun: bool = False,
+    rusage: bool = False,
 ) -> Done:
     """Run a subprocess and await its completion
 
@@ -1069,6 +1763,8 @@ async def do_async(
         timeout: Timeout in seconds for the process if not None
         ok_code: Return code(s) that are considered OK (Default value = 0)
         dryrun (bool): Flag to not run the subprocess but return a Done object
+        rusage: Collect the process' CPU time, peak RSS and block I/O as
+            `Done.rusage`
 
     Returns:
         Finished PRun object which is a dictionary, so a dictionary
@@ -1092,6 +1788,294 @@ async def do_async(
         timeout=timeout,
         ok_code=ok_code,
         dryrun=dryrun,
+        rusage=rusage,
+    )
+
+
+async def _do_many_gen_async(
+    cmds: Iterable[PopenArgs],
+    *,
+    concurrency: int,
+    fail_fast: bool,
+    errors: dict[int, BaseException],
+    **kwargs: Any,
+) -> AsyncGenerator[tuple[int, Done], None]:
+    """Run commands w/ at most `concurrency` running; yield (index, Done)s
+
+    Commands are only started (and their coroutines created) as slots free
+    up. Errors are raised right away if fail_fast; otherwise they are put
+    in `errors` (keyed by command index).
+    """
+    if concurrency < 1:
+        _emsg = f"concurrency must be >= 1; got {concurrency}"
+        raise ValueError(_emsg)
+    _cmds = enumerate(cmds)
+    running: dict[asyncio.Task[Done], int] = {}
+
+    def _start_next() -> bool:
+        for ix, cmd in _cmds:
+            task = asyncio.ensure_future(do_async(cmd, **kwargs))
+            running[task] = ix
+            return True
+        return False
+
+    try:
+        while len(running) < concurrency and _start_next():
+            ...
+        while running:
+            finished, _ = await asyncio.wait(
+                running, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in finished:
+                ix = running.pop(task)
+                _start_next()
+                try:
+                    done = task.result()
+                except Exception as e:
+                    if fail_fast:
+                        raise
+                    errors[ix] = e
+                    continue
+                yield ix, done
+    finally:
+        for task in running:
+            task.cancel()
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
+
+
+async def do_many_gen_async(
+    cmds: Iterable[PopenArgs],
+    *,
+    concurrency: int = 8,
+    timeout: float | None = None,
+    fail_fast: bool = False,
+    ok_code: int | list[int] | tuple[int, ...] | set[int] = 0,
+    env: dict[str, str] | None = None,
+    extenv: bool = True,
+    cwd: str | None = None,
+    shell: bool = False,
+    input: STDIN = None,
+) -> AsyncGenerator[Done, None]:
+    """Run many commands w/ bounded concurrency; yield Dones as they finish
+
+    At most `concurrency` processes are running at once (bounding file
+    descriptors/pids) and commands are only started as slots free up.
+
+    Args:
+        cmds: Commands (args) to run
+        concurrency: Max number of commands running at once
+        timeout: Timeout in seconds for each command if not None
+        fail_fast: Raise on the first error (killing the running commands);
+            otherwise run everything and raise an ExceptionGroup of the
+            errors at the end
+        ok_code: Return code(s) that are considered OK; like `do_async`,
+            commands exiting w/ other codes raise CalledProcessError
+        env: Environment variables as a dictionary (Default value = None)
+        extenv: Extend environment with the current environment (Default value = True)
+        cwd: Current working directory (Default value = None)
+        shell: Run in shell or sub-shell
+        input: Stdin to give to each subprocess
+
+    Yields:
+        Done objects in the order the commands finish
+
+    Raises:
+        CalledProcessError: If fail_fast and a command exits w/ a not-ok
+            returncode
+        TimeoutExpired: If fail_fast and a command times out
+        ExceptionGroup: If not fail_fast and any command errored
+        ValueError: If concurrency is less than 1
+
+    """
+    errors: dict[int, BaseException] = {}
+    async for _, done in _do_many_gen_async(
+        cmds,
+        concurrency=concurrency,
+        fail_fast=fail_fast,
+        errors=errors,
+        ok_code=ok_code,
+        timeout=timeout,
+        env=env,
+        extenv=extenv,
+        cwd=cwd,
+        shell=shell,
+        input=input,
+    ):
+        yield done
+    if errors:
+        _emsg = f"{len(errors)} command(s) failed"
+        raise ExceptionGroup(_emsg, [errors[ix] for ix in sorted(errors)])  # type: ignore[type-var]
+
+
+async def do_many_async(
+    cmds: Iterable[PopenArgs],
+    *,
+    concurrency: int = 8,
+    timeout: float | None = None,
+    fail_fast: bool = False,
+    ok_code: int | list[int] | tuple[int, ...] | set[int] = 0,
+    env: dict[str, str] | None = None,
+    extenv: bool = True,
+    cwd: str | None = None,
+    shell: bool = False,
+    input: STDIN = None,
+) -> DoManyResult:
+    """Run many commands w/ bounded concurrency and collect the results
+
+    See [do_many_gen_async][shellfish.sh.do_many_gen_async]; errors are
+    collected in the result instead of raised (unless fail_fast).
+
+    Args:
+        cmds: Commands (args) to run
+        concurrency: Max number of commands running at once
+        timeout: Timeout in seconds for each command if not None
+        fail_fast: Raise on the first error (killing the running commands)
+        ok_code: Return code(s) that are considered OK; commands exiting w/
+            other codes error w/ CalledProcessError
+        env: Environment variables as a dictionary (Default value = None)
+        extenv: Extend environment with the current environment (Default value = True)
+        cwd: Current working directory (Default value = None)
+        shell: Run in shell or sub-shell
+        input: Stdin to give to each subprocess
+
+    Returns:
+        DoManyResult: Dones (in command order), errors and aggregate timing
+
+    """
+    _cmds = list(cmds)
+    result = DoManyResult(dones=[None] * len(_cmds), ti=time())
+    async for ix, done in _do_many_gen_async(
+        _cmds,
+        concurrency=concurrency,
+        fail_fast=fail_fast,
+        errors=result.errors,
+        ok_code=ok_code,
+        timeout=timeout,
+        env=env,
+        extenv=extenv,
+        cwd=cwd,
+        shell=shell,
+        input=input,
+    ):
+        result.dones[ix] = done
+    result.tf = time()
+    return result
+
+
+def do_many_gen(
+    cmds: Iterable[PopenArgs],
+    *,
+    concurrency: int = 8,
+    timeout: float | None = None,
+    fail_fast: bool = False,
+    ok_code: int | list[int] | tuple[int, ...] | set[int] = 0,
+    env: dict[str, str] | None = None,
+    extenv: bool = True,
+    cwd: str | None = None,
+    shell: bool = False,
+    input: STDIN = None,
+) -> Iterator[Done]:
+    """Run many commands w/ bounded concurrency; yield Dones as they finish
+
+    Sync version of [do_many_gen_async][shellfish.sh.do_many_gen_async]
+    (runs its own event loop; cannot be used from a running event loop).
+
+    Args:
+        cmds: Commands (args) to run
+        concurrency: Max number of commands running at once
+        timeout: Timeout in seconds for each command if not None
+        fail_fast: Raise on the first error (killing the running commands)
+        ok_code: Return code(s) that are considered OK; commands exiting w/
+            other codes error w/ CalledProcessError
+        env: Environment variables as a dictionary (Default value = None)
+        extenv: Extend environment with the current environment (Default value = True)
+        cwd: Current working directory (Default value = None)
+        shell: Run in shell or sub-shell
+        input: Stdin to give to each subprocess
+
+    Yields:
+        Done objects in the order the commands finish
+
+    """
+    agen = do_many_gen_async(
+        cmds,
+        concurrency=concurrency,
+        timeout=timeout,
+        fail_fast=fail_fast,
+        ok_code=ok_code,
+        env=env,
+        extenv=extenv,
+        cwd=cwd,
+        shell=shell,
+        input=input,
+    )
+    loop = asyncio.new_event_loop()
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(anext(agen))
+            except StopAsyncIteration:
+                return
+    finally:
+        loop.run_until_complete(agen.aclose())
+        loop.close()
+
+
+def do_many(
+    cmds: Iterable[PopenArgs],
+    *,
+    concurrency: int = 8,
+    timeout: float | None = None,
+    fail_fast: bool = False,
+    ok_code: int | list[int] | tuple[int, ...] | set[int] = 0,
+    env: dict[str, str] | None = None,
+    extenv: bool = True,
+    cwd: str | None = None,
+    shell: bool = False,
+    input: STDIN = None,
+) -> DoManyResult:
+    r"""Run many commands w/ bounded concurrency and collect the results
+
+    Sync version of [do_many_async][shellfish.sh.do_many_async].
+
+    Args:
+        cmds: Commands (args) to run
+        concurrency: Max number of commands running at once
+        timeout: Timeout in seconds for each command if not None
+        fail_fast: Raise on the first error (killing the running commands)
+        ok_code: Return code(s) that are considered OK; commands exiting w/
+            other codes error w/ CalledProcessError
+        env: Environment variables as a dictionary (Default value = None)
+        extenv: Extend environment with the current environment (Default value = True)
+        cwd: Current working directory (Default value = None)
+        shell: Run in shell or sub-shell
+        input: Stdin to give to each subprocess
+
+    Returns:
+        DoManyResult: Dones (in command order), errors and aggregate timing
+
+    Examples:
+        >>> result = do_many([["echo", str(i)] for i in range(4)], concurrency=2)
+        >>> [done.stdout for done in result.dones]
+        ['0\n', '1\n', '2\n', '3\n']
+        >>> result.errors
+        {}
+
+    """
+    return asyncio.run(
+        do_many_async(
+            cmds,
+            concurrency=concurrency,
+            timeout=timeout,
+            fail_fast=fail_fast,
+            ok_code=ok_code,
+            env=env,
+            extenv=extenv,
+            cwd=cwd,
+            shell=shell,
+            input=input,
+        )
     )
 
 
@@ -1308,7 +2292,10 @@ class LIN(_LIN):
             src, dest, delete=delete, exclude=exclude, include=include, dry_run=dry_run
         )
 
-        return do(args=list(filter(None, rsync_args)))
+        return _do(
+            args=_validate_popen_args_platform((list(filter(None, rsync_args)),)),
+            hook_source="rsync",
+        )
 
     @staticmethod
     def sync(
@@ -1600,6 +2587,7 @@ def export(key: str, val: str | None = None) -> tuple[str, str]:
     """
     if val:
         environ[key] = val
+        invalidate_env_cache()
         return (key, val)
     if "=" in key:
         _key = key.split("=")[0]
@@ -1693,10 +2681,107 @@ def where(cmd: str, path: str | None = None) -> str | None:
     return which(cmd, path=path)
 
 
-@lru_cache(maxsize=128)
+def _stat_sig(fspath: str) -> tuple[int, int, int] | None:
+    try:
+        st = _stat(fspath)
+    except OSError:
+        return None
+    return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+class WhichCache:
+    """`shutil.which` results cached by (cmd, PATH) & validated on lookup
+
+    A cached result is reused as long as the resolved file is unchanged
+    (same inode, size and mtime) and no PATH directory searched before it
+    changed (a directory's mtime changes when entries are added/removed),
+    so new, removed and replaced executables are picked up while a hit
+    costs a few `stat` calls instead of a full PATH search. Misses are
+    cached too and validated against all the PATH directories' mtimes.
+    Lookups w/ relative PATH entries are not cached.
+
+    Examples:
+        >>> cache = WhichCache()
+        >>> cache.which("python") == which("python")
+        True
+        >>> len(cache) == (which("python") is not None)
+        True
+
+    """
+
+    __slots__ = ("_entries", "maxsize")
+
+    def __init__(self, maxsize: int = 512) -> None:
+        self.maxsize = maxsize
+        self._entries: dict[
+            tuple[str, str, str | None],
+            tuple[str | None, tuple[tuple[str, tuple[int, int, int] | None], ...]],
+        ] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    @staticmethod
+    def _stamps(
+        cmd: str, dirs: list[str], resolved: str | None
+    ) -> tuple[tuple[str, tuple[int, int, int] | None], ...] | None:
+        """Return the (path, stat signature) pairs that validate an entry"""
+        if path.dirname(cmd):
+            # w/ a directory component PATH is not searched
+            dirs = []
+        elif not all(path.isabs(dirpath) for dirpath in dirs):
+            return None
+        if resolved is not None:
+            if not path.isabs(resolved):
+                return None
+            found_dir = path.normcase(path.dirname(resolved))
+            for ix, dirpath in enumerate(dirs):
+                if path.normcase(dirpath.rstrip("/\\") or dirpath) == found_dir:
+                    dirs = dirs[: ix + 1]
+                    break
+            dirs = [*dirs, resolved]
+        return tuple((fspath, _stat_sig(fspath)) for fspath in dirs)
+
+    def which(self, cmd: str, path: str | None = None) -> str | None:
+        """Return the path to cmd (like `shutil.which`) from the cache if valid
+
+        Args:
+            cmd: Command/exe to find path of
+            path: System path to use (default: `os.environ["PATH"]`)
+
+        Returns:
+            Path to the command/exe, or None if not found
+
+        """
+        _path = environ.get("PATH", _defpath) if path is None else path
+        key = (cmd, _path, getcwd() if IS_WIN else None)
+        entry = self._entries.get(key)
+        if entry is not None and all(
+            _stat_sig(fspath) == sig for fspath, sig in entry[1]
+        ):
+            return entry[0]
+        resolved = _which(cmd, path=_path)
+        stamps = self._stamps(cmd, _path.split(_pathsep) if _path else [], resolved)
+        if stamps is not None:
+            self._entries.pop(key, None)
+            if len(self._entries) >= self.maxsize:
+                del self._entries[next(iter(self._entries))]
+            self._entries[key] = (resolved, stamps)
+        return resolved
+
+
+_WHICH_CACHE = WhichCache()
+
+
 def which_lru(cmd: str, path: str | None = None) -> str | None:
     """Return the result of `shutil.which` and cache the results
 
+    Results are cached by (cmd, PATH) in a [WhichCache][shellfish.sh.WhichCache],
+    which notices PATH changes and added/removed/replaced executables.
+
     Args:
         cmd (str): Command/exe to find path of
         path (str): System path to use
@@ -1705,15 +2790,93 @@ def which_lru(cmd: str, path: str | None = None) -> str | None:
         Path to the command/exe, or None if not found
 
     """
-    return which(cmd, path=path)
+    return _WHICH_CACHE.which(cmd, path=path)
 
 
-def tree(dirpath: FsPath, filterfn: Callable[[str], bool] | None = None) -> str:
+def tree_gen(
+    dirpath: FsPath,
+    filterfn: Callable[[str], bool] | None = None,
+    *,
+    max_depth: int | None = None,
+    max_entries: int | None = None,
+    sizes: bool = False,
+    follow_symlinks: bool = False,
+) -> Iterator[str]:
+    """Yield the lines of a directory tree as directories are scanned
+
+    Directories are listed w/ `os.scandir` (entry types come from the
+    cached d_type; only symlinks are stat-ed) one at a time, so the first
+    lines are yielded right away and memory use does not grow w/ the size
+    of the tree.
+
+    Args:
+        dirpath: Directory to make the tree for
+        filterfn: Function called w/ each path-string; entries for which it
+            returns False are left out (default: leave out `.pyc` files and
+            `__pycache__` dirs)
+        max_depth: Max depth to descend (1 shows only the entries of
+            dirpath); None for no limit
+        max_entries: Max entries to show per directory; the rest are
+            summarized by a '... N more' line
+        sizes: Prefix entries w/ their size; directories w/ the total size
+            of the (filtered) files beneath them (requires scanning the
+            whole tree before the first line is yielded)
+        follow_symlinks: Descend into symlinked directories
+
+    Returns:
+        Iterator[str]: Directory-tree lines
+
+    Examples:
+        >>> from shellfish import fs
+        >>> for dirname in ("a", "b", "c"):
+        ...     fs.mkdirp(path.join("tree-gen.doctest", dirname))
+        ...     _ = fs.write_str(path.join("tree-gen.doctest", dirname, "f.txt"), "12")
+        >>> for line in tree_gen("tree-gen.doctest", max_depth=1, max_entries=2):
+        ...     print(line)
+        tree-gen.doctest/
+        ├── a/
+        ├── b/
+        └── ... 1 more
+        >>> for line in tree_gen("tree-gen.doctest", max_entries=1, sizes=True):
+        ...     print(line)
+        [6]  tree-gen.doctest/
+        ├── [2]  a/
+        │   └── [2]  f.txt
+        └── ... 2 more
+        >>> fs.rm("tree-gen.doctest", recursive=True)
+
+    """
+    return _tree_lines(
+        _fspath(dirpath),
+        filterfn=filterfn,
+        max_depth=max_depth,
+        max_entries=max_entries,
+        sizes=sizes,
+        follow_symlinks=follow_symlinks,
+    )
+
+
+def tree(
+    dirpath: FsPath,
+    filterfn: Callable[[str], bool] | None = None,
+    *,
+    max_depth: int | None = None,
+    max_entries: int | None = None,
+    sizes: bool = False,
+    follow_symlinks: bool = False,
+) -> str:
     """Create a directory tree string given a directory path
 
+    Joins the lines of [tree_gen][shellfish.sh.tree_gen]; use `tree_gen` to
+    print huge trees as they are scanned.
+
     Args:
         dirpath (FsPath): Directory string to make tree for
         filterfn: Function to filter sub-directories and sub-files with
+        max_depth: Max depth to descend; None for no limit
+        max_entries: Max entries to show per directory
+        sizes: Show file sizes and directory size totals
+        follow_symlinks: Descend into symlinked directories
 
     Returns:
         str: Directory-tree string
@@ -1755,7 +2918,7 @@ def tree(dirpath: FsPath, filterfn: Callable[[str], bool] | None = None) -> str:
             ├── file1.txt
             ├── file2.txt
             └── file3.txt
-        >>> print(tree(tmpdir, lambda s: _DirTree._default_filter(s) and not "file2" in s))
+        >>> print(tree(tmpdir, lambda s: "file2" not in s))
         tree.doctest/
         └── dir/
             ├── dir2/
@@ -1771,7 +2934,14 @@ def tree(dirpath: FsPath, filterfn: Callable[[str], bool] | None = None) -> str:
 
     """
     return "\n".join(
-        p.displayable() for p in _DirTree.make_tree(Path(dirpath), filterfn=filterfn)
+        tree_gen(
+            dirpath,
+            filterfn,
+            max_depth=max_depth,
+            max_entries=max_entries,
+            sizes=sizes,
+            follow_symlinks=follow_symlinks,
+        )
     )
 
 
@@ -1874,6 +3044,7 @@ def rm(
     r: bool = False,
     v: bool = False,
     dryrun: bool = False,
+    workers: int | None = None,
 ) -> None:
     """Remove files & directories in the style of the shell
 
@@ -1886,6 +3057,8 @@ def rm(
         v (bool): alias for verbose
         r (bool): alias for recursive kwarg
         dryrun (bool): Flag to not actually remove anything
+        workers (int | None): Remove directories concurrently (`fs.rm_tree`)
+            using this many worker threads if given
 
     Raises:
         ValueError: If recursive and r are `False` and fspath is a directory
@@ -1898,6 +3071,7 @@ def rm(
         force=force or f,
         recursive=recursive or r,
         dryrun=dryrun,
+        workers=workers,
     )
 
 
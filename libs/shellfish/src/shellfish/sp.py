@@ -3,6 +3,7 @@
 
 from __future__ import annotations
 
+import os
 import sys
 
 from dataclasses import dataclass
@@ -21,6 +22,7 @@ from typing import (
     IO,
     TYPE_CHECKING,
     Any,
+    AnyStr,
     TypedDict,
 )
 
@@ -38,6 +40,7 @@ if TYPE_CHECKING:
         STDIN,
         FsPath,
     )
+    from shellfish.hooks import Launch
 
 __subprocess_all__ = (
     "CompletedProcess",
@@ -54,6 +57,7 @@ __all__ = (
     "CompletedProcessDict",
     "Popen",
     "ProcessDt",
+    "RusagePopen",
     "completed_process_dict",
     "pcheck",
     "run",
@@ -64,6 +68,33 @@ __all__ = (
 )
 
 
+_HAS_WAIT4 = hasattr(os, "wait4")
+
+
+class RusagePopen(Popen[AnyStr]):
+    """Popen that records the child's resource usage when it is reaped
+
+    `wait()`/`communicate()` (and so `with RusagePopen(...)`) reap the child
+    w/ `os.wait4` instead of `os.waitpid`, keeping its `resource.struct_rusage`
+    as `rusage`. It stays None on platforms w/o `wait4` (windows) or if the
+    child was reaped by `poll()`.
+    """
+
+    rusage: Any = None
+
+    if _HAS_WAIT4:
+
+        def _try_wait(self, wait_flags: int) -> tuple[int, int]:
+            try:
+                pid, sts, rusage = os.wait4(self.pid, wait_flags)
+            except ChildProcessError:
+                # SIGCHLD ignored/waiting disabled; same as Popen._try_wait
+                return (self.pid, 0)
+            if pid == self.pid:
+                self.rusage = rusage
+            return (pid, sts)
+
+
 @dataclass(frozen=True)
 class ProcessDt:
     """Process time delta dataclass
@@ -328,7 +359,8 @@ def run_dtee(
     """Run a command, tee-ing stdout/stderr, and time it
 
     Streams the process' stdout/stderr to this process' stdout/stderr as they
-    arrive, while also capturing them.
+    arrive, while also capturing them; the pipes are multiplexed (w/o
+    polling) by [popen_pipes_gen][shellfish.dev.popen_gen.popen_pipes_gen].
 
     Args:
         args: Command args to run
@@ -346,10 +378,28 @@ def run_dtee(
         TimeoutExpired: If the process does not finish within `timeout`
 
     """
+    completed, pdt, _proc = _run_dtee(
+        args, cwd=cwd, env=env, input=input, shell=shell, timeout=timeout
+    )
+    return completed, pdt
+
+
+def _run_dtee(
+    args: PopenArgs,
+    *,
+    cwd: FsPath | None,
+    env: dict[str, str] | None,
+    input: STDIN | None,
+    shell: bool,
+    timeout: float | None,
+    popen_cls: type[Popen[bytes]] = Popen,
+    launch: Launch | None = None,
+) -> tuple[CompletedProcess[bytes], ProcessDt, Popen[bytes]]:
+    """run_dtee implementation; also returns the (finished) Popen object"""
     stdout_bio = BytesIO()
     stderr_bio = BytesIO()
     args_str = args2cmd(args)
-    with Popen(
+    with popen_cls(
         args=args if is_win() or not shell else args_str,
         stdout=PIPE,
         stderr=PIPE,
@@ -357,31 +407,36 @@ def run_dtee(
         env=env,
         cwd=str(cwd) if cwd else None,
         shell=shell,
-        text=True,
-        universal_newlines=True,
     ) as proc:
+        if launch is not None:
+            launch.spawned(proc.pid)
         try:
             if input is not None and proc.stdin:
-                proc.stdin.write(input if isinstance(input, str) else input.decode())
+                proc.stdin.write(input if isinstance(input, bytes) else input.encode())
                 proc.stdin.flush()
                 proc.stdin.close()
             ti = time()
-            for io_type, line in popen_pipes_gen(proc, timeout=timeout):
-                line_bytes = line if isinstance(line, bytes) else line.encode()
+            # chunks (not lines) are tee-d as they arrive so partial lines
+            # (prompts, progress bars) show up immediately
+            for io_type, chunk in popen_pipes_gen(proc, timeout=timeout, lines=False):
+                if launch is not None:
+                    launch.output()
                 if io_type == 1:  # stdout is 1
-                    sys.stdout.buffer.write(line_bytes)
+                    sys.stdout.buffer.write(chunk)
                     sys.stdout.flush()
-                    stdout_bio.write(line_bytes)
+                    stdout_bio.write(chunk)
                 elif io_type == 2:  # stderr is 2
-                    sys.stderr.buffer.write(line_bytes)
+                    sys.stderr.buffer.write(chunk)
                     sys.stderr.flush()
-                    stderr_bio.write(line_bytes)
+                    stderr_bio.write(chunk)
             tf = time()
             stdout_bin = stdout_bio.getvalue()
             stderr_bin = stderr_bio.getvalue()
         except TimeoutExpired as e:
             tf = time()
             proc.kill()
+            if launch is not None:
+                launch.timed_out()
             raise e
         except KeyboardInterrupt as e:
             tf = time()
@@ -392,6 +447,8 @@ def run_dtee(
             proc.kill()
             raise e
 
+    if launch is not None:
+        launch.exited(proc.returncode)
     return (
         CompletedProcess(
             args=args,
@@ -404,6 +461,7 @@ def run_dtee(
             tf=tf,
             dt=tf - ti,
         ),
+        proc,
     )
 
 
@@ -1,14 +1,19 @@
 from __future__ import annotations
 
+import asyncio
+import os
+import threading
+
 from os import stat_result as os_stat_result
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 import pytest
 
-from shellfish import sh
+from shellfish import aios, sh
 from shellfish.aios import scandir as aioscandir
 
 if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
     from pathlib import Path
 
 
@@ -48,3 +53,121 @@ async def test_scandir_async(tmp_path: Path) -> None:
         # Check that the path is the same as the path returned by
         # the __fspath__() method
         assert entry.path == entry.__fspath__()
+
+
+@pytest.mark.asyncio
+async def test_scandir_batches_prefetched(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    for ix in range(10):
+        (tmp_path / f"file{ix}.txt").write_text(str(ix))
+    (tmp_path / "dir").mkdir()
+    batches = [
+        batch
+        async for batch in aios.scandir_batches(str(tmp_path), batchsize=4, stat=True)
+    ]
+    assert [len(batch) for batch in batches] == [4, 4, 3]
+
+    def _no_hop(*args: object, **kwargs: object) -> None:
+        raise AssertionError("prefetched entry hopped to the executor")
+
+    monkeypatch.setattr(aios, "asyncify", _no_hop)
+    entries = {entry.name: entry for batch in batches for entry in batch}
+    assert await entries["dir"].is_dir()
+    assert not await entries["dir"].is_file()
+    assert await entries["file3.txt"].is_file()
+    assert not await entries["file3.txt"].is_symlink()
+    assert (await entries["file3.txt"].stat()).st_size == 1
+    assert await entries["file3.txt"].inode() > 0
+
+
+@pytest.mark.asyncio
+async def test_scandir_reads_in_worker_thread(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    for ix in range(3):
+        (tmp_path / f"file{ix}.txt").write_text(str(ix))
+    read_threads = set()
+    scandir_batch = aios._scandir_batch
+
+    def _scandir_batch(*args: Any, **kwargs: Any) -> Any:
+        read_threads.add(threading.get_ident())
+        return scandir_batch(*args, **kwargs)
+
+    monkeypatch.setattr(aios, "_scandir_batch", _scandir_batch)
+    entries = [entry async for entry in aios.scandir(str(tmp_path), batchsize=1)]
+    assert sorted(entry.name for entry in entries) == [
+        "file0.txt",
+        "file1.txt",
+        "file2.txt",
+    ]
+    assert read_threads
+    assert threading.get_ident() not in read_threads
+    with pytest.raises(ValueError, match="batchsize"):
+        async for _ in aios.scandir_batches(str(tmp_path), batchsize=0):
+            ...
+
+
+@pytest.mark.asyncio
+async def test_scandir_recursive(tmp_path: Path) -> None:
+    for dirpath in ("a/b/c", "a/d", "e"):
+        (tmp_path / dirpath).mkdir(parents=True)
+    for fspath in ("f.txt", "a/g.txt", "a/b/c/h.txt", "a/d/i.txt"):
+        (tmp_path / fspath).write_text(fspath)
+    expected = {
+        os.path.join(dirpath, name)
+        for dirpath, dirnames, filenames in os.walk(tmp_path)
+        for name in (*dirnames, *filenames)
+    }
+    for concurrency in (1, 3):
+        paths = {
+            entry.path
+            async for entry in aios.scandir_recursive(
+                str(tmp_path), concurrency=concurrency, batchsize=2
+            )
+        }
+        assert paths == expected
+
+
+@pytest.mark.asyncio
+async def test_scandir_recursive_bounded_concurrency(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    for ix in range(8):
+        (tmp_path / f"dir{ix}" / "sub").mkdir(parents=True)
+    scanning = 0
+    max_scanning = 0
+    scandir_batches = aios.scandir_batches
+
+    async def _scandir_batches(*args: Any, **kwargs: Any) -> AsyncIterator[Any]:
+        nonlocal scanning, max_scanning
+        scanning += 1
+        max_scanning = max(max_scanning, scanning)
+        try:
+            await asyncio.sleep(0.01)
+            async for batch in scandir_batches(*args, **kwargs):
+                yield batch
+        finally:
+            scanning -= 1
+
+    monkeypatch.setattr(aios, "scandir_batches", _scandir_batches)
+    entries = [
+        entry async for entry in aios.scandir_recursive(str(tmp_path), concurrency=3)
+    ]
+    assert len(entries) == 16
+    assert max_scanning == 3
+
+
+@pytest.mark.asyncio
+async def test_scandir_recursive_follow_symlinks_loop(tmp_path: Path) -> None:
+    (tmp_path / "a").mkdir()
+    (tmp_path / "a" / "f.txt").write_text("f")
+    try:
+        (tmp_path / "a" / "loop").symlink_to(tmp_path, target_is_directory=True)
+    except OSError:
+        pytest.skip("symlinks not supported")
+    names = sorted([
+        entry.name
+        async for entry in aios.scandir_recursive(str(tmp_path), follow_symlinks=True)
+    ])
+    assert names == ["a", "f.txt", "loop"]
@@ -2,8 +2,10 @@
 from __future__ import annotations
 
 import asyncio
+import sys
 
 from os import path
+from subprocess import CalledProcessError, TimeoutExpired
 from typing import TYPE_CHECKING
 
 import pytest
@@ -134,3 +136,60 @@ async def _test_timeout_subprocess_aio_inner_shell_true(tmp_path: Path) -> None:
 @pytest.mark.timeout
 def test_timeout_subprocess_aio_sync_shell_true(tmp_path: Path) -> None:
     asyncio.run(_test_timeout_subprocess_aio_inner_shell_true(tmp_path))
+
+
+def _sleep_cmd(secs: float, *, code: int = 0) -> list[str]:
+    script = f"import sys, time; time.sleep({secs}); print({secs}); sys.exit({code})"
+    return [sys.executable, "-c", script]
+
+
+@pytest.mark.asyncio
+async def test_do_many_gen_async_streams_as_finished() -> None:
+    cmds = [_sleep_cmd(0.6), _sleep_cmd(0.1), _sleep_cmd(0.3)]
+    finished = [done.stdout.strip() async for done in sh.do_many_gen_async(cmds)]
+    assert finished == ["0.1", "0.3", "0.6"]
+
+
+@pytest.mark.asyncio
+async def test_do_many_async_bounded_concurrency() -> None:
+    result = await sh.do_many_async([_sleep_cmd(0.3)] * 4, concurrency=2)
+    assert all(done is not None and done.returncode == 0 for done in result.dones)
+    assert result.dt >= 0.55
+    assert result.dt_total >= 1.2
+
+
+@pytest.mark.asyncio
+async def test_do_many_async_collect_all_and_fail_fast() -> None:
+    cmds = [_sleep_cmd(0.1, code=3), _sleep_cmd(5), _sleep_cmd(0.1)]
+    result = await sh.do_many_async(cmds, timeout=0.5, ok_code={0, 3})
+    assert result.dones[0] is not None
+    assert result.dones[0].returncode == 3
+    assert result.dones[1] is None
+    assert isinstance(result.errors[1], TimeoutExpired)
+    assert result.dones[2] is not None
+
+    result = await sh.do_many_async(cmds, timeout=0.5)
+    assert sorted(result.errors) == [0, 1]
+    assert isinstance(result.errors[0], CalledProcessError)
+
+    with pytest.raises(CalledProcessError):
+        await sh.do_many_async(cmds, fail_fast=True)
+
+    with pytest.raises(ExceptionGroup):
+        async for _ in sh.do_many_gen_async(cmds, timeout=0.5):
+            ...
+
+
+def test_do_many_sync() -> None:
+    cmds = [_sleep_cmd(0.2), _sleep_cmd(0.1)]
+    assert [done.stdout.strip() for done in sh.do_many_gen(cmds)] == ["0.1", "0.2"]
+    result = sh.do_many(cmds)
+    assert [done.stdout.strip() for done in result.dones if done] == ["0.2", "0.1"]
+
+
+def test_do_many_string_commands() -> None:
+    result = sh.do_many(["echo hi", "echo there"])
+    assert not result.errors
+    assert [done.stdout for done in result.dones if done] == ["hi\n", "there\n"]
+    assert result.dones[0] is not None
+    assert result.dones[0].args == sh.do("echo hi").args
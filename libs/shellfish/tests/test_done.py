@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import sys
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from shellfish import sh
+from shellfish.done import Done, DoneOutput
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+_TEXTS = [
+    "",
+    "\n",
+    "one line",
+    "a\nb\n",
+    "a\r\nb\rc\n\nd",
+    "tab\tand\x0bvt\x0cff\u2028ls\x85nel\n",
+    "unicode ☃ snow\nman ☃\n",
+]
+
+
+@pytest.mark.parametrize("text", _TEXTS)
+def test_done_output_lines_match_splitlines(text: str) -> None:
+    out = DoneOutput(text)
+    expected = text.splitlines()
+    assert out.lines() == expected
+    assert out.lines(keepends=True) == text.splitlines(keepends=True)
+    assert out.nlines == len(expected)
+    assert [out[ix] for ix in range(out.nlines)] == expected
+    assert out[1:-1] == expected[1:-1]
+    assert out[::2] == expected[::2]
+    for string in ("", "a", "☃", "nope"):
+        assert out.grep(string) == [line for line in expected if string in line]
+
+
+@pytest.mark.parametrize("text", _TEXTS)
+def test_spilled_done_output_lines_match_in_memory(text: str, tmp_path: Path) -> None:
+    data = text.encode()
+    spill_path = tmp_path / "spilled.out"
+    spill_path.write_bytes(data)
+    out = DoneOutput(data)
+    spilled = DoneOutput(fspath=str(spill_path))
+    assert spilled.text == out.text
+    assert spilled.lines() == out.lines()
+    assert spilled.lines(keepends=True) == out.lines(keepends=True)
+    assert spilled.nlines == out.nlines
+    assert spilled[:] == out[:]
+    assert [spilled[ix] for ix in range(spilled.nlines)] == out.lines()
+    for string in ("", "a", "☃", "nope"):
+        assert spilled.grep(string) == out.grep(string)
+
+
+def test_done_output_bytes_decoded_lazily() -> None:
+    out = DoneOutput(b"a\r\nb\n")
+    assert out.raw == b"a\r\nb\n"
+    assert out.text == "a\nb\n"
+    assert out.raw == b"a\r\nb\n"
+    ascii_out = DoneOutput(b"abc\n")
+    assert ascii_out.text == "abc\n"
+    assert ascii_out.raw == b"abc\n"
+    with pytest.raises(IndexError):
+        ascii_out[1]
+
+
+def test_done_stdout_bytes() -> None:
+    done = Done(
+        args=["x"], returncode=0, stdout=b"a\nb\n", stderr=b"", ti=0, tf=0, dt=0
+    )
+    assert done.stdout == "a\nb\n"
+    assert done.lines == ["a", "b"]
+    assert done == Done(
+        args=["x"], returncode=0, stdout="a\nb\n", stderr="", ti=0, tf=0, dt=0
+    )
+
+
+@pytest.mark.parametrize(
+    "stdout", [b"a\r\nb\rc\n", b"caf\xe9\r\n", "plain\n"], ids=repr
+)
+def test_done_model_dump_round_trip(stdout: str | bytes) -> None:
+    done = Done(
+        args=["x"], returncode=0, stdout=stdout, stderr=b"e\r\n", ti=0, tf=0, dt=0
+    )
+    assert Done(**done.model_dump()) == done
+    assert Done.model_validate_json(done.model_dump_json()) == done
+
+
+def test_do_non_utf8_output_falls_back_to_latin1() -> None:
+    script = "import sys; sys.stdout.buffer.write(b'caf\\xe9\\r\\nok\\n')"
+    done = sh.do(sys.executable, "-c", script)
+    assert done.stdout == "caf\xe9\nok\n"
+    assert done.stdout_output.raw == b"caf\xe9\r\nok\n"
+    assert '"stdout":"caf\xe9\\nok\\n"' in done.model_dump_json()
+    spilled = sh.do(sys.executable, "-c", script, spill=1)
+    assert spilled.stdout_output.spilled
+    assert spilled.stdout == "caf\xe9\nok\n"
+    assert spilled.stdout_output.lines() == ["caf\xe9", "ok"]
+    assert spilled.stdout_output[0] == "caf\xe9"
+
+
+def test_spilled_output_line_index() -> None:
+    script = (
+        "for i in range(3000): print(f'line {i}', end='\\r\\n' if i % 2 else '\\n')"
+    )
+    done = sh.do(sys.executable, "-c", script, spill=100)
+    out = done.stdout_output
+    assert out.spilled
+    expected = [f"line {i}" for i in range(3000)]
+    assert out.nlines == 3000
+    assert out[0] == "line 0"
+    assert out[-1] == "line 2999"
+    assert out[1000:1003] == expected[1000:1003]
+    assert out[2998:] == expected[2998:]
+    assert out.lines() == expected
+
+
+def test_do_spill_with_tee_raises() -> None:
+    with pytest.raises(ValueError, match="spill"):
+        sh.do(sys.executable, "-c", "print('hi')", tee=True, spill=16)
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import asyncio
+import sys
+
+from subprocess import TimeoutExpired
+from typing import TYPE_CHECKING
+
+import pytest
+
+from shellfish.exe import Exe, ExeSession, ExeSessionPool
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+_LINE_SERVER = (
+    "import os, sys, time\n"
+    "for line in sys.stdin:\n"
+    "    req = line.strip()\n"
+    "    if req == 'crash':\n"
+    "        sys.exit(7)\n"
+    "    if req == 'sleep':\n"
+    "        time.sleep(5)\n"
+    "    print(req, os.getpid(), file=sys.stderr)\n"
+    "    print(req[::-1], flush=True)\n"
+)
+
+_LENGTH_SERVER = (
+    "import struct, sys\n"
+    "rd, wr = sys.stdin.buffer, sys.stdout.buffer\n"
+    "while header := rd.read(4):\n"
+    "    payload = rd.read(struct.unpack('>I', header)[0])\n"
+    "    wr.write(struct.pack('>I', len(payload) * 2) + payload * 2)\n"
+    "    wr.flush()\n"
+)
+
+
+def _line_session(**kwargs: object) -> ExeSession:
+    return ExeSession([sys.executable, "-c", _LINE_SERVER], **kwargs)  # type: ignore[arg-type]
+
+
+def test_session_line_framing() -> None:
+    with _line_session() as session:
+        done = session.request("abc")
+        pid = session.pid
+        assert done.stdout == "cba"
+        assert done.returncode == 0
+        assert done.stdin == "abc"
+        assert done.dt >= 0
+        assert session("xyz").stdout == "zyx"
+        assert session.pid == pid
+        assert session.nrequests == 2
+        with pytest.raises(ValueError, match="single line"):
+            session.request("a\nb")
+    assert not session.alive
+
+
+def test_session_length_framing() -> None:
+    payload = b"\x00\n\xff" * 1000
+    with ExeSession(
+        [sys.executable, "-c", _LENGTH_SERVER], framing="length"
+    ) as session:
+        assert session.request(payload).stdout_output.raw == payload * 2
+        assert session.request(b"").stdout_output.raw == b""
+
+
+def test_session_restart_and_timeout() -> None:
+    with _line_session() as session:
+        pid = session.pid
+        assert session.request("ok").stdout == "ko"
+        crashed = session.request("crash")
+        assert crashed.returncode == 7
+        assert crashed.stdout == ""
+        assert session.request("again").stdout == "niaga"
+        assert session.nrestarts == 1
+        assert session.pid != pid
+        with pytest.raises(TimeoutExpired):
+            session.request("sleep", timeout=0.5)
+        assert session.request("back").stdout == "kcab"
+        assert session.nrestarts == 2
+
+    with _line_session(restart=False) as session:
+        session.request("crash")
+        with pytest.raises(ChildProcessError, match="exited"):
+            session.request("nope")
+
+
+def test_session_pool() -> None:
+    with ExeSessionPool([_line_session() for _ in range(3)]) as pool:
+        words = [f"word{ix}" for ix in range(12)]
+        dones = list(pool.map(words))
+        assert [done.stdout for done in dones] == [word[::-1] for word in words]
+        assert sum(session.nrequests for session in pool.sessions) == 12
+
+        async def _requests() -> list[str]:
+            dones = await asyncio.gather(*(pool.request_async(w) for w in words))
+            return [done.stdout for done in dones]
+
+        assert asyncio.run(_requests()) == [word[::-1] for word in words]
+
+
+def test_session_pool_sequential_requests_reuse_one_session() -> None:
+    with ExeSessionPool([_line_session() for _ in range(3)]) as pool:
+        for word in ("a", "b", "c"):
+            assert pool.request(word).stdout == word
+        assert [session.nrequests for session in pool.sessions] == [3, 0, 0]
+        assert pool.sessions[1].pid is None
+
+
+def test_exe_session() -> None:
+    python = Exe(sys.executable)
+    with python.session("-c", _LINE_SERVER) as session:
+        assert session.args == [sys.executable, "-c", _LINE_SERVER]
+        assert session.request("hi").stdout == "ih"
+    with python.session_pool("-c", _LINE_SERVER, size=2) as pool:
+        assert len(pool) == 2
+        assert pool.request("hey").stdout == "yeh"
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="posix executables")
+def test_exe_binds_resolved_abspath(tmp_path: Path) -> None:
+    tool = tmp_path / "sf-exe-tool"
+    tool.write_text("#!/bin/sh\necho one\n")
+    tool.chmod(0o755)
+    exe = Exe("sf-exe-tool", env={"PATH": str(tmp_path)})
+    done = exe()
+    assert done.args[0] == str(tool)
+    assert done.stdout == "one\n"
+    assert exe.abspath == str(tool)
+    tool.unlink()
+    moved = tmp_path / "bin"
+    moved.mkdir()
+    (moved / "sf-exe-tool").write_text("#!/bin/sh\necho two\n")
+    (moved / "sf-exe-tool").chmod(0o755)
+    exe.env = {"PATH": str(moved)}
+    assert exe().stdout == "two\n"
+    assert exe.which() == str(moved / "sf-exe-tool")
+    assert Exe("sf-missing-tool", abspath="/explicit/tool").which() == "/explicit/tool"
@@ -1,11 +1,22 @@
 from __future__ import annotations
 
+import os
+import time
+
+from glob import iglob
 from os import makedirs, path
+from typing import TYPE_CHECKING, Any
+
+import pytest
 
 from jsonbourne.trydantic import dataclass
 from shellfish import fs
 from shellfish.fs import touch
 
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
 
 @dataclass
 class DummyDataDir:
@@ -140,3 +151,666 @@ def test_scandir_gen() -> None:
     ]
 
     fs.rm(tmpdir, recursive=True)
+
+
+def _make_tree(root: Path, depth: int = 3, width: int = 3) -> set[str]:
+    paths: set[str] = set()
+    dirs = [root]
+    for _ in range(depth):
+        next_dirs = []
+        for d in dirs:
+            for i in range(width):
+                f = d / f"file{i}.txt"
+                f.write_text(str(f))
+                paths.add(str(f))
+                sub = d / f"dir{i}"
+                sub.mkdir()
+                paths.add(str(sub))
+                next_dirs.append(sub)
+        dirs = next_dirs
+    return paths
+
+
+def test_walk_parallel_gen(tmp_path: Path) -> None:
+    expected = _make_tree(tmp_path)
+    walked = [el.path for el in fs.walk_parallel_gen(tmp_path, workers=4)]
+    assert len(walked) == len(expected)
+    assert set(walked) == expected
+
+
+def test_walk_parallel_gen_ordered_matches_scandir_gen(tmp_path: Path) -> None:
+    _make_tree(tmp_path)
+    ordered = [el.path for el in fs.walk_parallel_gen(tmp_path, ordered=True)]
+    assert ordered == [el.path for el in fs.scandir_gen(tmp_path, recursive=True)]
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+def test_walk_parallel_gen_bounded_pending_scans(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, *, ordered: bool
+) -> None:
+    from shellfish.fs import _walk
+
+    for ix in range(60):
+        (tmp_path / f"dir{ix}").mkdir()
+        (tmp_path / f"dir{ix}" / "file.txt").write_text("x")
+    started = 0
+    consumed: set[str] = set()
+    max_pending = 0
+    _scan_dir = _walk._scan_dir
+
+    def _counting_scan_dir(*args: Any, **kwargs: Any) -> Any:
+        nonlocal started, max_pending
+        started += 1
+        max_pending = max(max_pending, started - len(consumed))
+        return _scan_dir(*args, **kwargs)
+
+    monkeypatch.setattr(_walk, "_scan_dir", _counting_scan_dir)
+    walked = 0
+    for entry in fs.walk_parallel_gen(tmp_path, workers=2, ordered=ordered):
+        consumed.add(os.path.dirname(entry.path))
+        walked += 1
+        time.sleep(0.001)
+    assert walked == 120
+    # 2 workers * 4 pending scans per worker (+ the one being consumed)
+    assert max_pending <= 2 * _walk._PENDING_PER_WORKER + 1
+
+
+def test_walk_parallel_gen_depth_prune_filter(tmp_path: Path) -> None:
+    _make_tree(tmp_path)
+    top = {el.name for el in fs.walk_parallel_gen(tmp_path, max_depth=1)}
+    assert top == {el.name for el in fs.scandir_gen(tmp_path)}
+
+    pruned = [
+        el.path
+        for el in fs.walk_parallel_gen(tmp_path, prune=lambda e: e.name == "dir0")
+    ]
+    assert str(tmp_path / "dir0") in pruned
+    assert not any(p.startswith(str(tmp_path / "dir0") + os.sep) for p in pruned)
+
+    files_only = list(fs.walk_parallel_gen(tmp_path, filterfn=lambda e: e.is_file()))
+    assert files_only
+    assert all(el.is_file() for el in files_only)
+
+    with pytest.raises(ValueError, match="max_depth"):
+        fs.walk_parallel_gen(tmp_path, max_depth=0)
+    with pytest.raises(NotADirectoryError):
+        fs.walk_parallel_gen(tmp_path / "dir0" / "file0.txt")
+
+
+def test_scandir_gen_recursive_scans_each_dir_once(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    expected = _make_tree(tmp_path)
+    n_dirs = 1 + sum(1 for p in expected if os.path.isdir(p))
+    scanned: list[str] = []
+    _scandir = fs._scandir
+
+    def _counting_scandir(dirpath: str) -> Any:
+        scanned.append(dirpath)
+        return _scandir(dirpath)
+
+    monkeypatch.setattr(fs, "_scandir", _counting_scandir)
+    entries = list(fs.scandir_gen(tmp_path, recursive=True))
+    assert {el.path for el in entries} == expected
+    assert len(scanned) == n_dirs
+    assert len(set(scanned)) == n_dirs
+
+    # parent entries come before their children
+    seen: set[str] = {str(tmp_path)}
+    for el in entries:
+        assert os.path.dirname(el.path) in seen
+        seen.add(el.path)
+
+    files_only = list(
+        fs.scandir_gen(tmp_path, recursive=True, dirs=False, symlinks=False)
+    )
+    assert {el.path for el in files_only} == {p for p in expected if os.path.isfile(p)}
+
+
+def test_fs_snapshot(tmp_path: Path) -> None:
+    expected = _make_tree(tmp_path, depth=2, width=2)
+    snap = fs.FsSnapshot.scan(tmp_path)
+    relpaths = {os.path.relpath(p, tmp_path).replace(os.sep, "/") for p in expected}
+    assert set(snap.relpaths()) == relpaths
+    assert len(snap) == len(relpaths)
+    files = [p for p in expected if os.path.isfile(p)]
+    assert snap.total_size() == sum(fs.filesize(p) for p in files)
+    assert set(snap.glob("dir0/*.txt")) == {
+        "dir0/file0.txt",
+        "dir0/file1.txt",
+    }
+    assert snap["dir1/file0.txt"].size == fs.filesize(tmp_path / "dir1" / "file0.txt")
+    assert snap["dir1"].is_dir()
+    assert list(snap.changed_since(max(e.mtime for e in snap))) == []
+
+    saved = tmp_path / "snapshot.bin"
+    snap.save(saved)
+    loaded = fs.FsSnapshot.load(saved)
+    assert list(loaded) == list(snap)
+    assert loaded.root == snap.root
+
+
+def test_fs_snapshot_non_utf8_paths(tmp_path: Path) -> None:
+    root = os.path.join(os.fsencode(tmp_path), b"root\xff")
+    try:
+        os.makedirs(os.path.join(root, b"d\xff", b"sub"))
+    except (OSError, UnicodeError):
+        pytest.skip("file-system does not allow non-utf-8 names")
+    with open(os.path.join(root, b"d\xff", b"f\xfe.txt"), "wb") as f:
+        f.write(b"f")
+    snap = fs.FsSnapshot.scan(os.fsdecode(root))
+    loaded = fs.FsSnapshot.from_bytes(snap.to_bytes())
+    assert loaded.root == snap.root == os.fsdecode(root)
+    assert list(loaded) == list(snap)
+    assert loaded.diff(loaded.refresh()) == ([], [], [])
+
+
+def test_fs_snapshot_follow_symlinks_loop(tmp_path: Path) -> None:
+    root = tmp_path / "root"
+    (root / "a" / "b").mkdir(parents=True)
+    (root / "a" / "b" / "file.txt").write_text("x")
+    try:
+        # two links back up to ancestors + one to a dir already in the tree
+        (root / "a" / "b" / "up").symlink_to(root)
+        (root / "a" / "loop").symlink_to(root / "a")
+        (root / "alias").symlink_to(root / "a" / "b")
+    except OSError:
+        pytest.skip("symlinks not supported")
+    snap = fs.FsSnapshot.scan(root, follow_symlinks=True)
+    relpaths = sorted(snap.relpaths())
+    assert {"a", "a/b", "a/loop", "alias"} <= set(relpaths)
+    # each real dir is only descended once (via a/b or alias)
+    assert sum(p.endswith("/file.txt") for p in relpaths) == 1
+    assert sum(p.endswith("/up") for p in relpaths) == 1
+    assert len(relpaths) == 6
+    refreshed = snap.refresh(restat=True)
+    assert sorted(refreshed.relpaths()) == relpaths
+    assert snap.diff(refreshed) == ([], [], [])
+    watcher = fs.FsWatcher(root, follow_symlinks=True)
+    watcher.start()
+    assert not watcher.poll()
+
+
+def test_fs_snapshot_refresh_rescans_changed_dirs_only(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    from shellfish.fs import _snapshot
+
+    _make_tree(tmp_path, depth=2, width=2)
+    snap = fs.FsSnapshot.scan(tmp_path)
+    (tmp_path / "dir1" / "new.txt").write_text("new-file")
+    os.remove(tmp_path / "dir0" / "file1.txt")
+
+    scanned: list[str] = []
+    _scandir = _snapshot._scandir
+
+    def _counting_scandir(dirpath: str) -> Any:
+        scanned.append(dirpath)
+        return _scandir(dirpath)
+
+    monkeypatch.setattr(_snapshot, "_scandir", _counting_scandir)
+    refreshed = snap.refresh()
+    assert sorted(scanned) == sorted([str(tmp_path / "dir0"), str(tmp_path / "dir1")])
+    assert "dir1/new.txt" in refreshed
+    assert "dir0/file1.txt" not in refreshed
+    assert "dir0/file1.txt" in snap
+    assert refreshed.total_size() == snap.total_size() - len(
+        str(tmp_path / "dir0" / "file1.txt")
+    ) + len("new-file")
+
+
+@pytest.mark.parametrize("strategy", ["copy_file_range", "sendfile", "buffered"])
+def test_copy_file_strategies(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, strategy: str
+) -> None:
+    if strategy != "copy_file_range":
+        monkeypatch.setattr(fs, "_HAS_COPY_FILE_RANGE", False)
+    if strategy == "buffered":
+        monkeypatch.setattr(fs, "_HAS_SENDFILE_FILE", False)
+    src = tmp_path / "src.bin"
+    data = os.urandom(2**20 + 123)
+    src.write_bytes(data)
+    dest = tmp_path / "dest.bin"
+    dest.write_bytes(b"existing-contents-are-truncated" * 2**16)
+    assert fs.copy_file(src, dest) == (str(src), str(dest))
+    assert dest.read_bytes() == data
+    assert fs.filecmp(src, dest)
+
+
+def test_copy_file_falls_back_mid_copy(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    import errno
+
+    calls: list[int] = []
+
+    def _copy_file_range(src_fd: int, dst_fd: int, count: int, *args: Any) -> int:
+        if calls:
+            raise OSError(errno.EXDEV, "cross-device")
+        calls.append(count)
+        return os.write(dst_fd, os.pread(src_fd, 1000, 0))
+
+    monkeypatch.setattr(fs, "_HAS_COPY_FILE_RANGE", True)
+    monkeypatch.setattr(fs.os, "copy_file_range", _copy_file_range, raising=False)
+    src = tmp_path / "src.bin"
+    data = os.urandom(5000)
+    src.write_bytes(data)
+    dest = tmp_path / "dest.bin"
+    fs.copy_file(src, dest)
+    assert dest.read_bytes() == data
+    assert calls
+
+
+def test_copy_tree(tmp_path: Path) -> None:
+    src = tmp_path / "src"
+    src.mkdir()
+    expected = {path.relpath(p, src) for p in _make_tree(src, depth=2)}
+    dest = tmp_path / "dest"
+    progressed: list[str] = []
+    stats = fs.copy_tree(
+        src, dest, workers=4, progress=lambda s, d, n: progressed.append(d)
+    )
+    copied = {
+        path.relpath(el.path, dest) for el in fs.scandir_gen(dest, recursive=True)
+    }
+    assert copied == expected
+    assert stats.files == len(progressed) == 12
+    assert stats.dirs == 13
+    for relpath in expected:
+        if path.isfile(src / relpath):
+            assert (dest / relpath).read_text() == (src / relpath).read_text()
+            assert fs.filecmp(src / relpath, dest / relpath, shallow=True)
+
+
+def test_copy_tree_dryrun_and_skip_identical(tmp_path: Path) -> None:
+    src = tmp_path / "src"
+    src.mkdir()
+    _make_tree(src, depth=2)
+    dest = tmp_path / "dest"
+    stats = fs.copy_tree(src, dest, dryrun=True)
+    assert stats.files == 12
+    assert not dest.exists()
+
+    fs.copy_tree(src, dest)
+    (src / "file0.txt").write_text("changed")
+    stats = fs.copy_tree(src, dest, skip_identical="mtime")
+    assert (stats.files, stats.skipped) == (1, 11)
+    stats = fs.copy_tree(src, dest, skip_identical="content")
+    assert (stats.files, stats.skipped) == (0, 12)
+    assert (dest / "file0.txt").read_text() == "changed"
+
+
+def test_cp_recursive(tmp_path: Path) -> None:
+    src = tmp_path / "src"
+    src.mkdir()
+    expected = {path.relpath(p, src) for p in _make_tree(src, depth=2)}
+    dest = tmp_path / "dest"
+    fs.cp(src, dest, r=True, workers=2)
+    copied = {
+        path.relpath(el.path, dest) for el in fs.scandir_gen(dest, recursive=True)
+    }
+    assert copied == expected
+
+
+def test_cp_glob(tmp_path: Path) -> None:
+    src = tmp_path / "src"
+    src.mkdir()
+    for ix in range(6):
+        (src / f"file{ix}.txt").write_text(str(ix) * 1000)
+    matches = list(iglob(str(src / "*.txt")))
+
+    dest_dir = tmp_path / "dest"
+    dest_dir.mkdir()
+    fs.cp(src / "*.txt", dest_dir, workers=3)
+    assert sorted(p.name for p in dest_dir.iterdir()) == sorted(
+        path.basename(m) for m in matches
+    )
+
+    # single-file dest: copied one after the other (last match wins)...
+    dest_file = tmp_path / "dest.txt"
+    fs.cp(src / "*.txt", dest_file, workers=3)
+    assert dest_file.read_text() == fs.read_str(matches[-1])
+    # ...and w/o force only the first match is copied
+    dest_file.unlink()
+    fs.cp(src / "*.txt", dest_file, force=False, f=False)
+    assert dest_file.read_text() == fs.read_str(matches[0])
+
+
+def test_rm_tree(tmp_path: Path) -> None:
+    root = tmp_path / "root"
+    root.mkdir()
+    _make_tree(root, depth=3)
+    (root / "dir0" / "link").symlink_to(root / "dir1")
+    stats = fs.rm_tree(root, workers=4, batchsize=4, dryrun=True)
+    assert root.exists()
+    assert (stats.dirs, stats.files) == (1 + 3 + 9 + 27, 3 + 9 + 27 + 1)
+    nbytes = sum(
+        el.stat(follow_symlinks=False).st_size
+        for el in fs.walk_parallel_gen(root)
+        if not el.is_dir(follow_symlinks=False)
+    )
+    assert stats.nbytes == nbytes
+    assert fs.rm_tree(root, workers=4, batchsize=4) == stats
+    assert not root.exists()
+    assert fs.rm_tree(root, force=True).files == 0
+    with pytest.raises(FileNotFoundError):
+        fs.rm_tree(root)
+
+
+def test_rm_recursive_workers(tmp_path: Path) -> None:
+    root = tmp_path / "root"
+    root.mkdir()
+    _make_tree(root, depth=2)
+    assert fs.rm(root, recursive=True, dryrun=True, verbose=True, workers=2) == [
+        str(root)
+    ]
+    assert root.exists()
+    assert fs.rm(root, recursive=True, verbose=True, workers=2) == [str(root)]
+    assert not root.exists()
+
+
+def test_rmdir_force_workers_ignores_concurrent_removals(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    root = tmp_path / "root"
+    root.mkdir()
+    _make_tree(root, depth=2)
+    _lstat = fs._lstat
+
+    def _lstat_removed_concurrently(fspath: str) -> os.stat_result:
+        # another process removes the file between the walk and the unlink
+        if fspath.endswith("file0.txt"):
+            os.remove(fspath)
+        return _lstat(fspath)
+
+    monkeypatch.setattr(fs, "_lstat", _lstat_removed_concurrently)
+    with pytest.raises(FileNotFoundError):
+        fs.rmdir(root, recursive=True, workers=2)
+    fs.rmdir(root, force=True, recursive=True, workers=2)
+    assert not root.exists()
+    fs.rmdir(root, force=True, recursive=True, workers=2)
+
+
+@pytest.mark.parametrize("size", [0, 1000, 3 * 2**20])
+def test_filecmp_contents(tmp_path: Path, size: int) -> None:
+    data = os.urandom(size)
+    left = tmp_path / "left.bin"
+    right = tmp_path / "right.bin"
+    left.write_bytes(data)
+    right.write_bytes(data)
+    assert fs.filecmp(left, right, shallow=False)
+    if size:
+        changed = bytearray(data)
+        changed[-1] ^= 0xFF
+        right.write_bytes(changed)
+        assert not fs.filecmp(left, right, shallow=False)
+
+
+def test_dircmp(tmp_path: Path) -> None:
+    left = tmp_path / "left"
+    right = tmp_path / "right"
+    left.mkdir()
+    _make_tree(left, depth=2)
+    fs.copy_tree(left, right)
+    assert fs.dircmp(left, right, workers=4).identical
+
+    (right / "dir0" / "file0.txt").write_text("changed")
+    (right / "dir1" / "new.txt").write_text("new")
+    (left / "only.txt").write_text("only")
+    (right / "file1.txt").unlink()
+    (right / "file1.txt").mkdir()
+    cache = fs.FileHashCache()
+    result = fs.dircmp(left, right, workers=4, cache=cache)
+    assert not result.identical
+    assert result.left_only == ["only.txt"]
+    assert result.right_only == [path.join("dir1", "new.txt")]
+    assert result.diff_files == [path.join("dir0", "file0.txt")]
+    assert result.funny_files == ["file1.txt"]
+    assert len(result.same_files) == 10
+    assert len(result.common_dirs) == 12
+    assert len(cache) == 20
+
+    cache_file = tmp_path / "cache.json"
+    cache.save(cache_file)
+    loaded = fs.FileHashCache.load(cache_file)
+    assert len(loaded) == len(cache)
+    assert fs.dircmp(left, right, cache=loaded) == result
+    assert len(loaded) == len(cache)
+
+
+def test_write_atomic_replaces_and_keeps_mode(tmp_path: Path) -> None:
+    fspath = str(tmp_path / "atomic.json")
+    fs.write_str(fspath, "old")
+    if os.name != "nt":
+        os.chmod(fspath, 0o640)
+    assert fs.write_json(fspath, {"a": 1}, atomic=True, fsync=True) == 7
+    assert fs.read_json(fspath) == {"a": 1}
+    if os.name != "nt":
+        assert os.stat(fspath).st_mode & 0o777 == 0o640
+    assert os.listdir(tmp_path) == ["atomic.json"]
+
+
+def test_write_atomic_failure_leaves_target(tmp_path: Path) -> None:
+    fspath = str(tmp_path / "atomic.bin")
+    fs.write_bytes(fspath, b"original")
+
+    def chunks() -> Any:
+        yield b"partial"
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError, match="boom"):
+        fs.write_bytes_gen(fspath, chunks(), atomic=True)
+    assert fs.read_bytes(fspath) == b"original"
+    assert os.listdir(tmp_path) == ["atomic.bin"]
+    with pytest.raises(ValueError, match="cannot append"):
+        fs.write_bytes(fspath, b"more", atomic=True, append=True)
+
+
+@pytest.mark.skipif(os.name == "nt", reason="posix file modes")
+def test_write_atomic_read_only_mode(tmp_path: Path) -> None:
+    fspath = str(tmp_path / "read-only.txt")
+    assert fs.write_bytes(fspath, b"x", chmod=0o444, atomic=True) == 1
+    assert fs.read_bytes(fspath) == b"x"
+    assert os.stat(fspath).st_mode & 0o777 == 0o444
+    # the existing (read-only) mode is kept when overwriting
+    assert fs.write_bytes(fspath, b"xy", atomic=True) == 2
+    assert fs.read_bytes(fspath) == b"xy"
+    assert os.stat(fspath).st_mode & 0o777 == 0o444
+    assert os.listdir(tmp_path) == ["read-only.txt"]
+
+
+def test_write_atomic_through_symlink(tmp_path: Path) -> None:
+    target = tmp_path / "target.txt"
+    link = tmp_path / "link.txt"
+    fs.write_str(target, "old")
+    try:
+        os.symlink(target, link)
+    except OSError:
+        pytest.skip("symlinks not supported")
+    fs.write_str(link, "non-atomic")
+    assert fs.read_str(target) == "non-atomic"
+    fs.write_str(link, "atomic", atomic=True)
+    assert os.path.islink(link)
+    assert fs.read_str(target) == "atomic"
+    assert sorted(os.listdir(tmp_path)) == ["link.txt", "target.txt"]
+
+
+async def test_write_atomic_async(tmp_path: Path) -> None:
+    fspath = str(tmp_path / "atomic.txt")
+    assert await fs.write_str_async(fspath, "hello", atomic=True, fsync=True) == 5
+
+    async def chunks() -> Any:  # noqa: RUF029
+        yield b"hello "
+        yield b"world"
+
+    assert await fs.write_bytes_gen_async(fspath, chunks(), atomic=True) == 11
+    assert fs.read_str(fspath) == "hello world"
+    assert await fs.write_bytes_async(fspath, b"synced", fsync=True) == 6
+    assert fs.read_str(fspath) == "synced"
+    assert os.listdir(tmp_path) == ["atomic.txt"]
+
+
+def test_fs_snapshot_diff(tmp_path: Path) -> None:
+    _make_tree(tmp_path, depth=2, width=2)
+    snap = fs.FsSnapshot.scan(tmp_path)
+    assert snap.diff(snap.refresh(restat=True)) == ([], [], [])
+    fs.write_str(tmp_path / "dir0" / "file0.txt", "modified contents")
+    fs.write_str(tmp_path / "dir1" / "new.txt", "new")
+    fs.rm(tmp_path / "dir1" / "dir0", recursive=True)
+    created, modified, deleted = snap.diff(snap.refresh(restat=True))
+    assert created == ["dir1/new.txt"]
+    assert modified == ["dir0/file0.txt"]
+    assert sorted(deleted) == sorted(
+        p for p in snap.relpaths() if p.startswith("dir1/dir0")
+    )
+
+
+def test_fs_watcher_poll(tmp_path: Path) -> None:
+    _make_tree(tmp_path, depth=1, width=2)
+    watcher = fs.FsWatcher(tmp_path, include="*.txt", exclude="*/skip*")
+    assert not watcher.poll()  # first poll takes the snapshot
+    fs.mkdirp(tmp_path / "sub" / "skip")
+    fs.write_str(tmp_path / "sub" / "a.txt", "a")
+    fs.write_str(tmp_path / "sub" / "skip" / "b.txt", "b")
+    fs.write_str(tmp_path / "sub" / "c.log", "c")
+    changes = watcher.poll()
+    assert changes.created == [path.join(str(tmp_path), "sub", "a.txt")]
+    assert changes.modified == changes.deleted == []
+    fs.write_str(tmp_path / "sub" / "a.txt", "aaa")
+    os.remove(tmp_path / "file0.txt")
+    changes = watcher.poll()
+    assert changes.modified == [path.join(str(tmp_path), "sub", "a.txt")]
+    assert changes.deleted == [path.join(str(tmp_path), "file0.txt")]
+    assert len(changes) == 2
+    assert not watcher.poll()
+
+
+async def test_fs_watch_async(tmp_path: Path) -> None:
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    loop.call_later(0.05, fs.write_str, tmp_path / "a.txt", "a")
+    async for changes in fs.watch_async(tmp_path, interval=0.02):
+        assert changes.paths() == [path.join(str(tmp_path), "a.txt")]
+        break
+
+
+def test_du(tmp_path: Path) -> None:
+    expected = _make_tree(tmp_path, depth=2, width=2)
+    files = [p for p in expected if os.path.isfile(p)]
+    result = fs.du(tmp_path, workers=4, top=3)
+    assert result.total.nbytes == sum(fs.filesize(p) for p in fs.files_gen(tmp_path))
+    assert result.total.files == len(files)
+    assert result.total.dirs == len(expected) - len(files)
+    assert result.errors == 0
+    by_path = {d.path: d for d in result.dirs}
+    dir0 = str(tmp_path / "dir0")
+    assert by_path[dir0].nbytes == sum(
+        fs.filesize(p) for p in files if p.startswith(dir0 + os.sep)
+    )
+    largest = sorted(((fs.filesize(p), p) for p in files), reverse=True)[:3]
+    assert [nbytes for _, nbytes in result.largest] == [n for n, _ in largest]
+    assert [d.path for d in fs.du(tmp_path, depth=0).dirs] == [str(tmp_path)]
+    assert {d.path for d in fs.du(tmp_path, depth=1).dirs} == {
+        str(tmp_path),
+        dir0,
+        str(tmp_path / "dir1"),
+    }
+    assert fs.du(tmp_path, workers=1).total == result.total
+    with pytest.raises(ValueError, match="workers must be >= 1"):
+        fs.du(tmp_path, workers=0)
+
+
+def test_du_dedupes_hardlinks(tmp_path: Path) -> None:
+    fs.mkdirp(tmp_path / "sub")
+    fs.write_bytes(tmp_path / "big.bin", b"x" * 1000)
+    try:
+        os.link(tmp_path / "big.bin", tmp_path / "sub" / "big-link.bin")
+    except OSError:
+        pytest.skip("hard links not supported")
+    result = fs.du(tmp_path)
+    assert result.total.nbytes == 1000
+    assert result.total.files == 1
+    assert len(result.largest) == 1
+
+
+def test_find_duplicates(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    from shellfish.fs import _dupes
+
+    blocksize = 1024
+    big = b"h" * blocksize + b"middle" * 1000 + b"t" * blocksize
+    big_diff_middle = b"h" * blocksize + b"MIDDLE" * 1000 + b"t" * blocksize
+    fs.mkdirp(tmp_path / "a" / "b")
+    fs.write_bytes(tmp_path / "big1.bin", big)
+    fs.write_bytes(tmp_path / "a" / "big2.bin", big)
+    fs.write_bytes(tmp_path / "a" / "b" / "big3.bin", big_diff_middle)
+    fs.write_bytes(tmp_path / "small1.txt", b"small")
+    fs.write_bytes(tmp_path / "a" / "small2.txt", b"small")
+    fs.write_bytes(tmp_path / "a" / "other.txt", b"other")  # same size, differs
+    fs.write_bytes(tmp_path / "unique.txt", b"unique size")
+    fs.write_bytes(tmp_path / "empty1.txt", b"")
+    fs.write_bytes(tmp_path / "empty2.txt", b"")
+    try:
+        os.link(tmp_path / "big1.bin", tmp_path / "a" / "b" / "big1-link.bin")
+    except OSError:
+        ...
+
+    hashed: list[str] = []
+    _hash_file = _dupes.hash_file
+
+    def _counting_hash_file(fspath: str, algo: str) -> str:
+        hashed.append(os.path.basename(fspath))
+        return _hash_file(fspath, algo)
+
+    monkeypatch.setattr(_dupes, "hash_file", _counting_hash_file)
+    groups = list(fs.find_duplicates(tmp_path, blocksize=blocksize, workers=2))
+    got = sorted(
+        (g.size, sorted(os.path.relpath(p, tmp_path) for p in g.paths)) for g in groups
+    )
+    assert got == [
+        (5, ["a/small2.txt".replace("/", os.sep), "small1.txt"]),
+        (len(big), ["a/big2.bin".replace("/", os.sep), "big1.bin"]),
+    ]
+    # only the large head/tail collisions are hashed whole
+    assert sorted(hashed) == ["big1.bin", "big2.bin", "big3.bin"]
+    big_group = next(g for g in groups if g.size == len(big))
+    assert big_group.digest == _hash_file(tmp_path / "big1.bin", "blake2b")
+    assert big_group.wasted == len(big)
+    with pytest.raises(ValueError, match="Invalid hash algorithm"):
+        fs.find_duplicates(tmp_path, algo="nope")
+
+
+def test_find_duplicates_without_inodes(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # on windows DirEntry.stat() gives st_ino == st_dev == st_nlink == 0
+    from shellfish.fs import _dupes
+
+    class _NoInodeEntry:
+        def __init__(self, entry: os.DirEntry[str]) -> None:
+            self._entry = entry
+            self.path = entry.path
+
+        def is_file(self, *, follow_symlinks: bool = True) -> bool:
+            return self._entry.is_file(follow_symlinks=follow_symlinks)
+
+        def stat(self, *, follow_symlinks: bool = True) -> os.stat_result:
+            st = list(self._entry.stat(follow_symlinks=follow_symlinks))
+            st[1] = st[2] = st[3] = 0  # st_ino, st_dev, st_nlink
+            return os.stat_result(st)
+
+    walk_parallel_gen = _dupes.walk_parallel_gen
+
+    def _walk_no_inodes(*args: Any, **kwargs: Any) -> Iterator[_NoInodeEntry]:
+        return map(_NoInodeEntry, walk_parallel_gen(*args, **kwargs))
+
+    monkeypatch.setattr(_dupes, "walk_parallel_gen", _walk_no_inodes)
+    fs.mkdirp(tmp_path / "a")
+    for fspath in ("x.txt", "a/y.txt", "a/z.txt"):
+        fs.write_str(tmp_path / fspath, "same")
+    fs.write_str(tmp_path / "a" / "other.txt", "diff")
+    # the "a" files are walked twice but only reported once
+    groups = list(fs.find_duplicates([tmp_path, tmp_path / "a"]))
+    assert [sorted(os.path.relpath(p, tmp_path) for p in g.paths) for g in groups] == [
+        [os.path.join("a", "y.txt"), os.path.join("a", "z.txt"), "x.txt"]
+    ]
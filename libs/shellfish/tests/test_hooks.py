@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import sys
+
+from subprocess import TimeoutExpired
+from time import perf_counter
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from jsonbourne import JSON
+from shellfish import hooks, sh
+from shellfish.exe import Exe
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+_PRINT = [sys.executable, "-c", "print('hi')"]
+
+
+@pytest.fixture
+def events() -> Iterator[list[sh.HookEvent]]:
+    _events: list[sh.HookEvent] = []
+    sh.add_hook(_events.append)
+    try:
+        yield _events
+    finally:
+        sh.remove_hook(_events.append)
+
+
+def test_no_hooks_no_launch() -> None:
+    assert not sh.get_hooks()
+    assert hooks.launch(_PRINT, "do") is None
+
+
+def test_do_hook_events(events: list[sh.HookEvent]) -> None:
+    for kwargs in ({}, {"tee": True}, {"spill": 1}):
+        events.clear()
+        done = sh.do(*_PRINT, **kwargs)
+        assert done.stdout == "hi\n"
+        assert [e.kind for e in events] == ["spawn", "first_output", "exit"]
+        assert {e.pid for e in events} == {events[0].pid}
+        assert events[0].pid is not None
+        assert events[-1].returncode == 0
+        assert events[-1].source == "do"
+        assert events[-1].args == _PRINT
+        assert events[0].dt <= events[-1].dt
+
+    events.clear()
+    with pytest.raises(TimeoutExpired):
+        sh.do(sys.executable, "-c", "import time; time.sleep(5)", timeout=0.5)
+    assert [e.kind for e in events] == ["spawn", "timeout"]
+
+    events.clear()
+    sh.do(sys.executable, "-c", "import sys; sys.exit(3)")
+    assert [e.kind for e in events] == ["spawn", "exit"]
+    assert events[-1].returncode == 3
+
+    events.clear()
+    assert Exe(sys.executable)("-c", "print('hi')").stdout == "hi\n"
+    assert [e.kind for e in events] == ["spawn", "first_output", "exit"]
+
+
+async def test_do_async_hook_events(events: list[sh.HookEvent]) -> None:
+    done = await sh.do_async(*_PRINT)
+    assert done.stdout == "hi\n"
+    assert [e.kind for e in events] == ["spawn", "first_output", "exit"]
+    assert events[-1].source == "do_async"
+    assert events[-1].returncode == 0
+
+    events.clear()
+    ti = perf_counter()
+    with pytest.raises(TimeoutExpired):
+        await sh.do_async(
+            sys.executable, "-c", "import time; time.sleep(5)", timeout=0.5
+        )
+    assert perf_counter() - ti < 4
+    assert [e.kind for e in events] == ["spawn", "timeout"]
+
+
+def _py_case(script: str, **kwargs: Any) -> dict[str, Any]:
+    return {"args": [sys.executable, "-c", script], "timeout": 10, **kwargs}
+
+
+_DO_CASES = [
+    _py_case("print('hi')"),
+    _py_case("import sys; print('err', file=sys.stderr)"),
+    _py_case("import sys; sys.exit(3)"),
+    _py_case("print(input())", input="stdin"),
+    _py_case("print(repr(input()))", input=b"bytes"),
+    _py_case("import sys; print(repr(sys.stdin.read()))", input=b""),
+    _py_case("print('a', 'b', sep='\\r\\n')"),
+    _py_case("import sys; sys.stdout.buffer.write(b'caf\\xe9')"),
+    _py_case("print('a', 'b', 'c', sep='\\r\\n', end='\\r')", text=True),
+]
+
+
+@pytest.mark.parametrize("kwargs", _DO_CASES)
+def test_do_with_hooks_captures_the_same(kwargs: dict[str, Any]) -> None:
+    # w/ hooks registered `_do` streams the output (to see the first output)
+    expected = sh._do(**kwargs)
+    events: list[sh.HookEvent] = []
+    sh.add_hook(events.append)
+    try:
+        done = sh._do(**kwargs)
+    finally:
+        sh.remove_hook(events.append)
+    assert events
+    assert done.args == expected.args
+    assert done.returncode == expected.returncode
+    assert done.stdout == expected.stdout
+    assert done.stderr == expected.stderr
+    assert done.stdin == expected.stdin
+
+
+@pytest.mark.skipif(sh.which("rsync") is None, reason="rsync not installed")
+def test_rsync_hook_events(events: list[sh.HookEvent], tmp_path: Path) -> None:
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "file.txt").write_text("rsync")
+    sh.LIN.rsync(str(tmp_path / "src"), str(tmp_path / "dest"))
+    assert events[-1].kind == "exit"
+    assert events[-1].source == "rsync"
+    assert events[-1].cmd == "rsync"
+
+
+def test_hook_errors_warn() -> None:
+    def _bad_hook(event: sh.HookEvent) -> None:
+        raise RuntimeError("boom")
+
+    sh.add_hook(_bad_hook)
+    try:
+        with pytest.warns(RuntimeWarning, match="boom"):
+            assert sh.do(*_PRINT).stdout == "hi\n"
+    finally:
+        sh.remove_hook(_bad_hook)
+
+
+def test_histogram_and_jsonl_exporter(tmp_path: Path) -> None:
+    hist = sh.HookHistogram()
+    jsonl_path = tmp_path / "events.jsonl"
+    with sh.JsonlHookExporter(jsonl_path) as exporter:
+        sh.add_hook(hist)
+        sh.add_hook(exporter)
+        try:
+            for _ in range(3):
+                sh.do(*_PRINT)
+            sh.do(sys.executable, "-c", "import sys; sys.exit(1)")
+        finally:
+            sh.clear_hooks()
+    (stats,) = hist.stats().values()
+    assert stats.count == 4
+    assert stats.errors == 1
+    assert stats.timeouts == 0
+    assert sum(stats.buckets) == 4
+    assert stats.min <= stats.quantile(0.5) <= stats.max
+    assert stats.to_dict()["mean"] == pytest.approx(stats.total / 4)
+    assert hist.top(1) == [stats]
+    lines = [JSON.loads(line) for line in jsonl_path.read_text().splitlines()]
+    # the failing command has no output (no first_output event)
+    assert len(lines) == 11
+    assert [line["kind"] for line in lines[:3]] == ["spawn", "first_output", "exit"]
+    assert lines[-1]["returncode"] == 1
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import hashlib
+import os
+
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from shellfish import libhash
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+@pytest.mark.parametrize("size", [0, 1000, 3 * 2**20])
+def test_hash_file(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, size: int) -> None:
+    mmapped: list[int] = []
+    _mmap = libhash.mmap
+
+    def _counting_mmap(fileno: int, *args: Any, **kwargs: Any) -> Any:
+        mmapped.append(fileno)
+        return _mmap(fileno, *args, **kwargs)
+
+    monkeypatch.setattr(libhash, "mmap", _counting_mmap)
+    data = os.urandom(size)
+    fspath = tmp_path / "file.bin"
+    fspath.write_bytes(data)
+    assert libhash.hash_file(fspath) == hashlib.blake2b(data).hexdigest()
+    assert (
+        libhash.hash_file(fspath, "md5", blocksize=7) == hashlib.md5(data).hexdigest()
+    )
+    # only files of at least _MMAP_THRESHOLD bytes are memory-mapped
+    assert len(mmapped) == (2 if size >= libhash._MMAP_THRESHOLD else 0)
+
+
+def test_hash_files_manifest(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    paths = []
+    for i in range(20):
+        fspath = tmp_path / f"file{i}.txt"
+        fspath.write_text(f"file{i}" * i)
+        paths.append(str(fspath))
+    manifest = libhash.hash_files(paths, workers=4)
+    assert [el.path for el in manifest] == paths
+    for el in manifest:
+        assert el.digest == libhash.hash_file(el.path)
+
+    manifest_path = tmp_path / "manifest.json"
+    manifest.save(manifest_path)
+    assert libhash.Manifest.load(manifest_path) == manifest
+
+    (tmp_path / "file3.txt").write_text("changed")
+    os.remove(paths[5])
+    new_path = tmp_path / "new.txt"
+    new_path.write_text("new")
+    hashed: list[str] = []
+    _hash_file = libhash.hash_file
+
+    def _hash_file_spy(fspath: str, *args: object, **kwargs: object) -> str:
+        hashed.append(fspath)
+        return _hash_file(fspath, *args, **kwargs)  # type: ignore[arg-type]
+
+    monkeypatch.setattr(libhash, "hash_file", _hash_file_spy)
+    new_paths = [p for p in paths if p != paths[5]] + [str(new_path)]
+    rehashed = libhash.hash_files(new_paths, workers=4, previous=manifest)
+    assert sorted(hashed) == sorted([paths[3], str(new_path)])
+    diff = rehashed.compare(manifest)
+    assert diff.added == [str(new_path)]
+    assert diff.removed == [paths[5]]
+    assert diff.changed == [paths[3]]
+    with pytest.raises(ValueError, match="algo"):
+        libhash.hash_files(new_paths, "sha256", previous=manifest)
@@ -1,11 +1,16 @@
 from __future__ import annotations
 
+import sys
+
+from subprocess import PIPE, Popen, TimeoutExpired
 from typing import TYPE_CHECKING
 
 import pytest
 
 from shellfish import sh
 from shellfish.dev.popen_gen import popen_gen, popen_pipes_gen
+from shellfish.sp import run_dtee
+from shellfish.stdio import Stdio
 
 if TYPE_CHECKING:
     from pathlib import Path
@@ -46,3 +51,49 @@ def test_popen_gen(tmp_path: Path) -> None:
 def test_popen_gen_not_popen_obj(tmp_path: Path) -> None:
     with pytest.raises(ValueError, match="proc must be a Popen object"):
         list(popen_pipes_gen({"not": "a Popen object"}))  # type: ignore[arg-type]
+
+
+def test_popen_pipes_gen_drains_after_exit() -> None:
+    script = "import sys; sys.stdout.write('x' * 1_000_000); sys.stderr.write('err')"
+    with Popen([sys.executable, "-c", script], stdout=PIPE, stderr=PIPE) as proc:
+        chunks = list(popen_pipes_gen(proc, lines=False))
+    assert b"".join(c for io, c in chunks if io == Stdio.stdout) == b"x" * 1_000_000
+    assert b"".join(c for io, c in chunks if io == Stdio.stderr) == b"err"
+    assert proc.returncode == 0
+
+
+def test_popen_pipes_gen_text_lines() -> None:
+    script = "import sys; sys.stdout.write('a\\r\\nb\\nno-newline')"
+    with Popen(
+        [sys.executable, "-c", script], stdout=PIPE, stderr=PIPE, text=True
+    ) as proc:
+        assert list(popen_pipes_gen(proc)) == [
+            (Stdio.stdout, "a\n"),
+            (Stdio.stdout, "b\n"),
+            (Stdio.stdout, "no-newline"),
+        ]
+
+
+def test_popen_pipes_gen_timeout() -> None:
+    with (
+        Popen(
+            [sys.executable, "-c", "import time; time.sleep(10)"],
+            stdout=PIPE,
+            stderr=PIPE,
+        ) as proc,
+        pytest.raises(TimeoutExpired),
+    ):
+        list(popen_pipes_gen(proc, timeout=0.2))
+    assert proc.returncode is not None
+
+
+def test_run_dtee(capfd: pytest.CaptureFixture[str]) -> None:
+    script = "import sys; print('out'); print('err', file=sys.stderr); sys.exit(3)"
+    completed, pdt = run_dtee([sys.executable, "-c", script])
+    assert completed.returncode == 3
+    assert completed.stdout.strip() == b"out"
+    assert completed.stderr.strip() == b"err"
+    assert pdt.dt >= 0
+    captured = capfd.readouterr()
+    assert captured.out.strip() == "out"
+    assert captured.err.strip() == "err"
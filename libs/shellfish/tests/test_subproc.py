@@ -2,6 +2,10 @@
 
 from __future__ import annotations
 
+import gc
+import signal
+import sys
+
 from os import path
 from subprocess import TimeoutExpired
 from typing import TYPE_CHECKING
@@ -123,3 +127,174 @@ def test_timeout_subprocess(tmp_path: Path) -> None:
     assert proc.stdout == "About to sleep for 2 sec\nslept for 2 seconds\n"
     with pytest.raises(TimeoutExpired):
         sh.do(args=["python", script_4sec_filepath], timeout=3)
+
+
+def test_do_spill() -> None:
+    script = (
+        "import json, sys\n"
+        "for i in range(5000):\n"
+        "    print(json.dumps({'i': i}))\n"
+        "print('err', file=sys.stderr)\n"
+    )
+    done = sh.do(sys.executable, "-c", script, spill=1024)
+    assert done.stdout_output.spilled
+    assert not done.stderr_output.spilled
+    spill_path = done.stdout_output.fspath
+    assert spill_path is not None
+    assert fs.isfile(spill_path)
+    assert done.stderr == "err\n"
+    assert done.lines[:2] == ['{"i": 0}', '{"i": 1}']
+    assert len(done.stdout_lines()) == 5000
+    assert done.grep('"i": 4999') == ['{"i": 4999}']
+    assert done.json_parse(jsonl=True)[-1] == {"i": 4999}
+    assert done.stdout == sh.do(sys.executable, "-c", script).stdout
+    assert done.model_dump()["stdout"] == done.stdout
+    del done
+    gc.collect()
+    assert not fs.exists(spill_path)
+
+
+def _py(script: str) -> list[str]:
+    return [sys.executable, "-c", script]
+
+
+def test_shell_free_pipe() -> None:
+    upper = _py(
+        "import sys\n"
+        "print('upper', file=sys.stderr)\n"
+        "sys.stdout.write(sys.stdin.read().upper())"
+    )
+    dones = sh.pipe(_py("print('b'); print('a')"), upper, ["sort"])
+    assert len(dones) == 3
+    assert [done.returncode for done in dones] == [0, 0, 0]
+    assert dones[-1].stdout == "A\nB\n"
+    assert dones[0].stdout == ""
+    assert dones[1].stderr == "upper\n"
+    assert all(done.dt >= 0 and done.tf >= done.ti for done in dones)
+    assert sh.pipe(upper, input="hello")[-1].stdout == "HELLO"
+    # empty input is an immediately closed stdin pipe (not the parent's stdin)
+    is_pipe = _py(
+        "import os, stat, sys\n"
+        "print(stat.S_ISFIFO(os.fstat(0).st_mode), repr(sys.stdin.read()))"
+    )
+    for empty in ("", b""):
+        (done,) = sh.pipe(is_pipe, input=empty, timeout=10)
+        assert done.stdout == "True ''\n"
+        assert done.stdin == ""
+    with pytest.raises(ValueError, match="pipe character"):
+        sh.pipe(["echo", "a", "|", "sort"])
+
+
+@pytest.mark.skipif(process.is_win(), reason="SIGPIPE is posix only")
+def test_shell_free_pipe_early_exit_and_check() -> None:
+    dones = sh.pipe(["yes"], ["head", "-n", "2"], check=True)
+    assert dones[-1].stdout == "y\ny\n"
+    assert dones[0].returncode == -signal.SIGPIPE
+    with pytest.raises(sh.DoneError):
+        sh.pipe(_py("import sys; sys.exit(3)"), ["cat"], ok_code={0})
+    with pytest.raises(TimeoutExpired):
+        sh.pipe(_py("import time; time.sleep(5)"), ["cat"], timeout=0.5)
+
+
+def test_shell_free_pipe_gen() -> None:
+    dones: list[sh.Done] = []
+    lines = sh.pipe_gen(_py("for i in range(3): print(i)"), ["sort", "-r"], dones=dones)
+    assert list(lines) == ["2\n", "1\n", "0\n"]
+    assert [done.stdout for done in dones] == ["", ""]
+    gen = sh.pipe_gen(_py("while True: print('y', flush=True)"), ["cat"])
+    assert next(gen) == "y\n"
+    gen.close()
+
+
+def test_env_overlay_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("SHELLFISH_TEST_ENV", raising=False)
+    overlay = sh.EnvOverlay({"SHELLFISH_TEST_OVERLAY": "x"})
+    merged = overlay.merged()
+    assert merged["SHELLFISH_TEST_OVERLAY"] == "x"
+    assert overlay.merged() is merged
+    sh.setenv("SHELLFISH_TEST_ENV", "1")
+    monkeypatch.delenv("SHELLFISH_TEST_ENV")
+    sh.setenv("SHELLFISH_TEST_ENV", "2")
+    assert overlay.merged() is not merged
+    assert overlay.merged()["SHELLFISH_TEST_ENV"] == "2"
+
+    script = "import os; print(os.environ['SHELLFISH_TEST_ENV'], os.environ['A'])"
+    assert sh.do(sys.executable, "-c", script, env={"A": "a"}).stdout == "2 a\n"
+    sh.export("SHELLFISH_TEST_ENV=3")
+    assert sh.do(sys.executable, "-c", script, env={"A": "b"}).stdout == "3 b\n"
+    assert sh.mkenv({"A": "c"}) is not sh.mkenv({"A": "c"})
+
+
+def test_env_cache_sees_changed_values(monkeypatch: pytest.MonkeyPatch) -> None:
+    script = "import os; print(os.environ['SHELLFISH_TEST_X'])"
+    monkeypatch.setenv("SHELLFISH_TEST_X", "old")
+    assert sh.do(sys.executable, "-c", script, env={"A": "a"}).stdout == "old\n"
+    assert sh.mkenv({"A": "a"})["SHELLFISH_TEST_X"] == "old"
+    monkeypatch.setenv("SHELLFISH_TEST_X", "new")
+    assert sh.do(sys.executable, "-c", script, env={"A": "a"}).stdout == "new\n"
+    assert sh.mkenv({"A": "a"})["SHELLFISH_TEST_X"] == "new"
+    monkeypatch.setitem(sh.environ, "SHELLFISH_TEST_X", "newer")
+    assert sh.EnvOverlay({"A": "a"}).merged()["SHELLFISH_TEST_X"] == "newer"
+    assert sh.do(sys.executable, "-c", script, env={"A": "a"}).stdout == "newer\n"
+
+
+def _write_exe(fspath: Path, text: str = "#!/bin/sh\necho hi\n") -> str:
+    fspath.write_text(text)
+    fspath.chmod(0o755)
+    return str(fspath)
+
+
+@pytest.mark.skipif(process.is_win(), reason="posix executables")
+def test_which_cache_invalidation(tmp_path: Path) -> None:
+    first, second = tmp_path / "first", tmp_path / "second"
+    first.mkdir()
+    second.mkdir()
+    search_path = f"{first}{path.pathsep}{second}"
+    cache = sh.WhichCache()
+    assert cache.which("sf-tool", path=search_path) is None
+    tool2 = _write_exe(second / "sf-tool")
+    assert cache.which("sf-tool", path=search_path) == tool2
+    assert cache.which("sf-tool", path=search_path) == tool2
+    # shadowed by a new exe earlier on the PATH
+    tool1 = _write_exe(first / "sf-tool")
+    assert cache.which("sf-tool", path=search_path) == tool1
+    assert cache.which("sf-tool", path=str(second)) == tool2
+    fs.rm(tool1)
+    assert cache.which("sf-tool", path=search_path) == tool2
+    fs.rm(tool2)
+    assert cache.which("sf-tool", path=search_path) is None
+    assert len(cache) == 2
+    assert cache.which("sf-tool", path="relative-dir") is None
+    assert len(cache) == 2
+
+
+_RUSAGE_SCRIPT = (
+    "import sys\n"
+    "data = bytearray(64 * 2**20)\n"
+    "total = sum(range(2_000_000))\n"
+    "print(len(data), total)\n"
+)
+
+
+@pytest.mark.skipif(process.is_win(), reason="os.wait4 is posix only")
+def test_do_rusage() -> None:
+    assert sh.do(sys.executable, "-c", "print(1)").rusage is None
+    for kwargs in ({}, {"tee": True}, {"spill": 16}):
+        done = sh.do(sys.executable, "-c", _RUSAGE_SCRIPT, rusage=True, **kwargs)
+        assert done.stdout.startswith(str(64 * 2**20))
+        assert done.rusage is not None
+        assert done.rusage.maxrss >= 64 * 2**20
+        assert done.rusage.cpu > 0
+        assert done.model_dump()["rusage"]["maxrss"] == done.rusage.maxrss
+        rusage_dict = done.done_dict()["rusage"]
+        assert rusage_dict is not None
+        assert rusage_dict["utime"] == done.rusage.utime
+
+
+@pytest.mark.skipif(process.is_win(), reason="os.wait4 is posix only")
+async def test_do_async_rusage() -> None:
+    done = await sh.do_async(sys.executable, "-c", _RUSAGE_SCRIPT, rusage=True)
+    assert done.async_proc
+    assert done.rusage is not None
+    assert done.rusage.maxrss >= 64 * 2**20
+    assert (await sh.do_async(sys.executable, "-c", "print(1)")).rusage is None
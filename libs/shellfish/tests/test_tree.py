@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import os
+import sys
 
 from typing import TYPE_CHECKING
 
@@ -39,3 +40,101 @@ def test_sh_tree_one(tmp_path: Path) -> None:
     a = sh.tree("dir").strip("\n")
     expected = EXPECTED.strip("\n")
     assert expected == a
+
+
+def test_sh_tree_gen_matches_tree(tmp_path: Path) -> None:
+    sh.cd(tmp_path)
+    mk_dummy_dir()
+    assert list(sh.tree_gen("dir")) == EXPECTED.strip("\n").splitlines()
+
+
+def test_sh_tree_gen_is_lazy(tmp_path: Path) -> None:
+    sh.cd(tmp_path)
+    mk_dummy_dir()
+    lines = sh.tree_gen("dir")
+    assert next(lines) == "dir/"
+    assert next(lines) == "├── a/"
+    # dirs are scanned as they are reached
+    sh.write_str(os.path.join("dir", "e", "f", "cinco.txt"), "five")
+    assert list(lines)[-2:] == ["        ├── cinco.txt", "        └── quatro.txt"]
+
+
+def test_sh_tree_max_depth(tmp_path: Path) -> None:
+    sh.cd(tmp_path)
+    mk_dummy_dir()
+    assert sh.tree("dir", max_depth=0) == "dir/"
+    assert sh.tree("dir", max_depth=2).splitlines() == [
+        "dir/",
+        "├── a/",
+        "│   └── b/",
+        "└── e/",
+        "    └── f/",
+    ]
+
+
+def test_sh_tree_max_entries(tmp_path: Path) -> None:
+    sh.cd(tmp_path)
+    mk_dummy_dir()
+    assert sh.tree(os.path.join("dir", "a"), max_entries=1).splitlines() == [
+        "a/",
+        "└── b/",
+        "    ├── c/",
+        "    │   └── uno.txt",
+        "    └── ... 2 more",
+    ]
+
+
+def test_sh_tree_sizes(tmp_path: Path) -> None:
+    sh.cd(tmp_path)
+    mk_dummy_dir()
+    sh.write_bytes(os.path.join("dir", "big.bin"), b"x" * 3072)
+    lines = sh.tree("dir", sizes=True, max_depth=1).splitlines()
+    assert lines == [
+        "[3.0K]  dir/",
+        "├── [11]  a/",
+        "├── [3.0K]  big.bin",
+        "└── [4]  e/",
+    ]
+
+
+def test_sh_tree_symlinked_dir_not_followed(tmp_path: Path) -> None:
+    sh.cd(tmp_path)
+    mk_dummy_dir()
+    try:
+        os.symlink(os.path.join("..", "e"), os.path.join("dir", "a", "link"))
+    except OSError:
+        return
+    lines = sh.tree(os.path.join("dir", "a")).splitlines()
+    assert lines[-1] == "└── link/"
+    followed = sh.tree(os.path.join("dir", "a"), follow_symlinks=True).splitlines()
+    assert followed[-3:] == ["└── link/", "    └── f/", "        └── quatro.txt"]
+
+
+def test_sh_tree_sizes_deep_tree(tmp_path: Path) -> None:
+    sh.cd(tmp_path)
+    depth = sys.getrecursionlimit() + 100
+    # os.makedirs/shutil.rmtree (& pytest's tmp_path cleanup) recurse, so the
+    # dirs are made & removed one at a time
+    dirpaths = ["dir"]
+    for _ in range(depth):
+        dirpaths.append(os.path.join(dirpaths[-1], "d"))
+    deep_file = os.path.join(dirpaths[-1], "deep.bin")
+    top_file = os.path.join("dir", "top.bin")
+    try:
+        for dirpath in dirpaths:
+            os.mkdir(dirpath)
+        sh.write_bytes(deep_file, b"x" * 2048)
+        sh.write_bytes(top_file, b"x" * 1024)
+        lines = sh.tree("dir", sizes=True, max_depth=1).splitlines()
+        assert lines == [
+            "[3.0K]  dir/",
+            "├── [2.0K]  d/",
+            "└── [1.0K]  top.bin",
+        ]
+    finally:
+        for fspath in (deep_file, top_file):
+            if os.path.exists(fspath):
+                os.remove(fspath)
+        for dirpath in reversed(dirpaths):
+            if os.path.isdir(dirpath):
+                os.rmdir(dirpath)
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Benchmark the durability overhead of `shellfish.fs` atomic/fsync writes
+
+Times `fs.write_bytes` (and `fs.write_bytes_async`) for each combination of
+`atomic` (temp file + rename) and `fsync` (fsync of the file and, for
+atomic writes, of its directory) against the plain in-place write.
+
+Usage:
+    python scripts/bench_shellfish_atomic_write.py
+    python scripts/bench_shellfish_atomic_write.py --sizes 4K,1M --n 200
+    python scripts/bench_shellfish_atomic_write.py --dir /mnt/nfs/scratch
+
+Use a directory on the file-system of interest (`/tmp` is often a tmpfs,
+where fsync is ~free).
+"""
+# ruff: noqa: T201
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import tempfile
+
+from time import perf_counter
+from typing import TYPE_CHECKING
+
+from shellfish import fs
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+_UNITS = {"K": 2**10, "M": 2**20, "G": 2**30}
+
+_MODES = (
+    ("in-place", {"atomic": False, "fsync": False}),
+    ("in-place+fsync", {"atomic": False, "fsync": True}),
+    ("atomic", {"atomic": True, "fsync": False}),
+    ("atomic+fsync", {"atomic": True, "fsync": True}),
+)
+
+
+def parse_size(string: str) -> int:
+    string = string.strip().upper().rstrip("B")
+    if string and string[-1] in _UNITS:
+        return int(float(string[:-1]) * _UNITS[string[-1]])
+    return int(string)
+
+
+def fmt_size(nbytes: int) -> str:
+    for unit in ("G", "M", "K"):
+        if nbytes >= _UNITS[unit]:
+            return f"{nbytes / _UNITS[unit]:g}{unit}"
+    return f"{nbytes}B"
+
+
+def bench_sync(fspath: str, data: bytes, n: int, *, atomic: bool, fsync: bool) -> float:
+    ti = perf_counter()
+    for _ in range(n):
+        fs.write_bytes(fspath, data, atomic=atomic, fsync=fsync)
+    return perf_counter() - ti
+
+
+async def bench_async(
+    fspath: str, data: bytes, n: int, *, atomic: bool, fsync: bool
+) -> float:
+    ti = perf_counter()
+    for _ in range(n):
+        await fs.write_bytes_async(fspath, data, atomic=atomic, fsync=fsync)
+    return perf_counter() - ti
+
+
+def run_bench_async(
+    fspath: str, data: bytes, n: int, *, atomic: bool, fsync: bool
+) -> float:
+    return asyncio.run(bench_async(fspath, data, n, atomic=atomic, fsync=fsync))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--sizes", default="1K,64K,4M", help="comma separated sizes")
+    parser.add_argument("--n", type=int, default=100, help="writes per (size, mode)")
+    parser.add_argument("--dir", default=None, help="directory to benchmark in")
+    parser.add_argument(
+        "--no-async", action="store_true", help="skip the async writer benchmarks"
+    )
+    args = parser.parse_args()
+    sizes = [parse_size(s) for s in args.sizes.split(",")]
+
+    print(f"{'size':>6} {'writer':<6} {'mode':<16} {'us/write':>10} {'overhead':>9}")
+    with tempfile.TemporaryDirectory(dir=args.dir, prefix="bench-atomic-") as tmpdir:
+        fspath = os.path.join(tmpdir, "target.bin")
+        for size in sizes:
+            data = os.urandom(size)
+            writers: list[tuple[str, Callable[..., float]]] = [("sync", bench_sync)]
+            if not args.no_async:
+                writers.append(("async", run_bench_async))
+            for writer, bench in writers:
+                baseline = None
+                for mode, kwargs in _MODES:
+                    dt = bench(fspath, data, args.n, **kwargs)
+                    if fs.read_bytes(fspath) != data:
+                        _emsg = f"{writer} {mode} write of {fmt_size(size)} differs"
+                        raise RuntimeError(_emsg)
+                    baseline = baseline or dt
+                    print(
+                        f"{fmt_size(size):>6} {writer:<6} {mode:<16}"
+                        f" {dt / args.n * 1e6:>10.1f} {dt / baseline:>8.2f}x"
+                    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Benchmark `shellfish.fs.copy_file` copy strategies
+
+Compares the throughput of the kernel copy paths used by
+`shellfish.fs.copy_file` (`os.copy_file_range`, `os.sendfile`) against the
+buffered python loop (the fallback) and the old generator based copy
+(`write_bytes_gen(dest, read_bytes_gen(src))`) and `shutil.copyfile`.
+
+Usage:
+    python scripts/bench_shellfish_copy_file.py
+    python scripts/bench_shellfish_copy_file.py --sizes 1M,100M --repeat 5
+    python scripts/bench_shellfish_copy_file.py --dir /mnt/nfs/scratch
+
+The default sizes are 1M, 100M and 5G; make sure `--dir` has room for two
+copies of the largest file. Use a directory on the file-system of interest
+(`/tmp` is often a tmpfs).
+"""
+# ruff: noqa: T201
+
+from __future__ import annotations
+
+import argparse
+import os
+import shutil
+import tempfile
+
+from contextlib import contextmanager
+from time import perf_counter
+from typing import TYPE_CHECKING
+
+from shellfish import fs
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Generator
+
+_UNITS = {"K": 2**10, "M": 2**20, "G": 2**30}
+
+
+def parse_size(string: str) -> int:
+    string = string.strip().upper().rstrip("B")
+    if string and string[-1] in _UNITS:
+        return int(float(string[:-1]) * _UNITS[string[-1]])
+    return int(string)
+
+
+def fmt_size(nbytes: int) -> str:
+    for unit in ("G", "M", "K"):
+        if nbytes >= _UNITS[unit]:
+            return f"{nbytes / _UNITS[unit]:g}{unit}"
+    return f"{nbytes}B"
+
+
+@contextmanager
+def _strategies(
+    *, copy_file_range: bool, sendfile: bool
+) -> Generator[None, None, None]:
+    _cfr, _sf = fs._HAS_COPY_FILE_RANGE, fs._HAS_SENDFILE_FILE
+    fs._HAS_COPY_FILE_RANGE = copy_file_range and _cfr
+    fs._HAS_SENDFILE_FILE = sendfile and _sf
+    try:
+        yield
+    finally:
+        fs._HAS_COPY_FILE_RANGE, fs._HAS_SENDFILE_FILE = _cfr, _sf
+
+
+def _copy_file_with(
+    *, copy_file_range: bool, sendfile: bool
+) -> Callable[[str, str], object]:
+    def _copy(src: str, dest: str) -> object:
+        with _strategies(copy_file_range=copy_file_range, sendfile=sendfile):
+            return fs.copy_file(src, dest)
+
+    return _copy
+
+
+def _copy_gen(src: str, dest: str) -> object:
+    return fs.write_bytes_gen(dest, fs.read_bytes_gen(src, blocksize=2**18))
+
+
+def benchmarks() -> dict[str, Callable[[str, str], object]]:
+    benches: dict[str, Callable[[str, str], object]] = {}
+    if fs._HAS_COPY_FILE_RANGE:
+        benches["copy_file_range"] = _copy_file_with(
+            copy_file_range=True, sendfile=False
+        )
+    if fs._HAS_SENDFILE_FILE:
+        benches["sendfile"] = _copy_file_with(copy_file_range=False, sendfile=True)
+    benches["buffered"] = _copy_file_with(copy_file_range=False, sendfile=False)
+    benches["read/write_bytes_gen"] = _copy_gen
+    benches["shutil.copyfile"] = shutil.copyfile
+    return benches
+
+
+def make_file(fspath: str, size: int) -> None:
+    chunk = os.urandom(2**20)
+    with open(fspath, "wb") as f:
+        remaining = size
+        while remaining > 0:
+            remaining -= f.write(chunk[: min(remaining, len(chunk))])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--sizes", default="1M,100M,5G", help="comma separated sizes")
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="runs per (size, strategy); best is reported",
+    )
+    parser.add_argument("--dir", default=None, help="directory to benchmark in")
+    args = parser.parse_args()
+    sizes = [parse_size(s) for s in args.sizes.split(",")]
+    benches = benchmarks()
+
+    print(f"{'size':>6} {'strategy':<22} {'best (s)':>10} {'MB/s':>10}")
+    with tempfile.TemporaryDirectory(dir=args.dir, prefix="bench-copy-file-") as tmpdir:
+        src = os.path.join(tmpdir, "src.bin")
+        dest = os.path.join(tmpdir, "dest.bin")
+        for size in sizes:
+            make_file(src, size)
+            for name, fn in benches.items():
+                times = []
+                for _ in range(args.repeat):
+                    if os.path.exists(dest):
+                        os.remove(dest)
+                    ti = perf_counter()
+                    fn(src, dest)
+                    times.append(perf_counter() - ti)
+                if not fs.filecmp(src, dest, shallow=False):
+                    _emsg = f"{name} copy of {fmt_size(size)} file differs"
+                    raise RuntimeError(_emsg)
+                best = min(times)
+                print(
+                    f"{fmt_size(size):>6} {name:<22} {best:>10.4f} {size / 2**20 / best:>10.1f}"
+                )
+            os.remove(src)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Benchmark `shellfish.fs.du` against `files_gen` + `filesize`
+
+Builds a synthetic tree (or uses `--root`) and times the total-size of the
+tree computed by:
+
+- `sum(fs.filesize(p) for p in fs.files_gen(root))` (a walk + a stat per
+  file, one file at a time)
+- `fs.du(root, workers=N)` for each N in `--workers` (concurrent scandir,
+  cached `DirEntry.stat`; also collects per-dir totals & largest files)
+
+Usage:
+    python scripts/bench_shellfish_du.py
+    python scripts/bench_shellfish_du.py --depth 4 --width 6 --files 20
+    python scripts/bench_shellfish_du.py --root /mnt/nfs/some/tree --workers 1,8,32
+
+Use a directory on the file-system of interest (`/tmp` is often a tmpfs;
+the win from concurrent scans is largest on network file-systems).
+"""
+# ruff: noqa: T201
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+
+from time import perf_counter
+from typing import TYPE_CHECKING
+
+from shellfish import fs
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+def make_tree(root: str, *, depth: int, width: int, files: int) -> int:
+    """Create a tree of width**depth dirs w/ `files` files each; return n-files"""
+    nfiles = 0
+    dirs = [root]
+    for _ in range(depth):
+        dirs = [
+            os.path.join(dirpath, f"dir{ix}") for dirpath in dirs for ix in range(width)
+        ]
+    for dirpath in dirs:
+        os.makedirs(dirpath, exist_ok=True)
+        for ix in range(files):
+            with open(os.path.join(dirpath, f"file{ix}.bin"), "wb") as f:
+                f.write(b"x" * (ix * 37))
+            nfiles += 1
+    return nfiles
+
+
+def files_gen_filesize(root: str) -> int:
+    return sum(fs.filesize(fspath) for fspath in fs.files_gen(root))
+
+
+def du_with(workers: int) -> Callable[[str], int]:
+    def _du(root: str) -> int:
+        return fs.du(root, workers=workers).total.nbytes
+
+    return _du
+
+
+def bench(fn: Callable[[str], int], root: str, repeat: int) -> tuple[float, int]:
+    times = []
+    total = 0
+    for _ in range(repeat):
+        ti = perf_counter()
+        total = fn(root)
+        times.append(perf_counter() - ti)
+    return min(times), total
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--root", default=None, help="existing tree to measure")
+    parser.add_argument("--dir", default=None, help="directory to build the tree in")
+    parser.add_argument("--depth", type=int, default=3, help="synthetic tree depth")
+    parser.add_argument("--width", type=int, default=8, help="sub-dirs per dir")
+    parser.add_argument("--files", type=int, default=10, help="files per leaf dir")
+    parser.add_argument(
+        "--workers", default="1,4,16", help="comma separated fs.du worker counts"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="runs per method; best is reported"
+    )
+    args = parser.parse_args()
+
+    benches: dict[str, Callable[[str], int]] = {
+        "files_gen+filesize": files_gen_filesize
+    }
+    for workers in (int(w) for w in args.workers.split(",")):
+        benches[f"du(workers={workers})"] = du_with(workers)
+
+    with tempfile.TemporaryDirectory(dir=args.dir, prefix="bench-du-") as tmpdir:
+        root = args.root
+        if root is None:
+            root = tmpdir
+            nfiles = make_tree(
+                root, depth=args.depth, width=args.width, files=args.files
+            )
+            print(f"tree: {root} ({nfiles} files)")
+        print(f"{'method':<22} {'best (s)':>10} {'speedup':>8}")
+        baseline = None
+        expected = None
+        for name, fn in benches.items():
+            best, total = bench(fn, root, args.repeat)
+            if expected is None:
+                expected = total
+            elif total != expected:
+                _emsg = f"{name} total {total} != {expected}"
+                raise RuntimeError(_emsg)
+            baseline = baseline or best
+            print(f"{name:<22} {best:>10.4f} {baseline / best:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()